@@ -0,0 +1,88 @@
+# benchmarks/bench_backtest.py
+import numpy as np
+from src.backtesting.engine import Backtester
+from src.backtesting.event_engine import EventDrivenBacktester
+from src.backtesting.fill_model import FillModel
+from src.backtesting.kernels import simulate_long_flat
+from src.backtesting.metrics import compute_metrics
+from src.backtesting.walk_forward import crossover_positions, moving_averages, simulate_positions
+from src.trading.strategy import MovingAverageStrategy
+
+def bench_backtester_run(benchmark, candle_factory, bench_logger):
+    """Backtester.run, bars per second"""
+    data = candle_factory(2000)
+    benchmark.items = len(data)
+
+    def setup():
+        return (Backtester(data.copy(), MovingAverageStrategy(), logger=bench_logger),), {}
+
+    result = benchmark.pedantic(lambda backtester: backtester.run(), setup=setup, rounds=3)
+    assert len(result.equity_curve) == len(data)
+
+def bench_event_driven_run(benchmark, candle_factory, bench_logger):
+    """EventDrivenBacktester.run with fees and lot size rounding, bars per second"""
+    data = candle_factory(200_000)
+    benchmark.items = len(data)
+
+    def setup():
+        backtester = EventDrivenBacktester(
+            data, MovingAverageStrategy(), fill_model=FillModel(step_size=0.001), logger=bench_logger
+        )
+        return (backtester,), {}
+
+    result = benchmark.pedantic(lambda backtester: backtester.run(), setup=setup, rounds=3)
+    assert len(result.equity_curve) == len(data)
+
+def bench_simulate_positions(benchmark, candle_factory):
+    """Vectorized long/flat simulation, bars per second"""
+    close = candle_factory(1_000_000)['fechamento'].to_numpy()
+    averages = moving_averages(close, [7, 40])
+    positions = crossover_positions(averages[7], averages[40])
+    benchmark.items = len(close)
+
+    equity = benchmark(simulate_positions, close, positions, 0.95, FillModel())
+    assert len(equity) == len(close)
+
+def bench_compute_metrics_10m(benchmark):
+    """Full metric suite on a 10M-point equity curve, points per second"""
+    rng = np.random.default_rng(0)
+    equity = 10000.0 * np.cumprod(1 + rng.normal(0, 0.001, 10_000_000))
+    positions = (np.arange(len(equity)) % 3 > 0).astype(np.int8)
+    benchmark.items = len(equity)
+
+    metrics = benchmark.pedantic(compute_metrics, args=(equity, 525600.0, positions), rounds=3)
+    assert metrics['max_drawdown'] > 0
+
+def bench_backtester_fast_run(benchmark, candle_factory, bench_logger):
+    """Backtester.run with fast=True (generate_signals + array kernel), bars per second"""
+    data = candle_factory(1_000_000)
+    benchmark.items = len(data)
+
+    result = benchmark.pedantic(
+        lambda: Backtester(data, MovingAverageStrategy(), logger=bench_logger, fast=True).run(), rounds=3
+    )
+    assert len(result.equity_curve) == len(data)
+
+def bench_kernel_long_flat(benchmark, candle_factory):
+    """simulate_long_flat on the default backend without stops, bars per second"""
+    data = candle_factory(1_000_000)
+    close = np.tile(data['fechamento'].to_numpy(), 10)
+    signals = np.tile(MovingAverageStrategy().generate_signals(data), 10)
+    benchmark.items = len(close)
+
+    equity, _, _ = benchmark.pedantic(simulate_long_flat, args=(close, signals), rounds=3)
+    assert len(equity) == len(close)
+
+def bench_kernel_long_flat_stops(benchmark, candle_factory):
+    """simulate_long_flat with stop loss and trailing stop (numba, else the Python loop), bars per second"""
+    data = candle_factory(1_000_000)
+    signals = MovingAverageStrategy().generate_signals(data)
+    benchmark.items = len(data)
+
+    equity, _, _ = benchmark.pedantic(
+        simulate_long_flat, args=(data['fechamento'].to_numpy(), signals),
+        kwargs=dict(open_=data['abertura'].to_numpy(), high=data['maxima'].to_numpy(),
+                    low=data['minima'].to_numpy(), stop_loss=0.02, trailing_stop=0.03),
+        rounds=3
+    )
+    assert len(equity) == len(data)
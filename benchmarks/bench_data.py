@@ -0,0 +1,37 @@
+# benchmarks/bench_data.py
+from src.trading.candle_buffer import CandleBuffer
+from src.trading.data_fetcher import DataFetcher
+from src.utils.binance_client import BinanceClient
+
+def bench_data_fetcher_parse(benchmark, kline_client):
+    """DataFetcher.get_market_data parsing 1000 klines, klines per second"""
+    fetcher = DataFetcher(kline_client)
+    benchmark.items = 1000
+
+    data = benchmark(fetcher.get_market_data, "BTCBRL", "1h")
+    assert len(data) == 1000
+
+def bench_binance_client_historical_klines(benchmark, kline_client):
+    """BinanceClient.get_historical_klines parsing 1000 klines, klines per second"""
+    client = BinanceClient.__new__(BinanceClient)
+    client.client = kline_client
+    benchmark.items = 1000
+
+    data = benchmark(client.get_historical_klines, "BTCBRL", "1h", 1000)
+    assert len(data) == 1000
+
+def bench_candle_buffer_tick(benchmark, kline_factory):
+    """Append one closed kline to a 1000-candle CandleBuffer and build its frame, ticks per second"""
+    klines = kline_factory(6000)
+    benchmark.items = 5000
+
+    def stream():
+        buffer = CandleBuffer(1000)
+        buffer.extend_klines(klines[:1000])
+        for kline in klines[1000:]:
+            buffer.extend_klines([kline])
+            buffer.frame()
+        return buffer
+
+    buffer = benchmark.pedantic(stream, rounds=3)
+    assert buffer.last_open_time == klines[-1][0]
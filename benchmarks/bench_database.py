@@ -0,0 +1,51 @@
+# benchmarks/bench_database.py
+from src.database.crypto_db import CryptoDatabase
+
+def bench_database_add_operation(benchmark, tmp_path):
+    """CryptoDatabase.add_operation, inserts per second"""
+    db = CryptoDatabase(str(tmp_path / "bench.db"))
+    db.add_crypto("Bitcoin", "BTCBRL")
+    session_id = db.start_trading_session("BTCBRL", 1000.0, 0.05)
+    benchmark.items = 200
+
+    def insert():
+        for i in range(200):
+            db.add_operation(session_id, "COMPRA" if i % 2 == 0 else "VENDA", "BTCBRL", 20000.0 + i, 0.05)
+
+    benchmark.pedantic(insert, rounds=3)
+    assert len(db.get_session_operations(session_id)) == 200 * 4
+
+def bench_database_session_queries(benchmark, tmp_path):
+    """get_session_operations + get_session_summary over 1000 operations, queries per second"""
+    db = CryptoDatabase(str(tmp_path / "bench.db"))
+    db.add_crypto("Bitcoin", "BTCBRL")
+    session_id = db.start_trading_session("BTCBRL", 1000.0, 0.05)
+    with db.get_cursor() as cursor:
+        cursor.executemany(
+            """
+            INSERT INTO trading_operations
+            (session_id, operation_type, crypto_code, price, quantity, total_value)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [(session_id, "COMPRA" if i % 2 == 0 else "VENDA", "BTCBRL", 20000.0, 0.05, 1000.0)
+             for i in range(1000)]
+        )
+    benchmark.items = 20
+
+    def query():
+        for _ in range(10):
+            db.get_session_operations(session_id)
+            db.get_session_summary(session_id)
+
+    benchmark(query)
+    assert db.get_session_summary(session_id)["total_operations"] == 1000
+
+def bench_database_active_cryptos(benchmark, tmp_path):
+    """get_active_cryptos over 500 coins, queries per second"""
+    db = CryptoDatabase(str(tmp_path / "bench.db"))
+    for i in range(500):
+        db.add_crypto(f"Coin {i}", f"C{i}BRL", i % 2 == 0)
+    benchmark.items = 10
+
+    result = benchmark(lambda: [db.get_active_cryptos() for _ in range(10)])
+    assert len(result[0]) == 250
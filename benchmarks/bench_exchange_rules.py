@@ -0,0 +1,19 @@
+# benchmarks/bench_exchange_rules.py
+import numpy as np
+from src.utils.exchange_rules import adjust_quantity
+
+def bench_adjust_quantity_scalar(benchmark):
+    """adjust_quantity on one float, as in order placement, calls per second"""
+    quantities = np.random.default_rng(1).uniform(0, 10, 1000).tolist()
+    benchmark.items = len(quantities)
+
+    rounded = benchmark(lambda: [adjust_quantity(q, 0.00001) for q in quantities])
+    assert rounded[0] == adjust_quantity(quantities[0], "0.00001")
+
+def bench_adjust_quantity_array(benchmark):
+    """adjust_quantity over an array of quantities, as in backtest sweeps, values per second"""
+    quantities = np.random.default_rng(1).uniform(0, 10, 1_000_000)
+    benchmark.items = len(quantities)
+
+    rounded = benchmark(adjust_quantity, quantities, 0.00001)
+    assert len(rounded) == len(quantities)
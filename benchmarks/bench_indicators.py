@@ -0,0 +1,40 @@
+# benchmarks/bench_indicators.py
+import numpy as np
+from src.trading import indicators
+
+def bench_indicators_batch(benchmark, candle_factory):
+    """EMA, RSI, MACD, Bollinger, ATR and VWAP over 1M bars, bars per second"""
+    data = candle_factory(1_000_000)
+    high, low, close, volume = (data[column].to_numpy(dtype=np.float64)
+                                for column in ('maxima', 'minima', 'fechamento', 'volume'))
+    benchmark.items = len(close)
+
+    def compute():
+        indicators.ema(close, 20)
+        indicators.rsi(close, 14)
+        indicators.macd(close)
+        indicators.bollinger_bands(close, 20)
+        indicators.atr(high, low, close, 14)
+        return indicators.vwap(high, low, close, volume, window=24)
+
+    assert len(benchmark(compute)) == len(close)
+
+def bench_indicators_streaming(benchmark, candle_factory):
+    """All six streaming indicators updated with one closed candle, bars per second"""
+    data = candle_factory(10_000)
+    bars = list(zip(*(data[column].tolist() for column in ('maxima', 'minima', 'fechamento', 'volume'))))
+    benchmark.items = len(bars)
+
+    def stream():
+        ema, rsi, macd = indicators.EMA(20), indicators.RSI(14), indicators.MACD()
+        bands, atr, vwap = indicators.BollingerBands(20), indicators.ATR(14), indicators.VWAP(24)
+        for high, low, close, volume in bars:
+            ema.update(close)
+            rsi.update(close)
+            macd.update(close)
+            bands.update(close)
+            atr.update(high, low, close)
+            vwap.update(high, low, close, volume)
+        return ema.value
+
+    assert benchmark(stream) > 0
@@ -0,0 +1,18 @@
+# benchmarks/bench_replay.py
+from src.trading.data_fetcher import DataFetcher
+from src.trading.strategy import MovingAverageStrategy
+from src.utils.replay import ReplayClient, record_market_fixture
+
+def bench_replayed_trading_loop(benchmark, kline_client, tmp_path):
+    """Fetch + strategy update on replayed Binance responses without latency, iterations per second"""
+    fixture = record_market_fixture(kline_client, str(tmp_path / "market.jsonl.gz"), ["BTCBRL"], limit=1000)
+    fetcher = DataFetcher(ReplayClient(fixture, latency=0.0))
+    strategy = MovingAverageStrategy()
+
+    def iteration():
+        strategy.update(fetcher.get_market_data("BTCBRL", "1h"))
+        return strategy.get_signal()
+
+    benchmark.items = 20
+    benchmark(lambda: [iteration() for _ in range(20)])
+    assert strategy.get_signal() in (None, "BUY", "SELL")
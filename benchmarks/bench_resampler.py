@@ -0,0 +1,30 @@
+# benchmarks/bench_resampler.py
+from src.trading.resampler import CandleResampler
+
+def bench_resampler_bulk_load(benchmark, kline_factory):
+    """One year of 1m klines into 5m/15m/1h/4h/1d, candles per second"""
+    klines = kline_factory(365 * 24 * 60, interval_ms=60_000)
+    benchmark.items = len(klines)
+
+    resampler = benchmark.pedantic(lambda: _load(klines), rounds=3)
+    assert len(resampler.get('1d')) == 365
+
+def bench_resampler_incremental(benchmark, kline_factory):
+    """Add one closed 1m candle and read the 1h frame, updates per second"""
+    klines = kline_factory(20_000, interval_ms=60_000)
+    benchmark.items = 5000
+
+    def stream():
+        resampler = _load(klines[:15_000])
+        for kline in klines[15_000:]:
+            resampler.update([kline])
+            resampler.get('1h')
+        return resampler
+
+    resampler = benchmark.pedantic(stream, rounds=3)
+    assert resampler.last_open_time == klines[-1][0]
+
+def _load(klines):
+    resampler = CandleResampler()
+    resampler.update(klines)
+    return resampler
@@ -0,0 +1,15 @@
+# benchmarks/bench_startup.py
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def bench_cli_cold_start(benchmark):
+    """python -m src.cli --help in a fresh interpreter, starts per second"""
+    command = [sys.executable, "-m", "src.cli", "--help"]
+    result = benchmark.pedantic(
+        lambda: subprocess.run(command, cwd=ROOT, capture_output=True, check=True),
+        rounds=5
+    )
+    assert b"backtest" in result.stdout
@@ -0,0 +1,23 @@
+# benchmarks/bench_strategy.py
+from src.trading.strategy import MovingAverageStrategy
+
+def bench_moving_average_update(benchmark, candle_factory):
+    """MovingAverageStrategy.update + get_signal on the live loop's 1000-candle frame, calls per second"""
+    data = candle_factory(1000)[['fechamento']].copy()
+    strategy = MovingAverageStrategy()
+
+    def tick():
+        strategy.update(data)
+        return strategy.get_signal()
+
+    benchmark.items = 100
+    benchmark(lambda: [tick() for _ in range(100)])
+    assert strategy.get_signal() in (None, "BUY", "SELL")
+
+def bench_moving_average_generate_signals(benchmark, candle_factory):
+    """Vectorized MovingAverageStrategy signals, bars per second"""
+    data = candle_factory(1_000_000)
+    benchmark.items = len(data)
+
+    signals = benchmark(MovingAverageStrategy().generate_signals, data)
+    assert len(signals) == len(data)
@@ -0,0 +1,176 @@
+# benchmarks/conftest.py
+"""
+Offline benchmark harness.
+
+Provides a ``benchmark`` fixture with the pytest-benchmark calling
+convention (``benchmark(func, *args)`` / ``benchmark.pedantic(...)``) plus
+synthetic candle fixtures, so no Binance account or network is needed.
+Throughput of every benchmark is compared with benchmarks/baselines.json.
+"""
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from typing import Any, Callable, Dict, List, Optional
+from tests.conftest import make_candles
+
+BASELINES_FILE = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption("--benchmark-save", action="store_true",
+                    help="Store the measured throughput as the new baselines")
+    group.addoption("--benchmark-tolerance", type=float, default=0.25,
+                    help="Allowed slowdown before a benchmark is flagged (0.25 = 25%%)")
+    group.addoption("--benchmark-strict", action="store_true",
+                    help="Fail benchmarks that regress beyond the tolerance")
+
+class BenchmarkSession:
+    """Results of every benchmark run in the session"""
+    def __init__(self, baselines: Dict[str, float], tolerance: float, strict: bool):
+        self.baselines = baselines
+        self.tolerance = tolerance
+        self.strict = strict
+        self.results: Dict[str, Dict[str, float]] = {}
+        self.regressions: List[str] = []
+
+    def record(self, name: str, seconds: float, items: int, rounds: int) -> Optional[str]:
+        """Store a measurement and return a message if it regressed"""
+        ops_per_sec = items / seconds if seconds > 0 else float("inf")
+        self.results[name] = {"seconds": seconds, "ops_per_sec": ops_per_sec,
+                              "items": items, "rounds": rounds}
+        baseline = self.baselines.get(name)
+        if baseline and ops_per_sec < baseline * (1 - self.tolerance):
+            message = f"{name}: {ops_per_sec:,.0f} ops/s vs baseline {baseline:,.0f} ops/s"
+            self.regressions.append(message)
+            return message
+        return None
+
+class Benchmark:
+    """Times a callable over several rounds and keeps the best round"""
+    def __init__(self, name: str, session: BenchmarkSession):
+        self.name = name
+        self.session = session
+        self.items = 1  # work units per call (bars, rows, calls...)
+
+    def __call__(self, func: Callable, *args, **kwargs) -> Any:
+        return self.pedantic(func, args=args, kwargs=kwargs)
+
+    def pedantic(self, func: Callable, args: tuple = (), kwargs: Optional[dict] = None,
+                 setup: Optional[Callable] = None, rounds: int = 5, warmup_rounds: int = 1) -> Any:
+        """Run func rounds times; setup (if given) builds fresh arguments outside the timing"""
+        kwargs = kwargs or {}
+        result = None
+        best = float("inf")
+        for round_number in range(warmup_rounds + rounds):
+            if setup is not None:
+                args, kwargs = setup()
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            if round_number >= warmup_rounds:
+                best = min(best, elapsed)
+
+        message = self.session.record(self.name, best, self.items, rounds)
+        if message and self.session.strict:
+            pytest.fail(f"Performance regression - {message}")
+        return result
+
+def _load_baselines() -> Dict[str, float]:
+    if not os.path.exists(BASELINES_FILE):
+        return {}
+    with open(BASELINES_FILE) as f:
+        return json.load(f)
+
+def pytest_configure(config):
+    config._benchmark_session = BenchmarkSession(
+        _load_baselines(),
+        config.getoption("--benchmark-tolerance"),
+        config.getoption("--benchmark-strict")
+    )
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    session: BenchmarkSession = config._benchmark_session
+    if not session.results:
+        return
+
+    terminalreporter.section("benchmarks")
+    for name, result in sorted(session.results.items()):
+        baseline = session.baselines.get(name)
+        change = f"{result['ops_per_sec'] / baseline - 1:+.1%}" if baseline else "new"
+        terminalreporter.write_line(
+            f"{name:<45} {result['seconds'] * 1000:>10.2f} ms {result['ops_per_sec']:>16,.0f} ops/s  {change}"
+        )
+    for message in session.regressions:
+        terminalreporter.write_line(f"REGRESSION {message}", red=True)
+
+    if config.getoption("--benchmark-save"):
+        baselines = dict(session.baselines)
+        baselines.update({name: round(r["ops_per_sec"], 2) for name, r in session.results.items()})
+        with open(BASELINES_FILE, "w") as f:
+            json.dump(dict(sorted(baselines.items())), f, indent=2)
+            f.write("\n")
+        terminalreporter.write_line(f"Baselines saved to {BASELINES_FILE}")
+
+@pytest.fixture
+def benchmark(request):
+    """pytest-benchmark compatible timer that reports ops/sec against baselines"""
+    return Benchmark(request.node.name, request.config._benchmark_session)
+
+def make_klines(n: int, seed: int = 42, interval_ms: int = 60 * 60 * 1000) -> list:
+    """Synthetic klines in the raw format returned by Client.get_klines"""
+    candles = make_candles(n, seed, freq=pd.Timedelta(milliseconds=interval_ms))
+    open_time = candles.index.as_unit('ms').asi8
+    columns = [candles[name].to_numpy() for name in ('abertura', 'maxima', 'minima', 'fechamento', 'volume')]
+    return [
+        [int(t), f"{o:.8f}", f"{h:.8f}", f"{l:.8f}", f"{c:.8f}", f"{v:.8f}",
+         int(t) + interval_ms - 1, f"{v * c:.8f}", 100, f"{v / 2:.8f}", f"{v * c / 2:.8f}", "0"]
+        for t, o, h, l, c, v in zip(open_time, *columns)
+    ]
+
+class KlineClient:
+    """Minimal offline stand-in for binance.client.Client serving fixed klines"""
+    def __init__(self, klines: list):
+        self.klines = klines
+
+    def get_klines(self, symbol: str, interval: str, limit: int = 500, **kwargs) -> list:
+        return self.klines[-limit:]
+
+    def get_symbol_info(self, symbol: str) -> dict:
+        return {'symbol': symbol, 'filters': [
+            {'filterType': 'LOT_SIZE', 'minQty': '0.00001', 'maxQty': '9000.0', 'stepSize': '0.00001'}
+        ]}
+
+    def get_symbol_ticker(self, symbol: str) -> dict:
+        return {'symbol': symbol, 'price': self.klines[-1][4]}
+
+    def get_account(self) -> dict:
+        return {'balances': [{'asset': 'BRL', 'free': '10000.0', 'locked': '0.0'}]}
+
+@pytest.fixture
+def candle_factory():
+    """Build synthetic candle DataFrames of any size"""
+    return make_candles
+
+@pytest.fixture
+def kline_factory():
+    """Build synthetic raw klines of any size"""
+    return make_klines
+
+@pytest.fixture
+def kline_client():
+    """Offline client serving 1000 hourly klines"""
+    return KlineClient(make_klines(1000))
+
+@pytest.fixture
+def bench_logger(tmp_path):
+    """Logger writing to a temporary file"""
+    import logging
+    from src.utils.logger import Logger
+    logger = Logger(str(tmp_path / "bench.log"), log_level=logging.WARNING)
+    yield logger
+    for handler in list(logger.logger.handlers):
+        logger.logger.removeHandler(handler)
+        handler.close()
@@ -0,0 +1,22 @@
+# run_benchmarks.py
+import pytest
+import sys
+
+def main():
+    """Run all benchmarks; extra arguments (e.g. --benchmark-save) are passed to pytest"""
+    args = [
+        "-c", "benchmarks/pytest.ini",
+        "-q",
+        "-p", "no:cacheprovider",
+        "-p", "no:warnings",
+        "benchmarks/"
+    ] + sys.argv[1:]
+    
+    # Run benchmarks
+    result = pytest.main(args)
+    
+    # Exit with benchmark result
+    sys.exit(result)
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,9 @@ from binance.client import Client
 from binance.enums import *
 from dotenv import load_dotenv
 from crypto_database import CryptoDatabase
+from src.utils.clock import SystemClock, next_candle_close
+from src.utils.exchange_rules import adjust_quantity
+from src.utils.trade_journal import ARROW_AVAILABLE, TradeJournal
 
 class CryptoWindow(ctk.CTkToplevel):
     def __init__(self, parent, db, callback, *args, **kwargs):
@@ -87,6 +90,7 @@ class CryptoTradingBot:
         self.current_trading_id = None
         self.trading_active = False
         self.posicao_atual = False
+        self.clock = SystemClock()
         
         # Configuration and API setup
         self.load_config()
@@ -114,11 +118,10 @@ class CryptoTradingBot:
         self.cliente_binance = Client(self.api_key, self.secret_key)
 
     def setup_logging(self):
-        """Setup logging files and configurations"""
-        self.log_file = "trading_log.csv"
-        if not os.path.exists(self.log_file):
-            with open(self.log_file, "w") as f:
-                f.write("timestamp,tipo,par,quantidade,preco,total\n")
+        """Setup the trade journal (the CSV log when pyarrow is missing)"""
+        self.log_file = "trading_journal.arrow" if ARROW_AVAILABLE else "trading_log.csv"
+        # Trades are batched; the flush timer writes each one within flush_interval seconds
+        self.journal = TradeJournal(self.log_file, flush_rows=100, flush_interval=60.0)
     
     def setup_gui(self):
         self.root = ctk.CTk()
@@ -338,8 +341,7 @@ class CryptoTradingBot:
 
     def adjust_quantity(self, quantity, step_size):
         """Ajusta a quantidade para corresponder ao step size"""
-        step_size_decimals = len(str(step_size).split('.')[-1])
-        return float(("{:." + str(step_size_decimals) + "f}").format(quantity - (quantity % step_size)))
+        return adjust_quantity(quantity, step_size)
 
     def calcular_quantidade(self):
         try:
@@ -400,12 +402,6 @@ class CryptoTradingBot:
         precos["fechamento"] = precos["fechamento"].astype(float)
         return precos
         
-    def log_trade(self, tipo, par, quantidade, preco):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        total = float(quantidade) * float(preco)
-        with open(self.log_file, "a") as f:
-            f.write(f"{timestamp},{tipo},{par},{quantidade:.8f},{preco:.8f},{total:.8f}\n")
-    
     def estrategia_trade(self, dados, codigo_ativo, ativo_operado, quantidade, posicao):
         dados["media_rapida"] = dados["fechamento"].rolling(window=7).mean()
         dados["media_devagar"] = dados["fechamento"].rolling(window=40).mean()
@@ -491,16 +487,18 @@ class CryptoTradingBot:
                     posicao=self.posicao_atual
                 )
                 
-                for minuto in range(5, 0, -1):
-                    if not self.trading_active:
-                        break
-                    self.log_message(f"Aguardando próxima análise... {minuto} minutos restantes")
-                    time.sleep(60)
+                # Próxima análise logo após o fechamento do próximo candle
+                proxima_analise = next_candle_close(self.clock.now(), Client.KLINE_INTERVAL_1HOUR, delay=2.0)
+                self.log_message(
+                    f"Aguardando próxima análise às {datetime.fromtimestamp(proxima_analise).strftime('%H:%M:%S')}"
+                )
+                while self.trading_active and self.clock.now() < proxima_analise:
+                    self.clock.sleep(min(60, proxima_analise - self.clock.now()))
                     self.atualizar_preco()  # Atualiza o preço durante a espera
                 
             except Exception as e:
                 self.log_message(f"Erro no loop de trading: {str(e)}")
-                time.sleep(60)
+                self.clock.sleep(60)
     
     # Add these methods to the CryptoTradingBot class
 
@@ -542,30 +540,27 @@ class CryptoTradingBot:
                 self.log_message("Erro ao finalizar sessão no banco de dados")
         
         self.trading_active = False
+        self.journal.flush()
         self.start_button.configure(state="normal")
         self.stop_button.configure(state="disabled")
         self.log_message("Trading parado")
 
     def log_trade(self, tipo, par, quantidade, preco):
-        """Log trade to both CSV and database"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        total = float(quantidade) * float(preco)
-        
-        # Log to CSV (maintaining original functionality)
-        with open(self.log_file, "a") as f:
-            f.write(f"{timestamp},{tipo},{par},{quantidade:.8f},{preco:.8f},{total:.8f}\n")
+        """Log trade to the trade journal and the database"""
+        self.journal.append(tipo, par, quantidade, preco, sessao=self.current_trading_id)
         
-        # Log to database
-        if hasattr(self, 'current_trading_id'):
+        # The entradas rows back the session summaries of the database, so they are kept
+        if self.current_trading_id is not None:
             self.db.add_entrada(
                 trading_id=self.current_trading_id,
                 type=tipo,
                 codigo_ativo=par,
-                value=total,
+                value=float(quantidade) * float(preco),
                 quantidade=quantidade
-            )    
+            )
 
 
 if __name__ == "__main__":
     bot = CryptoTradingBot()
-    bot.root.mainloop()
\ No newline at end of file
+    bot.root.mainloop()
+    bot.journal.close()
\ No newline at end of file
@@ -1,12 +1,32 @@
 # main.py
+import argparse
+import atexit
 from src.utils.config import Config
 from src.utils.logger import Logger
 from src.utils.binance_client import BinanceClient
 from src.database.crypto_db import CryptoDatabase
 from src.interface.main_window import MainWindow
 from src.trading.trading_engine import TradingEngine
+from src.utils.latency import LatencyRecorder
+from src.utils.profiling import profiler
+from src.utils.telemetry import MetricsRegistry, MetricsServer
 
-def main():
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Crypto Trading Bot")
+    parser.add_argument(
+        "--profile", nargs="?", const="profiles", metavar="DIR",
+        help="Profile backtests and the trading loop, writing the results to DIR on exit "
+             "(SIGUSR1 toggles profiling at runtime)"
+    )
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if profiler.install_signal_toggle():
+        atexit.register(profiler.disable)
+    if args.profile:
+        profiler.enable(args.profile)
+        
     try:
         # Initialize configuration
         config = Config()
@@ -14,22 +34,31 @@ def main():
         # Initialize logger
         logger = Logger(config.database.log_file)
         
+        # Initialize metrics exporter
+        registry = MetricsRegistry()
+        if config.metrics.port:
+            server = MetricsServer(registry, config.metrics.host, config.metrics.port)
+            logger.log(f"Métricas disponíveis em http://{config.metrics.host}:{server.start()}/metrics")
+        
         # Initialize database
-        db = CryptoDatabase(config.database.db_name)
+        db = CryptoDatabase(config.database.db_name, registry=registry)
         
         # Initialize Binance client
-        binance_client = BinanceClient(**config.binance_config)
+        binance_client = BinanceClient(**config.binance_config, registry=registry)
         
-        # Initialize trading engine
+        # Initialize trading engine on the same instrumented connection
         trading_engine = TradingEngine(
             api_key=config.api_key,
             api_secret=config.api_secret,
             db=db,
-            logger=logger
+            logger=logger,
+            client=binance_client.client,
+            latency=LatencyRecorder(config.metrics.latency_file or None),
+            registry=registry
         )
         
         # Initialize and run main window
-        main_window = MainWindow()
+        main_window = MainWindow(db=db, client=binance_client, engine=trading_engine)
         main_window.run()
         
     except Exception as e:
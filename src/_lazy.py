@@ -0,0 +1,30 @@
+# src/_lazy.py
+"""
+Lazy re-exports shared by the package ``__init__`` modules.
+
+A package lists the module of each exported name and installs the hooks::
+
+    __getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, __all__)
+
+Submodules are imported on first access of one of their names, so
+importing a package stays cheap.
+"""
+import sys
+from importlib import import_module
+from typing import Callable, Dict, List, Sequence, Tuple
+
+def lazy_exports(package: str, exports: Dict[str, str],
+                 names: Sequence[str]) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """Module ``__getattr__`` and ``__dir__`` importing ``exports`` (name -> relative module) on demand"""
+    def __getattr__(name: str) -> object:
+        if name in exports:
+            value = getattr(import_module(exports[name], package), name)
+            # Later lookups find the name in the module without calling __getattr__
+            setattr(sys.modules[package], name, value)
+            return value
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(names))
+
+    return __getattr__, __dir__
@@ -1,5 +1,41 @@
 # src/backtesting/__init__.py
-from .engine import Backtester, BacktestResult
-from .visualization import BacktestVisualizer
+from .._lazy import lazy_exports
 
-__all__ = ['Backtester', 'BacktestResult', 'BacktestVisualizer']
\ No newline at end of file
+_EXPORTS = {
+    'Backtester': '.engine',
+    'BacktestResult': '.engine',
+    'BacktestVisualizer': '.visualization',
+    'EventDrivenBacktester': '.event_engine',
+    'FillModel': '.fill_model',
+    'NUMBA_AVAILABLE': '.kernels',
+    'MonteCarloAnalyzer': '.monte_carlo',
+    'MonteCarloResult': '.monte_carlo',
+    'Order': '.event_engine',
+    'PortfolioBacktester': '.portfolio',
+    'PortfolioResult': '.portfolio',
+    'TradeLedger': '.ledger',
+    'simulate_long_flat': '.kernels',
+    'WalkForwardOptimizer': '.walk_forward',
+    'WalkForwardResult': '.walk_forward'
+}
+
+__all__ = [
+    'Backtester',
+    'BacktestResult',
+    'BacktestVisualizer',
+    'EventDrivenBacktester',
+    'FillModel',
+    'NUMBA_AVAILABLE',
+    'MonteCarloAnalyzer',
+    'MonteCarloResult',
+    'Order',
+    'PortfolioBacktester',
+    'PortfolioResult',
+    'TradeLedger',
+    'simulate_long_flat',
+    'WalkForwardOptimizer',
+    'WalkForwardResult'
+]
+
+# Submodules are imported on first access so importing the package stays cheap
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, __all__)
@@ -4,13 +4,25 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from ..trading.position_sizing import FixedFractionSizer, PositionSizer
+from ..trading.risk_manager import PositionRisk, RiskLimits
 from ..trading.strategy import TradingStrategy
 from ..utils.logger import Logger
+from ..utils.profiling import profiler
+from .kernels import simulate_long_flat
+from .ledger import TradeLedger
+from .metrics import compute_metrics, periods_per_year, rolling_metrics
 
 class BacktestResult:
-    """Container for backtest results"""
-    def __init__(self):
-        self.trades: List[Dict] = []
+    """Container for backtest results
+
+    ``interval`` is the kline interval of the bars (e.g. '1h'); it sets how
+    returns are annualized. Without it the bar length is inferred from the
+    equity curve index.
+    """
+    def __init__(self, interval: Optional[str] = None):
+        self.interval = interval
+        self.trades = TradeLedger()
         self.metrics: Dict = {
             'total_trades': 0,
             'winning_trades': 0,
@@ -22,124 +34,214 @@ class BacktestResult:
             'profit_factor': 0.0
         }
         self.equity_curve: Optional[pd.Series] = None
+        self.positions: Optional[np.ndarray] = None
+        
+    @property
+    def periods_per_year(self) -> float:
+        """Number of bars per year used for annualization"""
+        index = self.equity_curve.index if self.equity_curve is not None else None
+        return periods_per_year(self.interval, index)
         
     def add_trade(self, trade: Dict):
         """Add a trade to results"""
-        self.trades.append(trade)
+        self.trades.append(
+            trade['timestamp'], trade['type'], trade['price'], trade['quantity'],
+            cost=trade.get('cost', 0.0), profit=trade.get('profit', 0.0),
+            fee=trade.get('fee', 0.0)
+        )
         
     def calculate_metrics(self):
-        """Calculate performance metrics"""
-        if not self.trades:
-            return
+        """Calculate performance metrics in a single pass over the ledger columns
+        
+        Equity curve metrics are filled even without trades, so flat and
+        buy-and-hold runs still report their drawdown and Sharpe ratio.
+        """
+        if self.trades:
+            profit = self.trades.column('profit')
+            wins = profit > 0
+            losses = profit < 0
             
-        # Convert trades to DataFrame
-        trades_df = pd.DataFrame(self.trades)
-        
-        # Basic metrics
-        total_trades = len(trades_df)
-        winning_trades = len(trades_df[trades_df['profit'] > 0])
-        losing_trades = len(trades_df[trades_df['profit'] < 0])
-        
-        self.metrics = {
-            'total_trades': total_trades,
-            'winning_trades': winning_trades,
-            'losing_trades': losing_trades,
-            'win_rate': winning_trades / total_trades if total_trades > 0 else 0,
-            'total_profit': trades_df['profit'].sum(),
-            'max_drawdown': self.calculate_max_drawdown(),
-            'sharpe_ratio': self.calculate_sharpe_ratio(),
-            'profit_factor': self.calculate_profit_factor(trades_df)
-        }
+            total_trades = len(profit)
+            winning_trades = int(np.count_nonzero(wins))
+            losing_trades = int(np.count_nonzero(losses))
+            
+            self.metrics = {
+                'total_trades': total_trades,
+                'winning_trades': winning_trades,
+                'losing_trades': losing_trades,
+                'win_rate': winning_trades / total_trades if total_trades > 0 else 0,
+                'total_profit': float(profit.sum()),
+                'profit_factor': self.calculate_profit_factor(profit[wins], profit[losses])
+            }
+        self.metrics.update(self.calculate_equity_metrics())
         
-    def calculate_max_drawdown(self) -> float:
-        """Calculate maximum drawdown from equity curve"""
+    def calculate_equity_metrics(self, risk_free_rate: float = 0.01) -> Dict[str, float]:
+        """Sharpe, Sortino, Calmar, CAGR, drawdowns, ulcer index and exposure of the equity curve"""
         if self.equity_curve is None:
-            return 0.0
-            
-        rolling_max = self.equity_curve.cummax()
-        drawdown = self.equity_curve - rolling_max
-        return abs(drawdown.min())
+            return compute_metrics(np.empty(0), self.periods_per_year)
+        return compute_metrics(
+            self.equity_curve.to_numpy(dtype=np.float64),
+            self.periods_per_year,
+            positions=self.positions,
+            risk_free_rate=risk_free_rate
+        )
+        
+    def calculate_max_drawdown(self) -> float:
+        """Calculate maximum drawdown from equity curve, as a fraction of the peak"""
+        return self.calculate_equity_metrics()['max_drawdown']
         
     def calculate_sharpe_ratio(self, risk_free_rate: float = 0.01) -> float:
-        """Calculate Sharpe ratio of returns"""
-        if self.equity_curve is None:
-            return 0.0
-            
-        returns = self.equity_curve.pct_change().dropna()
-        if len(returns) < 2:
-            return 0.0
-            
-        excess_returns = returns - risk_free_rate/252  # Daily risk-free rate
-        return np.sqrt(252) * excess_returns.mean() / excess_returns.std()
+        """Calculate Sharpe ratio of returns, annualized by the bar interval"""
+        return self.calculate_equity_metrics(risk_free_rate)['sharpe_ratio']
         
-    def calculate_profit_factor(self, trades_df: pd.DataFrame) -> float:
-        """Calculate profit factor"""
-        if trades_df.empty:
-            return 0.0
-            
-        gross_profit = trades_df[trades_df['profit'] > 0]['profit'].sum()
-        gross_loss = abs(trades_df[trades_df['profit'] < 0]['profit'].sum())
+    def rolling_metrics(self, window: int, risk_free_rate: float = 0.01) -> pd.DataFrame:
+        """Rolling return, volatility, Sharpe and drawdown over window bars"""
+        return rolling_metrics(self.equity_curve, window, self.periods_per_year, risk_free_rate)
+        
+    def calculate_profit_factor(self, gains: np.ndarray, losses: np.ndarray) -> float:
+        """Calculate profit factor from winning and losing trade profits"""
+        gross_profit = gains.sum()
+        gross_loss = abs(losses.sum())
         
-        return gross_profit / gross_loss if gross_loss != 0 else float('inf')
+        return float(gross_profit / gross_loss) if gross_loss != 0 else float('inf')
 
 class Backtester:
-    """Backtesting engine for trading strategies"""
+    """Backtesting engine for trading strategies
+
+    With ``fast=True`` the signals come from ``strategy.generate_signals``
+    in one call and the positions and equity are simulated by the array
+    kernels (compiled with numba when installed) instead of updating the
+    strategy on every prefix of the data.
+
+    ``risk`` applies the live RiskManager rules: stops are checked on every
+    bar against its open, high and low (abertura, maxima, minima when
+    present) before the signal, and ``max_exposure`` caps the fraction of
+    capital invested. ``sizer`` picks that fraction per bar, 95% by default.
+    """
     def __init__(self, data: pd.DataFrame, strategy: TradingStrategy, 
-                 initial_capital: float = 10000.0, logger: Optional[Logger] = None):
+                 initial_capital: float = 10000.0, logger: Optional[Logger] = None,
+                 interval: Optional[str] = None, fast: bool = False,
+                 risk: Optional[RiskLimits] = None, sizer: Optional[PositionSizer] = None):
         self.data = data
         self.strategy = strategy
         self.initial_capital = initial_capital
         self.logger = logger or Logger("backtest.log")
+        self.fast = fast
+        self.risk = risk or RiskLimits()
+        self.sizer = sizer or FixedFractionSizer(0.95)
+        self.fractions = self.sizer.fractions(data)
+        if self.risk.max_exposure > 0:
+            self.fractions = np.minimum(self.fractions, self.risk.max_exposure)
         
         self.current_position = 0
+        self.entry_cost = 0.0
         self.capital = initial_capital
-        self.result = BacktestResult()
+        self.position_risk: Optional[PositionRisk] = None
+        self.result = BacktestResult(interval)
         
+    @profiler.profiled("backtest.run")
     def run(self):
         """Run backtest"""
         self.logger.log("Starting backtest...")
+        if self.fast:
+            return self._run_kernel()
         
         # Inicializa a lista de equity com o capital inicial
         equity = []
+        positions = []
+        open_, high, low = self._bar_prices()
+        blocked = False
         
         for i in range(len(self.data)):
             # Update strategy with current data
             current_data = self.data.iloc[:i+1]
-            self.strategy.update(current_data)
+            with profiler.phase("strategy.update"):
+                self.strategy.update(current_data)
             
             # Get trading signal
             signal = self.strategy.get_signal()
             
-            if signal:
+            # Stops are checked on the bar before its signal, as in RiskManager
+            stopped = False
+            if self.position_risk is not None and self.risk.has_stops:
+                exit_price = self.position_risk.check(open_[i], high[i], low[i])
+                if exit_price > 0.0:
+                    self._close_position(current_data.index[-1], exit_price)
+                    stopped = blocked = True
+            if signal == "SELL":
+                blocked = False
+            
+            if signal and not stopped and not (signal == "BUY" and blocked):
                 self._process_signal(signal, current_data.index[-1], 
-                                float(current_data['fechamento'].iloc[-1]))
+                                float(current_data['fechamento'].iloc[-1]), self.fractions[i])
             
             # Adiciona o valor atual do patrimônio à lista
             current_equity = self.capital
             if self.current_position > 0:
                 current_equity += self.current_position * float(current_data['fechamento'].iloc[-1])
             equity.append(current_equity)
+            positions.append(1 if self.current_position > 0 else 0)
         
         # Cria a Series de equity usando o mesmo índice dos dados
         self.result.equity_curve = pd.Series(
             equity,
             index=self.data.index[:len(equity)]  # Garante que o índice tem o mesmo tamanho dos dados
         )
+        self.result.positions = np.array(positions, dtype=np.int8)
+        
+        self.result.calculate_metrics()
+        self._log_results()
+        return self.result
+        
+    def _run_kernel(self) -> BacktestResult:
+        """Run the whole backtest over arrays with simulate_long_flat"""
+        close = self.data['fechamento'].to_numpy(dtype=np.float64)
+        with profiler.phase("strategy.generate_signals"):
+            signals = self.strategy.generate_signals(self.data)
+        open_, high, low = self._bar_prices() if self.risk.has_stops else (None, None, None)
+        equity, positions, fills = simulate_long_flat(
+            close, signals, self.initial_capital, self.fractions, open_, high, low,
+            stop_loss=self.risk.stop_loss, take_profit=self.risk.take_profit,
+            trailing_stop=self.risk.trailing_stop
+        )
+        
+        self.result.equity_curve = pd.Series(equity, index=self.data.index[:len(equity)])
+        self.result.positions = positions
+        self.result.trades.extend(
+            self.data.index[fills['bar']], fills['side'], fills['price'],
+            fills['quantity'], fills['cost'], fills['profit']
+        )
+        # Leave the final state as the bar loop would
+        self.current_position = float(fills['quantity'][-1]) if len(fills) and positions[-1] else 0
+        self.entry_cost = float(fills['cost'][-1]) if self.current_position else 0.0
+        self.capital = float(equity[-1] - self.current_position * close[-1]) if len(equity) else self.capital
         
         self.result.calculate_metrics()
         self._log_results()
         return self.result
         
-    def _process_signal(self, signal: str, timestamp: datetime, price: float):
+    def _bar_prices(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Open, high and low of every bar; the kernels' defaults fill missing columns"""
+        close = self.data['fechamento'].to_numpy(dtype=np.float64)
+        columns = []
+        for name, default in (('abertura', np.concatenate((close[:1], close[:-1]))),
+                              ('maxima', close), ('minima', close)):
+            columns.append(self.data[name].to_numpy(dtype=np.float64) if name in self.data else default)
+        return tuple(columns)
+        
+    def _process_signal(self, signal: str, timestamp: datetime, price: float, fraction: float = 0.95):
         """Process trading signal"""
         if signal == "BUY" and self.current_position <= 0:
             # Calculate position size
-            position_size = self.capital * 0.95 / price  # Use 95% of capital
+            position_size = self.capital * fraction / price
             cost = position_size * price
             
-            if cost <= self.capital:
+            # A sizer returning 0 (no edge, unknown volatility) skips the entry
+            if position_size > 0 and cost <= self.capital:
                 self.current_position = position_size
+                self.entry_cost = cost
                 self.capital -= cost
+                self.position_risk = PositionRisk(self.risk, price, cost)
                 
                 self.result.add_trade({
                     'timestamp': timestamp,
@@ -151,21 +253,26 @@ class Backtester:
                 })
                 
         elif signal == "SELL" and self.current_position > 0:
-            # Close position
-            revenue = self.current_position * price
-            profit = revenue - self.result.trades[-1]['cost']
-            self.capital += revenue
+            self._close_position(timestamp, price)
             
-            self.result.add_trade({
-                'timestamp': timestamp,
-                'type': 'SELL',
-                'price': price,
-                'quantity': self.current_position,
-                'cost': 0,
-                'profit': profit
-            })
-            
-            self.current_position = 0
+    def _close_position(self, timestamp: datetime, price: float):
+        """Sell the whole position at price"""
+        revenue = self.current_position * price
+        profit = revenue - self.entry_cost
+        self.capital += revenue
+        
+        self.result.add_trade({
+            'timestamp': timestamp,
+            'type': 'SELL',
+            'price': price,
+            'quantity': self.current_position,
+            'cost': 0,
+            'profit': profit
+        })
+        
+        self.current_position = 0
+        self.entry_cost = 0.0
+        self.position_risk = None
             
     def _log_results(self):
         """Log backtest results"""
@@ -173,6 +280,6 @@ class Backtester:
         self.logger.log(f"Total Trades: {self.result.metrics['total_trades']}")
         self.logger.log(f"Win Rate: {self.result.metrics['win_rate']:.2%}")
         self.logger.log(f"Total Profit: {self.result.metrics['total_profit']:.2f}")
-        self.logger.log(f"Max Drawdown: {self.result.metrics['max_drawdown']:.2f}")
+        self.logger.log(f"Max Drawdown: {self.result.metrics['max_drawdown']:.2%}")
         self.logger.log(f"Sharpe Ratio: {self.result.metrics['sharpe_ratio']:.2f}")
         self.logger.log(f"Profit Factor: {self.result.metrics['profit_factor']:.2f}")
\ No newline at end of file
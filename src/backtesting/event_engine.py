@@ -0,0 +1,180 @@
+# src/backtesting/event_engine.py
+
+import numpy as np
+import pandas as pd
+from typing import Optional
+from ..trading.strategy import TradingStrategy, SIGNAL_BUY, SIGNAL_SELL
+from ..utils.logger import Logger
+from ..utils.profiling import profiler
+from .engine import BacktestResult
+from .fill_model import FillModel
+from .kernels import FILL_DTYPE
+
+class Order:
+    """Order waiting to be matched against the next bars"""
+    __slots__ = ('side', 'order_type', 'limit_price', 'created_at')
+
+    def __init__(self, side: str, order_type: str = "MARKET",
+                 limit_price: Optional[float] = None, created_at: int = 0):
+        self.side = side
+        self.order_type = order_type
+        self.limit_price = limit_price
+        self.created_at = created_at
+
+class EventDrivenBacktester:
+    """Bar-by-bar simulation with order matching, fees and slippage
+
+    Signals are read at each bar close and turned into orders that can only
+    fill on later bars: market orders at the next open (taker), limit orders
+    when the bar range crosses the limit price (maker). Prices, signals and
+    fills live in NumPy arrays so the loop never builds per-bar objects.
+    """
+    def __init__(self, data: pd.DataFrame, strategy: TradingStrategy,
+                 initial_capital: float = 10000.0, fill_model: Optional[FillModel] = None,
+                 position_fraction: float = 0.95, order_type: str = "MARKET",
+                 limit_offset: float = 0.0, logger: Optional[Logger] = None,
+                 interval: Optional[str] = None):
+        self.data = data
+        self.strategy = strategy
+        self.initial_capital = initial_capital
+        self.fill_model = fill_model or FillModel()
+        self.position_fraction = position_fraction
+        self.order_type = order_type
+        self.limit_offset = limit_offset
+        self.logger = logger or Logger("backtest.log")
+
+        self.capital = initial_capital
+        self.current_position = 0.0
+        self.entry_cost = 0.0
+        self.pending_order: Optional[Order] = None
+        self.result = BacktestResult(interval)
+
+    @profiler.profiled("backtest.run")
+    def run(self) -> BacktestResult:
+        """Run the simulation over all bars"""
+        self.logger.log("Starting event-driven backtest...")
+
+        close = self.data['fechamento'].to_numpy(dtype=np.float64)
+        open_ = self._column('abertura', close)
+        high = self._column('maxima', close)
+        low = self._column('minima', close)
+        with profiler.phase("strategy.generate_signals"):
+            signals = self.strategy.generate_signals(self.data)
+
+        n = len(close)
+        self._fills = np.zeros(n, dtype=FILL_DTYPE)
+        self._fill_count = 0
+        equity = np.empty(n, dtype=np.float64)
+        positions = np.zeros(n, dtype=np.int8)
+
+        # Python floats index much faster than NumPy scalars inside the loop
+        opens, highs, lows, closes = open_.tolist(), high.tolist(), low.tolist(), close.tolist()
+        signal_list = signals.tolist()
+
+        for i in range(n):
+            if self.pending_order is not None:
+                self._match_order(i, opens[i], highs[i], lows[i])
+
+            equity[i] = self.capital + self.current_position * closes[i]
+            if self.current_position > 0:
+                positions[i] = 1
+
+            signal = signal_list[i]
+            if signal == SIGNAL_BUY and self.current_position <= 0:
+                self._submit("BUY", i, closes[i])
+            elif signal == SIGNAL_SELL and self.current_position > 0:
+                self._submit("SELL", i, closes[i])
+
+        self.result.equity_curve = pd.Series(equity, index=self.data.index[:n])
+        self.result.positions = positions
+        self._store_trades()
+        self.result.calculate_metrics()
+        self.result.metrics['total_fees'] = float(self._fills['fee'][:self._fill_count].sum())
+        self._log_results()
+        return self.result
+
+    def _column(self, name: str, fallback: np.ndarray) -> np.ndarray:
+        """Return an OHLC column, falling back to the close for close-only data"""
+        if name in self.data.columns:
+            return self.data[name].to_numpy(dtype=np.float64)
+        return fallback
+
+    def _submit(self, side: str, bar: int, close: float):
+        """Create the order answering a signal, replacing any opposite order"""
+        pending = self.pending_order
+        if pending is not None:
+            if pending.side == side:
+                return
+            self.pending_order = None
+
+        if self.order_type == "LIMIT":
+            offset = -self.limit_offset if side == "BUY" else self.limit_offset
+            self.pending_order = Order(side, "LIMIT", close * (1 + offset), bar)
+        else:
+            self.pending_order = Order(side, "MARKET", None, bar)
+
+    def _match_order(self, bar: int, open_: float, high: float, low: float):
+        """Fill the pending order if this bar allows it"""
+        order = self.pending_order
+        if order.order_type == "MARKET":
+            self._execute(bar, order.side, open_, is_maker=False)
+            return
+
+        limit = order.limit_price
+        if order.side == "BUY" and low <= limit:
+            self._execute(bar, "BUY", min(open_, limit), is_maker=True)
+        elif order.side == "SELL" and high >= limit:
+            self._execute(bar, "SELL", max(open_, limit), is_maker=True)
+
+    def _execute(self, bar: int, side: str, reference_price: float, is_maker: bool):
+        """Apply a fill to the account and record it"""
+        self.pending_order = None
+        fill_model = self.fill_model
+        price = fill_model.fill_price(side, reference_price, is_maker)
+
+        if side == "BUY":
+            quantity = fill_model.max_buy_quantity(
+                self.capital * self.position_fraction, price, is_maker
+            )
+            if quantity <= 0:
+                return
+            notional = quantity * price
+            fee = fill_model.fee(notional, is_maker)
+            cost = notional + fee
+            self.capital -= cost
+            self.current_position = quantity
+            self.entry_cost = cost
+            self._record(bar, SIGNAL_BUY, price, quantity, cost, fee, 0.0)
+        else:
+            quantity = self.current_position
+            notional = quantity * price
+            fee = fill_model.fee(notional, is_maker)
+            revenue = notional - fee
+            self.capital += revenue
+            self.current_position = 0.0
+            self._record(bar, SIGNAL_SELL, price, quantity, 0.0, fee, revenue - self.entry_cost)
+            self.entry_cost = 0.0
+
+    def _record(self, bar: int, side: int, price: float, quantity: float,
+                cost: float, fee: float, profit: float):
+        """Write a fill into the preallocated buffer"""
+        self._fills[self._fill_count] = (bar, side, price, quantity, cost, fee, profit)
+        self._fill_count += 1
+
+    def _store_trades(self):
+        """Copy recorded fills into the result ledger in one block"""
+        fills = self._fills[:self._fill_count]
+        self.result.trades.extend(
+            self.data.index[fills['bar']], fills['side'], fills['price'],
+            fills['quantity'], fills['cost'], fills['profit'], fills['fee']
+        )
+
+    def _log_results(self):
+        """Log backtest results"""
+        self.logger.log("\nEvent-Driven Backtest Results:")
+        self.logger.log(f"Total Trades: {self.result.metrics['total_trades']}")
+        self.logger.log(f"Win Rate: {self.result.metrics['win_rate']:.2%}")
+        self.logger.log(f"Total Profit: {self.result.metrics['total_profit']:.2f}")
+        self.logger.log(f"Total Fees: {self.result.metrics['total_fees']:.2f}")
+        self.logger.log(f"Max Drawdown: {self.result.metrics['max_drawdown']:.2%}")
+        self.logger.log(f"Sharpe Ratio: {self.result.metrics['sharpe_ratio']:.2f}")
@@ -0,0 +1,45 @@
+# src/backtesting/fill_model.py
+
+from dataclasses import dataclass
+from typing import Optional
+from ..utils.exchange_rules import adjust_quantity
+
+@dataclass
+class FillModel:
+    """Execution costs applied to simulated fills
+
+    Fees and slippage are fractions (0.001 = 0.1%). ``spread`` is the full
+    bid/ask spread, so every fill pays half of it on top of the slippage.
+    """
+    taker_fee: float = 0.001
+    maker_fee: float = 0.001
+    slippage: float = 0.0005
+    spread: float = 0.0
+    step_size: Optional[float] = None
+    min_qty: float = 0.0
+
+    def fill_price(self, side: str, price: float, is_maker: bool = False) -> float:
+        """Price actually obtained when executing at a reference price"""
+        if is_maker:
+            # Resting orders are filled at their limit price
+            return price
+        impact = self.spread / 2 + self.slippage
+        if side == "BUY":
+            return price * (1 + impact)
+        return price * (1 - impact)
+
+    def fee(self, notional: float, is_maker: bool = False) -> float:
+        """Commission charged on a fill of the given notional value"""
+        return notional * (self.maker_fee if is_maker else self.taker_fee)
+
+    def round_quantity(self, quantity: float) -> float:
+        """Round a quantity with the same LOT_SIZE rule used for live orders"""
+        if not self.step_size:
+            return quantity
+        quantity = adjust_quantity(quantity, self.step_size)
+        return quantity if quantity >= self.min_qty else 0.0
+
+    def max_buy_quantity(self, cash: float, price: float, is_maker: bool = False) -> float:
+        """Largest rounded quantity whose cost plus fee fits in cash"""
+        fee_rate = self.maker_fee if is_maker else self.taker_fee
+        return self.round_quantity(cash / (price * (1 + fee_rate)))
@@ -0,0 +1,243 @@
+# src/backtesting/kernels.py
+"""
+Array kernels for the long/flat backtest state machine.
+
+``simulate_long_flat`` runs the position and equity bookkeeping of
+Backtester over raw float arrays. Three backends produce the same numbers:
+
+- ``numba``: the per-bar loop compiled with ``numba.njit`` (used when numba
+  is installed);
+- ``numpy``: a loop-free version for runs without stops, where positions
+  only depend on the signals;
+- ``python``: the same per-bar loop interpreted over Python lists, the
+  fallback for path-dependent exits without numba.
+
+Stops are checked on every bar while long: the stop loss and trailing stop
+fill at the stop price (or the open when the bar gaps through it) if the
+low reaches them, the take profit fills at its price (or the open) if the
+high reaches it. After a stop exit, BUY signals are ignored until the
+strategy emits a SELL, so a persisting buy condition does not re-enter on
+the next bar.
+"""
+from typing import Optional, Tuple, Union
+import numpy as np
+from ..trading.strategy import SIGNAL_BUY, SIGNAL_SELL
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional
+    numba = None
+    NUMBA_AVAILABLE = False
+
+# One row per fill, shared with EventDrivenBacktester
+FILL_DTYPE = np.dtype([
+    ('bar', np.int64),
+    ('side', np.int8),
+    ('price', np.float64),
+    ('quantity', np.float64),
+    ('cost', np.float64),
+    ('fee', np.float64),
+    ('profit', np.float64),
+])
+
+def positions_from_signals(signals: np.ndarray) -> np.ndarray:
+    """Forward-fill BUY/SELL signals into a long/flat position array
+
+    Works along the first axis, so a (bars, assets) signal matrix is filled
+    column by column in the same call.
+    """
+    bars = np.arange(len(signals)).reshape((-1,) + (1,) * (signals.ndim - 1))
+    last = np.where(signals != 0, bars, -1)
+    np.maximum.accumulate(last, axis=0, out=last)
+    latest = np.take_along_axis(signals, np.maximum(last, 0), axis=0)
+    return ((latest == SIGNAL_BUY) & (last >= 0)).astype(np.int8)
+
+def _long_flat_loop(open_, high, low, close, signals, fractions, capital,
+                    stop_loss, take_profit, trailing_stop,
+                    equity, positions, fill_bar, fill_side, fill_price,
+                    fill_quantity, fill_cost, fill_profit):
+    """Per-bar state machine writing into preallocated outputs; returns the fill count
+
+    Written in the subset of Python that numba compiles, and also run as is
+    over lists by the python backend.
+    """
+    quantity = 0.0
+    entry_cost = 0.0
+    entry_price = 0.0
+    peak = 0.0
+    blocked = False
+    count = 0
+    for i in range(len(close)):
+        price = close[i]
+        signal = signals[i]
+        stopped = False
+
+        if quantity > 0.0:
+            stop = 0.0
+            if stop_loss > 0.0:
+                stop = entry_price * (1.0 - stop_loss)
+            if trailing_stop > 0.0 and peak * (1.0 - trailing_stop) > stop:
+                stop = peak * (1.0 - trailing_stop)
+            target = entry_price * (1.0 + take_profit) if take_profit > 0.0 else 0.0
+
+            exit_price = 0.0
+            if stop > 0.0 and low[i] <= stop:
+                exit_price = open_[i] if open_[i] < stop else stop
+            elif target > 0.0 and high[i] >= target:
+                exit_price = open_[i] if open_[i] > target else target
+
+            if exit_price > 0.0:
+                revenue = quantity * exit_price
+                capital += revenue
+                fill_bar[count] = i
+                fill_side[count] = SIGNAL_SELL
+                fill_price[count] = exit_price
+                fill_quantity[count] = quantity
+                fill_cost[count] = 0.0
+                fill_profit[count] = revenue - entry_cost
+                count += 1
+                quantity = 0.0
+                entry_cost = 0.0
+                stopped = True
+                blocked = True
+            elif high[i] > peak:
+                peak = high[i]
+
+        if signal == SIGNAL_SELL:
+            blocked = False
+        if not stopped:
+            if signal == SIGNAL_BUY and quantity <= 0.0 and not blocked:
+                size = capital * fractions[i] / price
+                cost = size * price
+                # A zero (or NaN) fraction invests nothing and is no entry
+                if size > 0.0 and cost <= capital:
+                    quantity = size
+                    entry_cost = cost
+                    entry_price = price
+                    peak = price
+                    capital -= cost
+                    fill_bar[count] = i
+                    fill_side[count] = SIGNAL_BUY
+                    fill_price[count] = price
+                    fill_quantity[count] = size
+                    fill_cost[count] = cost
+                    fill_profit[count] = 0.0
+                    count += 1
+            elif signal == SIGNAL_SELL and quantity > 0.0:
+                revenue = quantity * price
+                capital += revenue
+                fill_bar[count] = i
+                fill_side[count] = SIGNAL_SELL
+                fill_price[count] = price
+                fill_quantity[count] = quantity
+                fill_cost[count] = 0.0
+                fill_profit[count] = revenue - entry_cost
+                count += 1
+                quantity = 0.0
+                entry_cost = 0.0
+
+        equity[i] = capital + quantity * price
+        positions[i] = 1 if quantity > 0.0 else 0
+    return count
+
+_compiled_loop = None
+
+def _numba_loop():
+    """Compile the loop on first use; the cache survives between processes"""
+    global _compiled_loop
+    if _compiled_loop is None:
+        _compiled_loop = numba.njit(cache=True, nogil=True)(_long_flat_loop)
+    return _compiled_loop
+
+def _run_loop(loop, arrays, capital, stop_loss, take_profit, trailing_stop, as_lists):
+    n = len(arrays[3])
+    outputs = [np.empty(n), np.zeros(n, dtype=np.int8), np.zeros(n, dtype=np.int64),
+               np.zeros(n, dtype=np.int8), np.zeros(n), np.zeros(n), np.zeros(n), np.zeros(n)]
+    if as_lists:
+        # Indexing lists of Python floats is several times faster than NumPy scalars
+        arrays = [array.tolist() for array in arrays]
+        outputs = [[0] * n for _ in outputs]
+    count = loop(*arrays, capital, stop_loss, take_profit, trailing_stop, *outputs)
+
+    equity, positions = np.asarray(outputs[0], dtype=np.float64), np.asarray(outputs[1], dtype=np.int8)
+    fills = np.zeros(count, dtype=FILL_DTYPE)
+    for name, column in zip(('bar', 'side', 'price', 'quantity', 'cost', 'profit'), outputs[2:]):
+        fills[name] = column[:count]
+    return equity, positions, fills
+
+def _run_vectorized(close, signals, capital, fractions):
+    """Long/flat run without stops: fills happen where the forward-filled position changes"""
+    # BUY bars that would invest nothing don't enter, as in the bar loop
+    signals = np.where((signals == SIGNAL_BUY) & ~(fractions > 0), 0, signals).astype(np.int8)
+    held = positions_from_signals(signals).astype(bool)
+    previous = np.concatenate(([False], held[:-1]))
+    entries = np.flatnonzero(held & ~previous)
+    exits = np.flatnonzero(~held & previous)
+
+    entry_price = close[entries]
+    fraction = fractions[entries]
+    closed = len(exits)
+    # Cash grows by (1 - f) + f * exit / entry over each round trip
+    growth = (1.0 - fraction[:closed]) + fraction[:closed] * close[exits] / entry_price[:closed]
+    capital_before = capital * np.concatenate(([1.0], np.cumprod(growth)))[:len(entries)]
+    quantity = capital_before * fraction / entry_price
+    cost = quantity * entry_price
+
+    trade = np.cumsum(held & ~previous) - 1
+    equity = np.full(len(close), float(capital))
+    tid = trade[held]
+    equity[held] = capital_before[tid] - cost[tid] + quantity[tid] * close[held]
+    flat_after = ~held & (trade >= 0)
+    capital_after = capital_before[:closed] - cost[:closed] + quantity[:closed] * close[exits]
+    equity[flat_after] = capital_after[trade[flat_after]]
+
+    fills = np.zeros(len(entries) + closed, dtype=FILL_DTYPE)
+    fills['bar'][0::2], fills['bar'][1::2] = entries, exits
+    fills['side'][0::2], fills['side'][1::2] = SIGNAL_BUY, SIGNAL_SELL
+    fills['price'][0::2], fills['price'][1::2] = entry_price, close[exits]
+    fills['quantity'][0::2], fills['quantity'][1::2] = quantity, quantity[:closed]
+    fills['cost'][0::2] = cost
+    fills['profit'][1::2] = quantity[:closed] * close[exits] - cost[:closed]
+    return equity, held.astype(np.int8), fills
+
+def simulate_long_flat(close: np.ndarray, signals: np.ndarray, initial_capital: float = 10000.0,
+                       fraction: Union[float, np.ndarray] = 0.95, open_: Optional[np.ndarray] = None,
+                       high: Optional[np.ndarray] = None, low: Optional[np.ndarray] = None,
+                       stop_loss: float = 0.0, take_profit: float = 0.0, trailing_stop: float = 0.0,
+                       backend: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Equity, long/flat positions and fills (FILL_DTYPE) of a signal array
+
+    Trades fill at the close of the signal bar investing ``fraction`` of the
+    cash (a number, or one per bar from a PositionSizer), without fees,
+    like Backtester; BUY bars where it is 0 or NaN don't enter. Stops are fractions of the entry
+    price (trailing: of the highest high since entry); 0 disables them.
+    A missing open falls back to the previous close, missing high/low to
+    the close.
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    signals = np.ascontiguousarray(signals, dtype=np.int8)
+    fractions = np.ascontiguousarray(np.broadcast_to(np.asarray(fraction, dtype=np.float64), close.shape))
+    has_stops = stop_loss > 0 or take_profit > 0 or trailing_stop > 0
+    if backend is None:
+        backend = "numba" if NUMBA_AVAILABLE else ("python" if has_stops else "numpy")
+    if backend == "numpy":
+        if has_stops:
+            raise ValueError("The numpy backend cannot simulate stops")
+        return _run_vectorized(close, signals, initial_capital, fractions)
+
+    if open_ is None:
+        open_ = np.concatenate((close[:1], close[:-1]))
+    arrays = [
+        close if column is None else np.ascontiguousarray(column, dtype=np.float64)
+        for column in (open_, high, low)
+    ] + [close, signals, fractions]
+    if backend == "numba":
+        if not NUMBA_AVAILABLE:
+            raise ValueError("numba is not installed")
+        loop, as_lists = _numba_loop(), False
+    elif backend == "python":
+        loop, as_lists = _long_flat_loop, True
+    else:
+        raise ValueError(f"Unknown backend: {backend}")
+    return _run_loop(loop, arrays, float(initial_capital), stop_loss, take_profit, trailing_stop, as_lists)
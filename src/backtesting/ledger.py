@@ -0,0 +1,165 @@
+# src/backtesting/ledger.py
+
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+SIDE_BUY = 1
+SIDE_SELL = -1
+
+# 49 bytes per trade, against several hundred for the equivalent dict
+TRADE_DTYPE = np.dtype([
+    ('timestamp', np.int64),
+    ('side', np.int8),
+    ('price', np.float64),
+    ('quantity', np.float64),
+    ('cost', np.float64),
+    ('fee', np.float64),
+    ('profit', np.float64),
+])
+
+class TradeLedger:
+    """Columnar trade storage backed by a growable NumPy structured array
+
+    Timestamps are stored as int64: nanoseconds for datetimes (the timezone
+    is kept once for the whole ledger) or the raw value for integer indexes.
+    Indexing and iteration still return the trade dicts used elsewhere.
+    """
+    def __init__(self, capacity: int = 1024):
+        self._data = np.zeros(max(capacity, 1), dtype=TRADE_DTYPE)
+        self._size = 0
+        self._is_datetime = False
+        self._tz = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __getitem__(self, position: int) -> Dict[str, Any]:
+        if position < 0:
+            position += self._size
+        if not 0 <= position < self._size:
+            raise IndexError("trade index out of range")
+        return self._to_dict(self._data[position])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for position in range(self._size):
+            yield self._to_dict(self._data[position])
+
+    @property
+    def records(self) -> np.ndarray:
+        """Structured array view of the stored trades"""
+        return self._data[:self._size]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the stored trades"""
+        return self.records.nbytes
+
+    def column(self, name: str) -> np.ndarray:
+        """Zero-copy view of one column"""
+        return self._data[name][:self._size]
+
+    def timestamps(self) -> pd.Index:
+        """Decoded timestamp column"""
+        values = self.column('timestamp')
+        if self._is_datetime:
+            index = pd.DatetimeIndex(values.astype('datetime64[ns]'))
+            return index.tz_localize('UTC').tz_convert(self._tz) if self._tz else index
+        return pd.Index(values)
+
+    def sides(self) -> np.ndarray:
+        """Side column as 'BUY'/'SELL' labels"""
+        return np.where(self.column('side') == SIDE_BUY, 'BUY', 'SELL')
+
+    def append(self, timestamp: Any, side: str, price: float, quantity: float,
+               cost: float = 0.0, profit: float = 0.0, fee: float = 0.0) -> None:
+        """Append a single trade"""
+        if self._size == len(self._data):
+            self._grow(self._size + 1)
+        self._data[self._size] = (
+            self._encode_timestamp(timestamp),
+            SIDE_BUY if side == 'BUY' else SIDE_SELL,
+            price, quantity, cost, fee, profit
+        )
+        self._size += 1
+
+    def extend(self, timestamps: Sequence, sides: np.ndarray, prices: np.ndarray,
+               quantities: np.ndarray, costs: np.ndarray, profits: np.ndarray,
+               fees: Optional[np.ndarray] = None) -> None:
+        """Append many trades at once; sides use the SIDE_BUY/SIDE_SELL codes"""
+        count = len(prices)
+        if count == 0:
+            return
+        if self._size + count > len(self._data):
+            self._grow(self._size + count)
+
+        block = self._data[self._size:self._size + count]
+        block['timestamp'] = self._encode_timestamps(timestamps)
+        block['side'] = sides
+        block['price'] = prices
+        block['quantity'] = quantities
+        block['cost'] = costs
+        block['fee'] = 0.0 if fees is None else fees
+        block['profit'] = profits
+        self._size += count
+
+    def to_frame(self) -> pd.DataFrame:
+        """Trades as a DataFrame with the historical column names"""
+        return pd.DataFrame({
+            'timestamp': self.timestamps(),
+            'type': self.sides(),
+            'price': self.column('price'),
+            'quantity': self.column('quantity'),
+            'cost': self.column('cost'),
+            'fee': self.column('fee'),
+            'profit': self.column('profit'),
+        })
+
+    def _grow(self, required: int):
+        """Double the capacity until it fits the required size"""
+        capacity = len(self._data)
+        while capacity < required:
+            capacity *= 2
+        data = np.zeros(capacity, dtype=TRADE_DTYPE)
+        data[:self._size] = self._data[:self._size]
+        self._data = data
+
+    def _encode_timestamp(self, timestamp: Any) -> int:
+        """Convert a timestamp to its int64 storage value"""
+        if isinstance(timestamp, (datetime, np.datetime64)):
+            timestamp = pd.Timestamp(timestamp)
+            self._is_datetime = True
+            if timestamp.tzinfo is not None:
+                self._tz = timestamp.tzinfo
+            return timestamp.value
+        return int(timestamp)
+
+    def _encode_timestamps(self, timestamps: Sequence) -> np.ndarray:
+        """Vectorized version of _encode_timestamp"""
+        index = pd.Index(timestamps)
+        if isinstance(index, pd.DatetimeIndex):
+            self._is_datetime = True
+            if index.tz is not None:
+                self._tz = index.tz
+            # asi8 counts in the index unit, which is not always ns in pandas 2
+            return index.as_unit('ns').asi8
+        return index.to_numpy(dtype=np.int64)
+
+    def _to_dict(self, record) -> Dict[str, Any]:
+        """Rebuild the trade dict of a stored record"""
+        timestamp = int(record['timestamp'])
+        if self._is_datetime:
+            timestamp = pd.Timestamp(timestamp, tz='UTC').tz_convert(self._tz) if self._tz else pd.Timestamp(timestamp)
+        return {
+            'timestamp': timestamp,
+            'type': 'BUY' if record['side'] == SIDE_BUY else 'SELL',
+            'price': float(record['price']),
+            'quantity': float(record['quantity']),
+            'cost': float(record['cost']),
+            'fee': float(record['fee']),
+            'profit': float(record['profit'])
+        }
@@ -0,0 +1,87 @@
+# src/backtesting/metrics.py
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+from ..utils.clock import INTERVAL_SECONDS
+
+SECONDS_PER_YEAR = 365 * 24 * 60 * 60  # crypto markets trade every day
+
+def interval_seconds(interval: Optional[str] = None, index: Optional[pd.Index] = None) -> Optional[float]:
+    """Bar length from a kline interval, or inferred from a datetime index"""
+    if interval is not None:
+        if interval not in INTERVAL_SECONDS:
+            raise ValueError(f"Unknown kline interval: {interval}")
+        return float(INTERVAL_SECONDS[interval])
+    if isinstance(index, pd.DatetimeIndex) and len(index) > 1:
+        step = np.median(np.diff(index.asi8)) / 1e9
+        return float(step) if step > 0 else None
+    return None
+
+def periods_per_year(interval: Optional[str] = None, index: Optional[pd.Index] = None) -> float:
+    """Number of bars in a year; daily bars are assumed when nothing is known"""
+    seconds = interval_seconds(interval, index)
+    return SECONDS_PER_YEAR / (seconds or INTERVAL_SECONDS['1d'])
+
+def compute_metrics(equity: np.ndarray, periods: float, positions: Optional[np.ndarray] = None,
+                    risk_free_rate: float = 0.01) -> Dict[str, float]:
+    """Risk and return metrics of an equity curve
+
+    ``periods`` is the number of bars per year used to annualize. Every metric
+    is derived from the same returns and drawdown arrays, so the curve is only
+    traversed a handful of times whatever its length. ``positions`` (non-zero
+    while invested) enables exposure and average trade duration, in bars.
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    metrics = {
+        'sharpe_ratio': 0.0, 'sortino_ratio': 0.0, 'calmar_ratio': 0.0, 'cagr': 0.0,
+        'volatility': 0.0, 'max_drawdown': 0.0, 'max_drawdown_abs': 0.0,
+        'ulcer_index': 0.0, 'exposure': 0.0, 'avg_trade_duration': 0.0,
+    }
+    if len(equity) < 2:
+        return metrics
+
+    returns = np.diff(equity) / equity[:-1]
+    excess = returns - risk_free_rate / periods
+    std = returns.std(ddof=1)
+    downside = np.sqrt(np.mean(np.minimum(excess, 0.0) ** 2))
+    if std > 0:
+        metrics['sharpe_ratio'] = float(np.sqrt(periods) * excess.mean() / std)
+        metrics['volatility'] = float(std * np.sqrt(periods))
+    if downside > 0:
+        metrics['sortino_ratio'] = float(np.sqrt(periods) * excess.mean() / downside)
+
+    peaks = np.maximum.accumulate(equity)
+    drawdown = (peaks - equity) / peaks
+    metrics['max_drawdown'] = float(drawdown.max())
+    metrics['max_drawdown_abs'] = float((peaks - equity).max())
+    metrics['ulcer_index'] = float(np.sqrt(np.mean((drawdown * 100) ** 2)))
+
+    years = (len(equity) - 1) / periods
+    if equity[0] > 0 and equity[-1] > 0 and years > 0:
+        metrics['cagr'] = float((equity[-1] / equity[0]) ** (1 / years) - 1)
+    if metrics['max_drawdown'] > 0:
+        metrics['calmar_ratio'] = metrics['cagr'] / metrics['max_drawdown']
+
+    if positions is not None and len(positions):
+        invested = np.asarray(positions) != 0
+        metrics['exposure'] = float(invested.mean())
+        entries = np.count_nonzero(invested & ~np.concatenate(([False], invested[:-1])))
+        if entries:
+            metrics['avg_trade_duration'] = float(np.count_nonzero(invested) / entries)
+
+    return metrics
+
+def rolling_metrics(equity: pd.Series, window: int, periods: float,
+                    risk_free_rate: float = 0.01) -> pd.DataFrame:
+    """Rolling Sharpe, volatility, return and drawdown over ``window`` bars"""
+    returns = equity.pct_change()
+    mean = returns.rolling(window).mean()
+    std = returns.rolling(window).std()
+    peaks = equity.rolling(window, min_periods=1).max()
+    return pd.DataFrame({
+        'return': equity.pct_change(window),
+        'volatility': std * np.sqrt(periods),
+        'sharpe_ratio': np.sqrt(periods) * (mean - risk_free_rate / periods) / std.replace(0.0, np.nan),
+        'drawdown': (peaks - equity) / peaks,
+    })
@@ -0,0 +1,135 @@
+# src/backtesting/monte_carlo.py
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+from .engine import BacktestResult
+from .ledger import SIDE_BUY, SIDE_SELL
+
+def _simulate_chunk(returns: np.ndarray, method: str, block_size: int, n_paths: int,
+                    seed: np.random.SeedSequence, initial_capital: float,
+                    periods_per_year: float) -> np.ndarray:
+    """Simulate n_paths equity paths and return their (final, drawdown, sharpe) rows"""
+    rng = np.random.default_rng(seed)
+    n = len(returns)
+
+    if method == "permute":
+        sampled = rng.permuted(np.broadcast_to(returns, (n_paths, n)), axis=1)
+    elif method == "blocks":
+        n_blocks = -(-n // block_size)
+        starts = rng.integers(0, n - block_size + 1, size=(n_paths, n_blocks))
+        index = (starts[:, :, None] + np.arange(block_size)).reshape(n_paths, -1)[:, :n]
+        sampled = returns[index]
+    else:
+        sampled = returns[rng.integers(0, n, size=(n_paths, n))]
+
+    paths = initial_capital * np.cumprod(1 + sampled, axis=1)
+    peaks = np.maximum(np.maximum.accumulate(paths, axis=1), initial_capital)
+    max_drawdown = (1 - paths / peaks).max(axis=1)
+
+    std = sampled.std(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, sampled.mean(axis=1) / std * np.sqrt(periods_per_year), 0.0)
+
+    return np.column_stack((paths[:, -1], max_drawdown, sharpe))
+
+class MonteCarloResult:
+    """Distributions produced by a Monte Carlo run"""
+    def __init__(self, samples: np.ndarray, method: str):
+        self.method = method
+        self.final_equity = samples[:, 0]
+        self.max_drawdown = samples[:, 1]
+        self.sharpe_ratio = samples[:, 2]
+
+    def __len__(self) -> int:
+        return len(self.final_equity)
+
+    def percentiles(self, q: Sequence[float] = (5, 25, 50, 75, 95)) -> Dict[str, Dict[float, float]]:
+        """Percentiles of each distribution"""
+        return {
+            name: dict(zip(q, np.percentile(values, q).tolist()))
+            for name, values in (
+                ('final_equity', self.final_equity),
+                ('max_drawdown', self.max_drawdown),
+                ('sharpe_ratio', self.sharpe_ratio),
+            )
+        }
+
+    def probability_of_loss(self, initial_capital: float) -> float:
+        """Share of paths ending below the initial capital"""
+        return float(np.mean(self.final_equity < initial_capital))
+
+class MonteCarloAnalyzer:
+    """Monte Carlo robustness analysis of a backtest
+
+    Trade returns can be bootstrapped (with replacement) or permuted, and the
+    bar returns of the equity curve can be resampled in contiguous blocks to
+    keep volatility clustering. Paths are simulated in chunks of NumPy arrays;
+    each chunk has its own child seed, so results only depend on ``seed`` and
+    not on how many worker processes run the chunks.
+    """
+    def __init__(self, result: BacktestResult, initial_capital: float = 10000.0,
+                 n_simulations: int = 10000, seed: Optional[int] = None,
+                 max_workers: Optional[int] = None, chunk_size: int = 1000,
+                 periods_per_year: Optional[float] = None):
+        if n_simulations < 1:
+            raise ValueError(f"n_simulations must be at least 1: {n_simulations}")
+        self.result = result
+        self.initial_capital = initial_capital
+        self.n_simulations = n_simulations
+        self.seed = seed
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.periods_per_year = periods_per_year or result.periods_per_year
+
+    def trade_returns(self) -> np.ndarray:
+        """Return of each closed trade relative to the equity before it"""
+        trades = self.result.trades
+        sides = trades.column('side')
+        profits = trades.column('profit')[sides == SIDE_SELL]
+        if len(profits) == 0 or not np.any(sides == SIDE_BUY):
+            return np.empty(0)
+        equity_before = self.initial_capital + np.concatenate(([0.0], np.cumsum(profits)[:-1]))
+        return profits / equity_before
+
+    def bar_returns(self) -> np.ndarray:
+        """Per-bar returns of the equity curve"""
+        if self.result.equity_curve is None:
+            return np.empty(0)
+        equity = self.result.equity_curve.to_numpy(dtype=np.float64)
+        return np.diff(equity) / equity[:-1]
+
+    def resample_trades(self, method: str = "bootstrap") -> MonteCarloResult:
+        """Bootstrap ("bootstrap") or reshuffle ("permute") the trade returns"""
+        if method not in ("bootstrap", "permute"):
+            raise ValueError(f"Unknown resampling method: {method}")
+        return self._run(self.trade_returns(), method, block_size=1, periods_per_year=1)
+
+    def bootstrap_blocks(self, block_size: int = 24) -> MonteCarloResult:
+        """Resample the equity curve bar returns in contiguous blocks"""
+        returns = self.bar_returns()
+        return self._run(returns, "blocks", min(block_size, max(len(returns), 1)),
+                         self.periods_per_year)
+
+    def _run(self, returns: np.ndarray, method: str, block_size: int,
+             periods_per_year: float) -> MonteCarloResult:
+        """Split the simulations in chunks and run them, in parallel when allowed"""
+        if len(returns) == 0:
+            raise ValueError("Backtest has no returns to resample")
+
+        sizes = [self.chunk_size] * (self.n_simulations // self.chunk_size)
+        if self.n_simulations % self.chunk_size:
+            sizes.append(self.n_simulations % self.chunk_size)
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+
+        jobs = [
+            (returns, method, block_size, size, seed, self.initial_capital, periods_per_year)
+            for size, seed in zip(sizes, seeds)
+        ]
+        if self.max_workers == 1 or len(jobs) <= 1:
+            chunks: List[np.ndarray] = [_simulate_chunk(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                chunks = list(executor.map(_simulate_chunk, *zip(*jobs)))
+
+        return MonteCarloResult(np.concatenate(chunks), method)
@@ -0,0 +1,135 @@
+# src/backtesting/portfolio.py
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Union
+from ..trading.strategy import TradingStrategy
+from ..utils.logger import Logger
+from .engine import BacktestResult
+from .fill_model import FillModel
+from .kernels import positions_from_signals
+
+class PortfolioResult:
+    """Container for portfolio backtest results"""
+    def __init__(self):
+        self.equity_curve: Optional[pd.Series] = None
+        self.asset_pnl: Optional[pd.DataFrame] = None
+        self.positions: Optional[pd.DataFrame] = None
+        self.attribution: Dict[str, Dict] = {}
+        self.metrics: Dict = {}
+
+    def calculate_metrics(self, initial_capital: float):
+        """Calculate portfolio level metrics"""
+        if self.equity_curve is None or self.equity_curve.empty:
+            return
+        result = BacktestResult()
+        result.equity_curve = self.equity_curve
+        self.metrics = {
+            'total_return': float(self.equity_curve.iloc[-1] / initial_capital - 1),
+            'final_equity': float(self.equity_curve.iloc[-1])
+        }
+        self.metrics.update(result.calculate_equity_metrics())
+
+class PortfolioBacktester:
+    """Backtest one strategy over many symbols sharing the same capital
+
+    Closes are aligned on the union of all timestamps into a (bars, symbols)
+    matrix; gaps are forward-filled so a missing candle means a flat price.
+    Each symbol owns a fixed share of equity (``weights``) that is invested
+    while its strategy is long and kept in cash otherwise. Portfolio returns,
+    costs and per-symbol attribution are computed with matrix operations.
+
+    Sleeves are brought back to their target share at every close, so
+    costs are charged on the traded fraction of equity: entries and exits,
+    and the rebalancing of weights that drifted with prices in between.
+    """
+    def __init__(self, data: Dict[str, pd.DataFrame],
+                 strategy: Union[TradingStrategy, Dict[str, TradingStrategy]],
+                 weights: Optional[Dict[str, float]] = None, initial_capital: float = 10000.0,
+                 position_fraction: float = 0.95, fill_model: Optional[FillModel] = None,
+                 logger: Optional[Logger] = None):
+        if not data:
+            raise ValueError("Portfolio backtest needs at least one symbol")
+        self.data = data
+        self.symbols = list(data)
+        self.strategies = strategy if isinstance(strategy, dict) else {s: strategy for s in self.symbols}
+        self.weights = self._normalize_weights(weights)
+        self.initial_capital = initial_capital
+        self.position_fraction = position_fraction
+        self.fill_model = fill_model or FillModel()
+        self.logger = logger or Logger("backtest.log")
+
+    def _normalize_weights(self, weights: Optional[Dict[str, float]]) -> np.ndarray:
+        """Weights as an array in symbol order, summing to one"""
+        if weights is None:
+            return np.full(len(self.symbols), 1.0 / len(self.symbols))
+        values = np.array([weights.get(symbol, 0.0) for symbol in self.symbols], dtype=np.float64)
+        if values.sum() <= 0:
+            raise ValueError("Portfolio weights must sum to a positive value")
+        return values / values.sum()
+
+    def align(self) -> pd.DataFrame:
+        """Close prices of every symbol on a shared time index"""
+        closes = pd.concat(
+            {symbol: frame['fechamento'].astype(float) for symbol, frame in self.data.items()},
+            axis=1
+        ).sort_index()
+        return closes.ffill()
+
+    def signal_matrix(self, index: pd.Index) -> np.ndarray:
+        """Signals of every symbol, computed on its own candles and placed on the shared index"""
+        signals = np.zeros((len(index), len(self.symbols)), dtype=np.int8)
+        for column, symbol in enumerate(self.symbols):
+            frame = self.data[symbol]
+            own = self.strategies[symbol].generate_signals(frame)
+            signals[:, column] = pd.Series(own, index=frame.index).reindex(index, fill_value=0).to_numpy()
+        return signals
+
+    def run(self) -> PortfolioResult:
+        """Run the portfolio backtest"""
+        self.logger.log(f"Starting portfolio backtest: {', '.join(self.symbols)}")
+        closes = self.align()
+        prices = closes.to_numpy(dtype=np.float64)
+        positions = positions_from_signals(self.signal_matrix(closes.index))
+
+        # Return of each bar, zero before a symbol's first candle
+        returns = np.zeros_like(prices)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns[1:] = prices[1:] / prices[:-1] - 1
+        returns = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+        # Exposure held during bar t was decided at the close of bar t-1
+        exposure = self.weights * self.position_fraction * positions
+        held = np.vstack((np.zeros((1, len(self.symbols))), exposure[:-1]))
+        # Weights at the close before trading, after the bar moved them away from target
+        gross = 1 + (held * returns).sum(axis=1, keepdims=True)
+        drifted = held * (1 + returns) / gross
+        turnover = np.abs(exposure - drifted)
+        cost_rate = self.fill_model.fill_price("BUY", 1.0) - 1 + self.fill_model.taker_fee
+
+        # Turnover is a fraction of the equity after the bar's returns
+        contribution = held * returns - turnover * gross * cost_rate
+        growth = np.cumprod(1 + contribution.sum(axis=1))
+        equity = self.initial_capital * growth
+        equity_before = self.initial_capital * np.concatenate(([1.0], growth[:-1]))
+        asset_pnl = np.cumsum(contribution * equity_before[:, None], axis=0)
+
+        result = PortfolioResult()
+        result.equity_curve = pd.Series(equity, index=closes.index)
+        result.asset_pnl = pd.DataFrame(asset_pnl, index=closes.index, columns=self.symbols)
+        result.positions = pd.DataFrame(positions, index=closes.index, columns=self.symbols)
+
+        total_pnl = equity[-1] - self.initial_capital
+        for column, symbol in enumerate(self.symbols):
+            pnl = float(asset_pnl[-1, column])
+            result.attribution[symbol] = {
+                'weight': float(self.weights[column]),
+                'pnl': pnl,
+                'contribution': pnl / total_pnl if total_pnl else 0.0,
+                'exposure': float(positions[:, column].mean()),
+                'trades': int(np.count_nonzero(np.diff(positions[:, column], prepend=0)))
+            }
+        result.calculate_metrics(self.initial_capital)
+
+        self.logger.log(f"Portfolio return: {result.metrics['total_return']:.2%}")
+        return result
@@ -3,6 +3,7 @@
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from .engine import Backtester, BacktestResult
+from .ledger import SIDE_BUY
 from typing import Optional
 import pandas as pd
 
@@ -36,13 +37,14 @@ class BacktestVisualizer:
         )
         
         # Add trade markers
-        buy_trades = [t for t in self.result.trades if t['type'] == 'BUY']
-        sell_trades = [t for t in self.result.trades if t['type'] == 'SELL']
+        timestamps = self.result.trades.timestamps()
+        prices = self.result.trades.column('price')
+        is_buy = self.result.trades.column('side') == SIDE_BUY
         
         fig.add_trace(
             go.Scatter(
-                x=[t['timestamp'] for t in buy_trades],
-                y=[t['price'] for t in buy_trades],
+                x=timestamps[is_buy],
+                y=prices[is_buy],
                 mode='markers',
                 marker=dict(symbol='triangle-up', size=10, color='green'),
                 name='Buy'
@@ -52,8 +54,8 @@ class BacktestVisualizer:
         
         fig.add_trace(
             go.Scatter(
-                x=[t['timestamp'] for t in sell_trades],
-                y=[t['price'] for t in sell_trades],
+                x=timestamps[~is_buy],
+                y=prices[~is_buy],
                 mode='markers',
                 marker=dict(symbol='triangle-down', size=10, color='red'),
                 name='Sell'
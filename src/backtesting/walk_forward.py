@@ -0,0 +1,205 @@
+# src/backtesting/walk_forward.py
+
+import itertools
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from ..trading.strategy import SIGNAL_BUY, SIGNAL_SELL
+from ..utils.logger import Logger
+from .engine import BacktestResult
+from .fill_model import FillModel
+from .kernels import positions_from_signals
+
+def moving_averages(close: np.ndarray, periods: Iterable[int]) -> Dict[int, np.ndarray]:
+    """Rolling means of close for every period, computed once for the whole history"""
+    series = pd.Series(close)
+    return {
+        period: series.rolling(window=period).mean().to_numpy()
+        for period in sorted(set(periods))
+    }
+
+def crossover_positions(fast: np.ndarray, slow: np.ndarray) -> np.ndarray:
+    """Long/flat state (1/0) held after each bar close by MovingAverageStrategy
+
+    Mirrors Backtester: a BUY signal opens the position, a SELL closes it and
+    bars without a signal keep the previous state. Warm-up bars are NaN in the
+    averages and therefore produce no signal.
+    """
+    signals = np.zeros(len(fast), dtype=np.int8)
+    signals[fast > slow] = SIGNAL_BUY
+    signals[fast < slow] = SIGNAL_SELL
+    return positions_from_signals(signals)
+
+def simulate_positions(close: np.ndarray, positions: np.ndarray, fraction: float = 0.95,
+                       fill_model: Optional[FillModel] = None) -> np.ndarray:
+    """Equity path (starting at 1.0) of a long/flat position array, without a Python loop
+
+    Entries and exits fill at the close of the bar where the position changes,
+    investing ``fraction`` of equity like Backtester. Fees, slippage and spread
+    come from the fill model; lot size rounding is ignored.
+    """
+    fill_model = fill_model or FillModel(taker_fee=0.0, maker_fee=0.0, slippage=0.0)
+    buy_cost = fill_model.fill_price("BUY", 1.0) * (1 + fill_model.taker_fee)
+    sell_value = fill_model.fill_price("SELL", 1.0) * (1 - fill_model.taker_fee)
+
+    held = positions.astype(bool)
+    previous = np.concatenate(([False], held[:-1]))
+    entry_idx = np.flatnonzero(held & ~previous)
+    exit_idx = np.flatnonzero(~held & previous)
+
+    equity = np.ones(len(close), dtype=np.float64)
+    if len(entry_idx) == 0:
+        return equity
+
+    entry_price = close[entry_idx] * buy_cost
+    closed = len(exit_idx)
+    trade_multiplier = (1 - fraction) + fraction * close[exit_idx] * sell_value / entry_price[:closed]
+    equity_after = np.cumprod(trade_multiplier)
+    equity_start = np.concatenate(([1.0], equity_after))[:len(entry_idx)]
+
+    trade_id = np.cumsum(held & ~previous) - 1
+    tid = trade_id[held]
+    equity[held] = equity_start[tid] * ((1 - fraction) + fraction * close[held] / entry_price[tid])
+
+    flat_after_trade = ~held & (trade_id >= 0)
+    equity[flat_after_trade] = equity_after[trade_id[flat_after_trade]]
+    return equity
+
+def score_equity(equity: np.ndarray, objective: str = "return") -> float:
+    """Score an equity path for parameter selection"""
+    if objective == "sharpe":
+        returns = np.diff(equity) / equity[:-1]
+        std = returns.std()
+        return float(returns.mean() / std) if std > 0 else 0.0
+    return float(equity[-1] / equity[0] - 1)
+
+def _optimize_window(close: np.ndarray, averages: Dict[int, np.ndarray],
+                     candidates: Sequence[Tuple[int, int]], fraction: float,
+                     fill_model: FillModel, objective: str) -> Tuple[Tuple[int, int], float]:
+    """Best (fast, slow) pair on one in-sample window"""
+    best_params, best_score = candidates[0], -np.inf
+    for fast, slow in candidates:
+        positions = crossover_positions(averages[fast], averages[slow])
+        score = score_equity(simulate_positions(close, positions, fraction, fill_model), objective)
+        if score > best_score:
+            best_params, best_score = (fast, slow), score
+    return best_params, best_score
+
+class WalkForwardResult:
+    """Container for walk-forward results"""
+    def __init__(self):
+        self.windows: List[Dict] = []
+        self.equity_curve: Optional[pd.Series] = None
+        self.metrics: Dict = {}
+
+    def calculate_metrics(self, initial_capital: float):
+        """Calculate metrics of the stitched out-of-sample equity"""
+        if self.equity_curve is None or self.equity_curve.empty:
+            return
+        result = BacktestResult()
+        result.equity_curve = self.equity_curve
+        self.metrics = {
+            'windows': len(self.windows),
+            'total_return': float(self.equity_curve.iloc[-1] / initial_capital - 1),
+            'final_equity': float(self.equity_curve.iloc[-1])
+        }
+        self.metrics.update(result.calculate_equity_metrics())
+
+class WalkForwardOptimizer:
+    """Rolling in-sample optimization with out-of-sample validation for MovingAverageStrategy
+
+    Every (fast, slow) moving average is computed once over the full history,
+    so the in-sample windows only slice precomputed arrays. Windows are
+    optimized in parallel processes; each winner is then evaluated on the
+    bars that follow it and the out-of-sample curves are chained together.
+    """
+    def __init__(self, data: pd.DataFrame, param_grid: Dict[str, Sequence[int]],
+                 in_sample_bars: int, out_of_sample_bars: int, step_bars: Optional[int] = None,
+                 anchored: bool = False, initial_capital: float = 10000.0,
+                 position_fraction: float = 0.95, fill_model: Optional[FillModel] = None,
+                 objective: str = "return", max_workers: Optional[int] = None,
+                 logger: Optional[Logger] = None):
+        self.data = data
+        self.candidates = [
+            (fast, slow)
+            for fast, slow in itertools.product(param_grid['fast_period'], param_grid['slow_period'])
+            if fast < slow
+        ]
+        if not self.candidates:
+            raise ValueError("param_grid has no combination with fast_period < slow_period")
+
+        self.in_sample_bars = in_sample_bars
+        self.out_of_sample_bars = out_of_sample_bars
+        self.step_bars = step_bars or out_of_sample_bars
+        self.anchored = anchored
+        self.initial_capital = initial_capital
+        self.position_fraction = position_fraction
+        self.fill_model = fill_model or FillModel()
+        self.objective = objective
+        self.max_workers = max_workers
+        self.logger = logger or Logger("backtest.log")
+
+    def split(self, length: int) -> List[Tuple[int, int, int]]:
+        """(in-sample start, out-of-sample start, out-of-sample end) of each window"""
+        windows = []
+        start = 0
+        while start + self.in_sample_bars < length:
+            oos_start = start + self.in_sample_bars
+            oos_end = min(oos_start + self.out_of_sample_bars, length)
+            windows.append((0 if self.anchored else start, oos_start, oos_end))
+            start += self.step_bars
+        return windows
+
+    def run(self) -> WalkForwardResult:
+        """Run the walk-forward analysis"""
+        self.logger.log("Starting walk-forward optimization...")
+        close = self.data['fechamento'].to_numpy(dtype=np.float64)
+        periods = {period for pair in self.candidates for period in pair}
+        averages = moving_averages(close, periods)
+        windows = self.split(len(close))
+
+        jobs = [
+            (
+                close[start:oos_start],
+                {period: values[start:oos_start] for period, values in averages.items()},
+                self.candidates, self.position_fraction, self.fill_model, self.objective
+            )
+            for start, oos_start, _ in windows
+        ]
+
+        if self.max_workers == 1 or len(jobs) <= 1:
+            best = [_optimize_window(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                best = list(executor.map(_optimize_window, *zip(*jobs)))
+
+        result = WalkForwardResult()
+        segments, index = [], []
+        equity = self.initial_capital
+        for (start, oos_start, oos_end), ((fast, slow), in_sample_score) in zip(windows, best):
+            positions = crossover_positions(averages[fast][oos_start:oos_end],
+                                            averages[slow][oos_start:oos_end])
+            path = simulate_positions(close[oos_start:oos_end], positions,
+                                      self.position_fraction, self.fill_model)
+            segments.append(equity * path)
+            index.append(self.data.index[oos_start:oos_end])
+            result.windows.append({
+                'in_sample_start': self.data.index[start],
+                'out_of_sample_start': self.data.index[oos_start],
+                'out_of_sample_end': self.data.index[oos_end - 1],
+                'fast_period': fast,
+                'slow_period': slow,
+                'in_sample_score': in_sample_score,
+                'out_of_sample_return': float(path[-1] - 1)
+            })
+            equity *= path[-1]
+
+        if segments:
+            result.equity_curve = pd.Series(np.concatenate(segments), index=index[0].append(index[1:]))
+        result.calculate_metrics(self.initial_capital)
+
+        self.logger.log(f"Walk-forward windows: {len(result.windows)}")
+        if result.metrics:
+            self.logger.log(f"Out-of-sample return: {result.metrics['total_return']:.2%}")
+        return result
@@ -0,0 +1,287 @@
+# src/cli.py
+"""
+Headless command line for servers without a display.
+
+    python -m src.cli run BTCBRL --quantity 0.001 [--paper] [--sizer volatility --risk-fraction 0.01]
+    python -m src.cli backtest BTCBRL --interval 1h --fast 7 --slow 40
+    python -m src.cli sync-data BTCBRL --interval 1h --days 365
+    python -m src.cli optimize BTCBRL --in-sample 2000 --out-of-sample 500
+
+Only argparse and the config dataclasses are imported at module level;
+every command imports what it needs (pandas, python-binance, the engines)
+when it runs, and nothing here touches customtkinter or plotly, so
+``--help`` and argument errors return immediately.
+"""
+import argparse
+import sys
+from typing import Any, List, Optional, Tuple
+from .utils.config import DatabaseConfig
+
+def _open_db(args: argparse.Namespace):
+    from .database.crypto_db import CryptoDatabase
+    return CryptoDatabase(args.db)
+
+def _load_candles(args: argparse.Namespace):
+    db = _open_db(args)
+    data = db.load_candles(args.symbol, args.interval)
+    if data.empty and args.interval != "1m":
+        # Build the interval from stored 1m candles when it was not synced itself
+        from .trading.resampler import CandleResampler
+        resampler = CandleResampler([args.interval], max_bars=None)
+        resampler.update_frame(db.load_candles(args.symbol, "1m"))
+        data = resampler.get(args.interval).drop(columns="tempo_fechamento")
+    if data.empty:
+        raise SystemExit(f"No {args.interval} candles for {args.symbol} in {args.db}; run sync-data first")
+    return data
+
+def _print_metrics(metrics: dict, as_json: bool) -> None:
+    if as_json:
+        import json
+        print(json.dumps(metrics, indent=2, default=str))
+        return
+    for name, value in metrics.items():
+        print(f"{name:<24} {value:.6g}" if isinstance(value, float) else f"{name:<24} {value}")
+
+def _strategy(args: argparse.Namespace):
+    from .trading.strategy import create_strategy
+
+    params = {}
+    if args.strategy == "moving_average":
+        params = {'fast_period': args.fast, 'slow_period': args.slow}
+    params.update(args.param)
+    return create_strategy(args.strategy, **params)
+
+def _sizer(args: argparse.Namespace):
+    """Position sizer of the run, or None to buy the session quantity on every entry"""
+    from .trading.position_sizing import FixedFractionSizer, VolatilitySizer
+
+    if args.sizer == "fixed":
+        return FixedFractionSizer(args.max_fraction)
+    if args.sizer == "volatility":
+        return VolatilitySizer(risk_fraction=args.risk_fraction, max_fraction=args.max_fraction)
+    return None
+
+def cmd_run(args: argparse.Namespace) -> int:
+    """Run the trading engine, live or over stored candles"""
+    from .utils.latency import LatencyRecorder
+    from .utils.logger import Logger
+    from .utils.telemetry import MetricsRegistry, MetricsServer
+    from .utils.trade_journal import TradeJournal
+    from .trading.trading_engine import TradingEngine
+
+    logger = Logger(args.log_file)
+    registry = MetricsRegistry()
+    server = None
+    if args.metrics_port is not None:
+        server = MetricsServer(registry, args.metrics_host, args.metrics_port)
+        logger.log(f"Métricas disponíveis em http://{args.metrics_host}:{server.start()}/metrics")
+
+    db = _open_db(args)
+    latency = LatencyRecorder(args.latency_file)
+    journal = TradeJournal(args.journal) if args.journal else None
+    try:
+        if args.paper:
+            from .trading.paper_exchange import PaperExchange, run_paper_trading
+            from .utils.config import TradingConfig
+
+            quote = args.quote_asset
+            exchange = PaperExchange({args.symbol: _load_candles(args)}, balances={quote: args.capital},
+                                     quote_asset=quote, start=TradingConfig.slow_ma_period)
+            engine = TradingEngine("", "", db, logger, client=exchange, interval=args.interval,
+                                   latency=latency, registry=registry, strategy=_strategy(args),
+                                   sizer=_sizer(args), journal=journal)
+            if not engine.open_session(args.symbol, args.capital, args.quantity):
+                return 1
+            equity = run_paper_trading(engine, exchange, steps=args.steps, logger=logger)
+            engine.stop_trading_session()
+            _print_metrics({'iterations': len(equity), 'final_equity': float(equity.iloc[-1]),
+                            'total_return': float(equity.iloc[-1] / args.capital - 1)}, args.json)
+            return 0
+
+        from .utils.config import Config
+        config = Config()
+        engine = TradingEngine(config.api_key, config.api_secret, db, logger, interval=args.interval,
+                               latency=latency, registry=registry, strategy=_strategy(args),
+                               sizer=_sizer(args), journal=journal)
+        if not engine.start_trading_session(args.symbol, args.capital, args.quantity):
+            return 1
+        try:
+            while engine.trading_thread.is_alive():
+                engine.trading_thread.join(1.0)
+        except KeyboardInterrupt:
+            engine.stop_trading_session()
+        return 0
+    finally:
+        if journal is not None:
+            journal.close()
+        if server is not None:
+            server.stop()
+
+def cmd_backtest(args: argparse.Namespace) -> int:
+    """Backtest a strategy on stored candles"""
+    data = _load_candles(args)
+    strategy = _strategy(args)
+    if args.engine == "event":
+        from .backtesting.event_engine import EventDrivenBacktester
+        backtester = EventDrivenBacktester(data, strategy, initial_capital=args.capital, interval=args.interval)
+    else:
+        from .backtesting.engine import Backtester
+        backtester = Backtester(data, strategy, initial_capital=args.capital, interval=args.interval, fast=True)
+    result = backtester.run()
+    _print_metrics(result.metrics, args.json)
+    return 0
+
+def cmd_sync_data(args: argparse.Namespace) -> int:
+    """Download closed candles missing from the database"""
+    import time
+    from binance.client import Client
+
+    db = _open_db(args)
+    last = db.get_last_candle_time(args.symbol, args.interval)
+    if last is not None and not args.full:
+        start = last + 1
+    else:
+        start = int((time.time() - args.days * 24 * 60 * 60) * 1000)
+
+    client = Client()  # klines are public; no credentials needed
+    klines = client.get_historical_klines(args.symbol, args.interval, start)
+    now_ms = int(time.time() * 1000)
+    # The last kline is usually the candle still forming
+    closed = [k for k in klines if int(k[6]) < now_ms]
+    saved = db.save_candles(args.symbol, args.interval, closed)
+    print(f"{saved} candles saved for {args.symbol} {args.interval}")
+    return 0
+
+def cmd_optimize(args: argparse.Namespace) -> int:
+    """Walk-forward optimization of the moving average periods on stored candles"""
+    from .backtesting.walk_forward import WalkForwardOptimizer
+
+    optimizer = WalkForwardOptimizer(
+        _load_candles(args),
+        param_grid={'fast_period': args.fast, 'slow_period': args.slow},
+        in_sample_bars=args.in_sample,
+        out_of_sample_bars=args.out_of_sample,
+        step_bars=args.step,
+        anchored=args.anchored,
+        initial_capital=args.capital,
+        objective=args.objective,
+        max_workers=args.workers
+    )
+    result = optimizer.run()
+    if args.json:
+        _print_metrics({'metrics': result.metrics, 'windows': result.windows}, True)
+        return 0
+    for window in result.windows:
+        print(f"{window['out_of_sample_start']}  fast={window['fast_period']:<4} slow={window['slow_period']}")
+    _print_metrics(result.metrics, False)
+    return 0
+
+def _int_list(value: str) -> List[int]:
+    """Comma separated integers, with a-b ranges (e.g. "5,7,10-12")"""
+    values = []
+    for part in value.split(","):
+        if "-" in part:
+            low, high = part.split("-", 1)
+            values.extend(range(int(low), int(high) + 1))
+        else:
+            values.append(int(part))
+    return values
+
+def _param(value: str) -> Tuple[str, Any]:
+    """KEY=VALUE strategy parameter; numeric values are converted"""
+    key, sep, raw = value.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got {value!r}")
+    for convert in (int, float):
+        try:
+            return key, convert(raw)
+        except ValueError:
+            pass
+    return key, raw
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("symbol", help="Trading pair, e.g. BTCBRL")
+    common.add_argument("--interval", default="1h", help="Kline interval (default: 1h)")
+    common.add_argument("--db", default=DatabaseConfig.db_name,
+                        help=f"SQLite database (default: {DatabaseConfig.db_name})")
+    common.add_argument("--profile", nargs="?", const="profiles", metavar="DIR",
+                        help="Profile the command and write the results to DIR "
+                             "(SIGUSR1 toggles profiling during run)")
+    common.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    strategy = argparse.ArgumentParser(add_help=False)
+    strategy.add_argument("--strategy", default="moving_average",
+                          help="Registered strategy name or package.module:ClassName (default: moving_average)")
+    strategy.add_argument("--param", type=_param, action="append", default=[], metavar="KEY=VALUE",
+                          help="Strategy parameter, repeatable (e.g. --param period=21)")
+    strategy.add_argument("--fast", type=int, default=7, help="moving_average fast period")
+    strategy.add_argument("--slow", type=int, default=40, help="moving_average slow period")
+
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Crypto Trading Bot (headless)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", parents=[common, strategy], help="Run the trading engine")
+    run.add_argument("--quantity", type=float, required=True, help="Order quantity")
+    run.add_argument("--sizer", choices=("fixed", "volatility"),
+                     help="Size entries from the equity instead of buying --quantity")
+    run.add_argument("--risk-fraction", type=float, default=0.01,
+                     help="Equity risked per trade by the volatility sizer (default: 0.01)")
+    run.add_argument("--max-fraction", type=float, default=0.95,
+                     help="Fraction invested by the fixed sizer, cap of the volatility sizer (default: 0.95)")
+    run.add_argument("--capital", type=float, default=1000.0, help="Investment value / paper balance")
+    run.add_argument("--paper", action="store_true", help="Trade on a PaperExchange over stored candles")
+    run.add_argument("--quote-asset", default="BRL", help="Paper account quote asset (default: BRL)")
+    run.add_argument("--steps", type=int, help="Stop the paper run after N candles")
+    run.add_argument("--metrics-host", default="127.0.0.1")
+    run.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this port")
+    run.add_argument("--latency-file", help="Export latency histograms to this JSON file")
+    run.add_argument("--log-file", default=DatabaseConfig.log_file)
+    run.add_argument("--journal", help=f"Append executed trades to this trade journal "
+                                       f"(.csv or Arrow, e.g. {DatabaseConfig.journal_file})")
+    run.set_defaults(func=cmd_run)
+
+    backtest = commands.add_parser("backtest", parents=[common, strategy], help="Backtest on stored candles")
+    backtest.add_argument("--engine", choices=("simple", "event"), default="simple")
+    backtest.add_argument("--capital", type=float, default=10000.0)
+    backtest.set_defaults(func=cmd_backtest)
+
+    sync = commands.add_parser("sync-data", parents=[common], help="Download candles into the database")
+    sync.add_argument("--days", type=float, default=365, help="History to fetch when the table is empty")
+    sync.add_argument("--full", action="store_true", help="Refetch --days of history")
+    sync.set_defaults(func=cmd_sync_data)
+
+    optimize = commands.add_parser("optimize", parents=[common], help="Walk-forward optimization")
+    optimize.add_argument("--fast", type=_int_list, default=[5, 7, 10, 15], help="Fast periods, e.g. 5,7,10-12")
+    optimize.add_argument("--slow", type=_int_list, default=[20, 30, 40, 60], help="Slow periods")
+    optimize.add_argument("--in-sample", type=int, default=2000, help="In-sample bars per window")
+    optimize.add_argument("--out-of-sample", type=int, default=500, help="Out-of-sample bars per window")
+    optimize.add_argument("--step", type=int, help="Bars between windows (default: --out-of-sample)")
+    optimize.add_argument("--anchored", action="store_true")
+    optimize.add_argument("--objective", default="return")
+    optimize.add_argument("--capital", type=float, default=10000.0)
+    optimize.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    optimize.set_defaults(func=cmd_optimize)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    toggle = args.command == "run"
+    if not args.profile and not toggle:
+        return args.func(args)
+
+    from .utils.profiling import profiler
+    # A long run can be profiled on demand: SIGUSR1 toggles the profiler, as in main.py
+    if toggle:
+        profiler.install_signal_toggle()
+    if args.profile:
+        profiler.enable(args.profile)
+    try:
+        return args.func(args)
+    finally:
+        written = profiler.disable()
+        if written:
+            print(f"Profile written to {written}", file=sys.stderr)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,13 @@
 # src/database/__init__.py
-from .base import BaseDatabase, DatabaseError
-from .crypto_db import CryptoDatabase
+from .._lazy import lazy_exports
 
-__all__ = ['BaseDatabase', 'DatabaseError', 'CryptoDatabase']
\ No newline at end of file
+_EXPORTS = {
+    'BaseDatabase': '.base',
+    'DatabaseError': '.base',
+    'CryptoDatabase': '.crypto_db'
+}
+
+__all__ = ['BaseDatabase', 'DatabaseError', 'CryptoDatabase']
+
+# Submodules are imported on first access so importing the package stays cheap
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, __all__)
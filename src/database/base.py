@@ -2,6 +2,7 @@
 
 import sqlite3
 from typing import Optional, List, Tuple, Any
+from ..utils.telemetry import MetricsRegistry
 from contextlib import contextmanager
 from datetime import datetime
 
@@ -11,8 +12,11 @@ class DatabaseError(Exception):
 
 class BaseDatabase:
     """Base class for database operations"""
-    def __init__(self, db_name: str):
+    def __init__(self, db_name: str, registry: Optional[MetricsRegistry] = None):
         self.db_name = db_name
+        self.query_latency = registry.histogram(
+            "db_query_duration_seconds", "SQLite query latency", ["operation"]
+        ) if registry is not None else None
         self.create_tables()
         
     @contextmanager
@@ -31,6 +35,12 @@ class BaseDatabase:
             
     def execute_query(self, query: str, params: Tuple = ()) -> Optional[List[Tuple]]:
         """Execute a query and return results if any"""
+        if self.query_latency is not None:
+            with self.query_latency.labels(query.split(None, 1)[0].upper()).time():
+                return self._execute(query, params)
+        return self._execute(query, params)
+        
+    def _execute(self, query: str, params: Tuple = ()) -> Optional[List[Tuple]]:
         with self.get_cursor() as cursor:
             cursor.execute(query, params)
             if cursor.description is not None:
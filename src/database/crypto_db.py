@@ -1,6 +1,7 @@
 # src/database/crypto_db.py
 
-from typing import List, Tuple, Optional
+import json
+from typing import Any, Dict, List, Tuple, Optional
 from datetime import datetime
 from .base import BaseDatabase, DatabaseError
 
@@ -45,6 +46,53 @@ class CryptoDatabase(BaseDatabase):
                 FOREIGN KEY (session_id) REFERENCES trading_sessions(id),
                 FOREIGN KEY (crypto_code) REFERENCES cryptocurrencies(code)
             )
+            """,
+            # Historical candles table (klines synced from Binance)
+            """
+            CREATE TABLE IF NOT EXISTS candles (
+                symbol TEXT NOT NULL,
+                interval TEXT NOT NULL,
+                open_time INTEGER NOT NULL,
+                open REAL NOT NULL,
+                high REAL NOT NULL,
+                low REAL NOT NULL,
+                close REAL NOT NULL,
+                volume REAL NOT NULL,
+                close_time INTEGER NOT NULL,
+                PRIMARY KEY (symbol, interval, open_time)
+            )
+            """,
+            # Open positions checkpointed by PositionManager, kept apart per mode (live, paper)
+            """
+            CREATE TABLE IF NOT EXISTS positions (
+                mode TEXT NOT NULL DEFAULT 'live',
+                symbol TEXT NOT NULL,
+                quantity REAL NOT NULL,
+                entry_price REAL,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (mode, symbol)
+            )
+            """,
+            # Orders sent but not yet confirmed by the exchange
+            """
+            CREATE TABLE IF NOT EXISTS pending_orders (
+                client_order_id TEXT PRIMARY KEY,
+                mode TEXT NOT NULL DEFAULT 'live',
+                symbol TEXT NOT NULL,
+                side TEXT NOT NULL,
+                quantity REAL NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            # Strategy and engine state as JSON, one row per symbol/interval/strategy
+            """
+            CREATE TABLE IF NOT EXISTS strategy_state (
+                mode TEXT NOT NULL DEFAULT 'live',
+                key TEXT NOT NULL,
+                state TEXT NOT NULL,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (mode, key)
+            )
             """
         ]
         
@@ -123,17 +171,18 @@ class CryptoDatabase(BaseDatabase):
                             investment_quantity: float) -> Optional[int]:
         """Start a new trading session"""
         try:
-            result = self.execute_query(
-                """
-                INSERT INTO trading_sessions 
-                (start_time, crypto_code, investment_value, investment_quantity)
-                VALUES (CURRENT_TIMESTAMP, ?, ?, ?)
-                """,
-                (crypto_code, investment_value, investment_quantity)
-            )
-            # Get the last inserted id
-            session_id = self.execute_query("SELECT last_insert_rowid()")[0][0]
-            return session_id
+            # Insert and read the id on the same connection: last_insert_rowid()
+            # is per connection and every execute_query opens a new one
+            with self.get_cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO trading_sessions 
+                    (start_time, crypto_code, investment_value, investment_quantity)
+                    VALUES (CURRENT_TIMESTAMP, ?, ?, ?)
+                    """,
+                    (crypto_code, investment_value, investment_quantity)
+                )
+                return cursor.lastrowid
         except DatabaseError:
             return None
             
@@ -236,4 +285,138 @@ class CryptoDatabase(BaseDatabase):
             result = self.execute_query(query, params)
             return result if result else []
         except DatabaseError:
-            return []
\ No newline at end of file
+            return []
+            
+    # Candle Methods
+    def save_candles(self, symbol: str, interval: str, klines: List[list]) -> int:
+        """Insert or replace raw klines (as returned by Client.get_klines)"""
+        rows = [
+            (symbol, interval, int(k[0]), float(k[1]), float(k[2]), float(k[3]),
+             float(k[4]), float(k[5]), int(k[6]))
+            for k in klines
+        ]
+        if not rows:
+            return 0
+        try:
+            with self.get_cursor() as cursor:
+                cursor.executemany(
+                    """
+                    INSERT OR REPLACE INTO candles 
+                    (symbol, interval, open_time, open, high, low, close, volume, close_time)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    rows
+                )
+            return len(rows)
+        except DatabaseError:
+            return 0
+            
+    def get_last_candle_time(self, symbol: str, interval: str) -> Optional[int]:
+        """Open time (ms) of the newest stored candle"""
+        try:
+            result = self.execute_query(
+                "SELECT MAX(open_time) FROM candles WHERE symbol = ? AND interval = ?",
+                (symbol, interval)
+            )
+            return result[0][0] if result else None
+        except DatabaseError:
+            return None
+            
+    def load_candles(self, symbol: str, interval: str, start_time: Optional[int] = None,
+                     end_time: Optional[int] = None):
+        """Stored candles as a DataFrame with the backtest columns, indexed by open time (UTC)"""
+        import pandas as pd
+        
+        query = "SELECT open_time, open, high, low, close, volume FROM candles WHERE symbol = ? AND interval = ?"
+        params: list = [symbol, interval]
+        if start_time is not None:
+            query += " AND open_time >= ?"
+            params.append(start_time)
+        if end_time is not None:
+            query += " AND open_time <= ?"
+            params.append(end_time)
+        rows = self.execute_query(query + " ORDER BY open_time", tuple(params)) or []
+        
+        frame = pd.DataFrame(rows, columns=["open_time", "abertura", "maxima", "minima", "fechamento", "volume"])
+        frame.index = pd.to_datetime(frame.pop("open_time"), unit="ms", utc=True)
+        frame.index.name = None
+        return frame
+        
+    # State Checkpoint Methods
+    # Every row belongs to a mode, so paper runs never touch the live state.
+    # Loads raise DatabaseError, so a failed read is not taken for an empty state.
+    def save_position(self, symbol: str, quantity: float, entry_price: Optional[float] = None,
+                      mode: str = 'live') -> bool:
+        """Store the open position of a symbol; a zero quantity removes it"""
+        try:
+            if quantity > 0:
+                self.execute_query(
+                    """
+                    INSERT OR REPLACE INTO positions (mode, symbol, quantity, entry_price, updated_at)
+                    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    """,
+                    (mode, symbol, quantity, entry_price)
+                )
+            else:
+                self.execute_query("DELETE FROM positions WHERE mode = ? AND symbol = ?", (mode, symbol))
+            return True
+        except DatabaseError:
+            return False
+            
+    def load_positions(self, mode: str = 'live') -> Dict[str, Dict[str, Any]]:
+        """Stored positions by symbol"""
+        rows = self.execute_query(
+            "SELECT symbol, quantity, entry_price FROM positions WHERE mode = ?", (mode,)
+        ) or []
+        return {symbol: {'quantity': quantity, 'entry_price': entry_price}
+                for symbol, quantity, entry_price in rows}
+            
+    def save_pending_order(self, client_order_id: str, symbol: str, side: str, quantity: float,
+                           mode: str = 'live') -> bool:
+        """Record an order before sending it, so a crash leaves a trace to reconcile"""
+        try:
+            self.execute_query(
+                """
+                INSERT OR REPLACE INTO pending_orders (client_order_id, mode, symbol, side, quantity)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (client_order_id, mode, symbol, side, quantity)
+            )
+            return True
+        except DatabaseError:
+            return False
+            
+    def delete_pending_order(self, client_order_id: str) -> bool:
+        try:
+            self.execute_query("DELETE FROM pending_orders WHERE client_order_id = ?", (client_order_id,))
+            return True
+        except DatabaseError:
+            return False
+            
+    def load_pending_orders(self, symbol: Optional[str] = None, mode: str = 'live') -> List[Dict[str, Any]]:
+        """Orders recorded as sent but never confirmed, oldest first"""
+        query = "SELECT client_order_id, symbol, side, quantity FROM pending_orders WHERE mode = ?"
+        params: Tuple = (mode,)
+        if symbol:
+            query += " AND symbol = ?"
+            params += (symbol,)
+        rows = self.execute_query(query + " ORDER BY created_at", params) or []
+        return [dict(zip(('client_order_id', 'symbol', 'side', 'quantity'), row)) for row in rows]
+            
+    def save_strategy_state(self, key: str, state: Dict[str, Any], mode: str = 'live') -> bool:
+        """Store a JSON-serializable state dict under ``key``"""
+        try:
+            self.execute_query(
+                """
+                INSERT OR REPLACE INTO strategy_state (mode, key, state, updated_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                """,
+                (mode, key, json.dumps(state))
+            )
+            return True
+        except DatabaseError:
+            return False
+            
+    def load_strategy_state(self, key: str, mode: str = 'live') -> Optional[Dict[str, Any]]:
+        result = self.execute_query("SELECT state FROM strategy_state WHERE mode = ? AND key = ?", (mode, key))
+        return json.loads(result[0][0]) if result else None
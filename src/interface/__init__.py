@@ -4,10 +4,15 @@ Interface module for the crypto trading application.
 Provides all GUI components and windows.
 """
 
-from .base_window import BaseWindow
-from .main_window import MainWindow
-from .crypto_manager import CryptoManagerWindow
-from .backtest_window import BacktestWindow, BacktestTab
+from .._lazy import lazy_exports
+
+_EXPORTS = {
+    'BaseWindow': '.base_window',
+    'MainWindow': '.main_window',
+    'CryptoManagerWindow': '.crypto_manager',
+    'BacktestWindow': '.backtest_window',
+    'BacktestTab': '.backtest_window'
+}
 
 __all__ = [
     'BaseWindow',
@@ -15,4 +20,7 @@ __all__ = [
     'CryptoManagerWindow',
     'BacktestWindow',
     'BacktestTab'
-]
\ No newline at end of file
+]
+
+# Submodules are imported on first access so importing the package stays cheap
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, __all__)
@@ -6,16 +6,25 @@ from datetime import datetime, timedelta
 import pandas as pd
 from ..backtesting.engine import Backtester
 from ..backtesting.visualization import BacktestVisualizer
-from ..trading.strategy import MovingAverageStrategy
+from ..trading.strategy import MovingAverageStrategy, TradingStrategy, create_strategy
 from ..utils.binance_client import BinanceClient
 from .base_window import BaseWindow
 
+# Strategy registry names of the strategy combo box options
+STRATEGY_NAMES = {
+    "Média Móvel": "moving_average",
+    "RSI": "rsi",
+    "MACD": "macd",
+    "Bandas de Bollinger": "bollinger"
+}
+
 class BacktestWindow(BaseWindow):
     """Window for backtesting trading strategies"""
     def __init__(self, parent: ctk.CTk, binance_client: BinanceClient):
         super().__init__()
         self.window = ctk.CTkToplevel(parent)
         self.client = binance_client
+        self.strategy: Optional[TradingStrategy] = None
         self.setup_window()
         self.setup_components()
         
@@ -109,7 +118,7 @@ class BacktestWindow(BaseWindow):
             )
             
             # Create and run backtest
-            strategy = MovingAverageStrategy()
+            strategy = self.strategy or MovingAverageStrategy()
             backtester = Backtester(data, strategy, initial_capital=capital)
             result = backtester.run()
             
@@ -193,7 +202,7 @@ class BacktestTab(ctk.CTkFrame):
         self.strategy_var = ctk.StringVar(value="Média Móvel")
         strategy_combo = ctk.CTkComboBox(
             strategy_frame,
-            values=["Média Móvel", "RSI", "MACD"],
+            values=list(STRATEGY_NAMES),
             variable=self.strategy_var,
             font=("Arial", 14)
         )
@@ -251,4 +260,6 @@ class BacktestTab(ctk.CTkFrame):
             backtest_window.strategy = MovingAverageStrategy(
                 fast_period=int(self.ma_params['fast_period'].get()),
                 slow_period=int(self.ma_params['slow_period'].get())
-            )
\ No newline at end of file
+            )
+        else:
+            backtest_window.strategy = create_strategy(STRATEGY_NAMES[self.strategy_var.get()])
\ No newline at end of file
@@ -3,14 +3,21 @@
 Reusable UI components for the crypto trading application.
 """
 
-from .price_frame import PriceFrame
-from .balance_frame import BalanceFrame
-from .metrics_frame import MetricsFrame
-from .crypto_table import CryptoTable
+from ..._lazy import lazy_exports
+
+_EXPORTS = {
+    'PriceFrame': '.price_frame',
+    'BalanceFrame': '.balance_frame',
+    'MetricsFrame': '.metrics_frame',
+    'CryptoTable': '.crypto_table'
+}
 
 __all__ = [
     'PriceFrame',
     'BalanceFrame',
     'MetricsFrame',
     'CryptoTable'
-]
\ No newline at end of file
+]
+
+# Submodules are imported on first access so importing the package stays cheap
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, __all__)
@@ -1,5 +1,7 @@
 # src/interface/components/metrics_frame.py
 import customtkinter as ctk
+from typing import Dict, Optional
+from ...utils.latency import LatencyRecorder
 
 class MetricsFrame(ctk.CTkFrame):
     """Frame component for trading metrics display"""
@@ -28,8 +30,37 @@ class MetricsFrame(ctk.CTkFrame):
         )
         self.media_lenta_label.pack(pady=2, anchor="w")
         
+        self.latency_metrics = ctk.CTkFrame(self)
+        self.latency_metrics.pack(pady=5, padx=20, anchor="w")
+        self.latency_labels: Dict[str, ctk.CTkLabel] = {}
+        self.latency_recorder: Optional[LatencyRecorder] = None
+        
     def update_metrics(self, media_rapida: float, media_lenta: float):
         """Update the moving averages display"""
         self.media_rapida_label.configure(text=f"Média Rápida: {media_rapida:.8f}")
         self.media_lenta_label.configure(text=f"Média Lenta: {media_lenta:.8f}")
-
+        
+    def update_latency(self, snapshot: Dict[str, Dict[str, float]]):
+        """Update the latency percentiles display (values in seconds)"""
+        for name, summary in snapshot.items():
+            label = self.latency_labels.get(name)
+            if label is None:
+                label = ctk.CTkLabel(self.latency_metrics, font=(self.font_style, self.font_size))
+                label.pack(pady=2, anchor="w")
+                self.latency_labels[name] = label
+            label.configure(
+                text=f"{name}: p50 {summary['p50'] * 1000:.1f} ms | "
+                     f"p95 {summary['p95'] * 1000:.1f} ms | "
+                     f"p99 {summary['p99'] * 1000:.1f} ms ({summary['count']})"
+            )
+            
+    def watch_latency(self, recorder: LatencyRecorder, interval_ms: int = 5000):
+        """Refresh the latency display from a recorder periodically"""
+        self.latency_recorder = recorder
+        
+        def refresh():
+            if self.latency_recorder is recorder:
+                self.update_latency(recorder.snapshot())
+                self.after(interval_ms, refresh)
+                
+        refresh()
@@ -10,15 +10,20 @@ from ..trading.trading_engine import TradingEngine
 from tkinter import ttk
 from .crypto_manager import CryptoManagerWindow
 from ..utils.config import Config
+from ..utils.exchange_rules import adjust_quantity
 from ..utils.binance_client import BinanceClient
 
 class MainWindow(BaseWindow):
     """Main application window"""
-    def __init__(self):
+    def __init__(self, db: Optional[CryptoDatabase] = None, client: Optional[BinanceClient] = None,
+                 engine: Optional[TradingEngine] = None):
         super().__init__()
-        self.db = CryptoDatabase(db_name="crypto.db")  # Adicionando o nome do banco de dados
         self.config = Config()  # Carrega configurações
-        self.client = BinanceClient(self.config.api_key, self.config.api_secret)
+        # The application passes its instrumented database and client, so /metrics sees the GUI activity
+        self.db = db if db is not None else CryptoDatabase(db_name=self.config.database.db_name)
+        self.client = client if client is not None else BinanceClient(self.config.api_key, self.config.api_secret)
+        # Engine built by the application; its latency histograms feed the metrics frame
+        self.engine = engine
         self.setup_window()
         self.setup_components()
         
@@ -53,6 +58,8 @@ class MainWindow(BaseWindow):
             font_size=self.font_size
         )
         self.metrics_frame.pack(pady=10, padx=20, fill="x")
+        if self.engine is not None:
+            self.metrics_frame.watch_latency(self.engine.latency)
         
         # Status and logs frame
         self.create_status_frame()
@@ -178,8 +185,7 @@ class MainWindow(BaseWindow):
 
     def adjust_quantity(self, quantity, step_size):
         """Adjust quantity to match symbol's step size"""
-        step_size_decimals = len(str(step_size).split('.')[-1])
-        return float(("{:." + str(step_size_decimals) + "f}").format(quantity - (quantity % step_size)))
+        return adjust_quantity(quantity, step_size)
 
     def atualizar_preco(self):
         """Update current price display"""
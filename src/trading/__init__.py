@@ -4,19 +4,69 @@ Trading module containing trading logic, strategy implementations,
 and position management.
 """
 
-from .trading_engine import TradingEngine
-from .strategy import (
-    TradingStrategy,
-    MovingAverageStrategy
-)
-from .data_fetcher import DataFetcher
-from .position_manager import PositionManager
+from .._lazy import lazy_exports
+
+_EXPORTS = {
+    'TradingEngine': '.trading_engine',
+    'TradingStrategy': '.strategy',
+    'MovingAverageStrategy': '.strategy',
+    'RSIStrategy': '.strategy',
+    'MACDStrategy': '.strategy',
+    'BollingerStrategy': '.strategy',
+    'register_strategy': '.strategy',
+    'get_strategy': '.strategy',
+    'create_strategy': '.strategy',
+    'available_strategies': '.strategy',
+    'DataFetcher': '.data_fetcher',
+    'CandleBuffer': '.candle_buffer',
+    'PositionManager': '.position_manager',
+    'OrderExecutor': '.order_executor',
+    'OrderResult': '.order_executor',
+    'RiskManager': '.risk_manager',
+    'PositionSizer': '.position_sizing',
+    'FixedFractionSizer': '.position_sizing',
+    'VolatilitySizer': '.position_sizing',
+    'KellySizer': '.position_sizing',
+    'RiskLimits': '.risk_manager',
+    'CandleScheduler': '.scheduler',
+    'ScheduledJob': '.scheduler',
+    'CandleResampler': '.resampler',
+    'ResamplingFetcher': '.resampler',
+    'PaperExchange': '.paper_exchange',
+    'PaperExchangeError': '.paper_exchange',
+    'run_paper_trading': '.paper_exchange'
+}
 
 __all__ = [
     'TradingEngine',
     'TradingStrategy',
     'MovingAverageStrategy',
+    'RSIStrategy',
+    'MACDStrategy',
+    'BollingerStrategy',
+    'register_strategy',
+    'get_strategy',
+    'create_strategy',
+    'available_strategies',
     'DataFetcher',
-    'PositionManager'
+    'CandleBuffer',
+    'PositionManager',
+    'OrderExecutor',
+    'OrderResult',
+    'RiskManager',
+    'PositionSizer',
+    'FixedFractionSizer',
+    'VolatilitySizer',
+    'KellySizer',
+    'RiskLimits',
+    'CandleScheduler',
+    'ScheduledJob',
+    'CandleResampler',
+    'ResamplingFetcher',
+    'PaperExchange',
+    'PaperExchangeError',
+    'run_paper_trading'
 ]
 
+# Submodules are imported on first access so importing the package stays cheap
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, __all__)
@@ -0,0 +1,112 @@
+# src/trading/candle_buffer.py
+"""
+Fixed-capacity ring buffer of candles for the live loop.
+
+CandleBuffer preallocates its arrays once and appends new candles in
+place. Every row is written twice, at ``i`` and ``i + capacity``, so the
+newest ``capacity`` rows are always one contiguous slice: ``view`` and
+``frame`` hand strategies read-only views of that slice without copying
+the window on each tick.
+
+Views and frames are only valid until the next append, which overwrites
+the oldest rows they show. Consumers read them right away and keep the
+values they need, not the frame; ``frame(copy=True)`` gives a frame that
+later appends leave intact.
+"""
+import numpy as np
+import pandas as pd
+from typing import Any, Iterable, Optional, Sequence
+
+COLUMNS = ('abertura', 'maxima', 'minima', 'fechamento', 'volume')
+_CLOSE_TIME_DTYPE = pd.DatetimeTZDtype('ms', 'America/Sao_Paulo')
+
+class CandleBuffer:
+    """Newest ``capacity`` candles of one symbol/interval in preallocated arrays"""
+    def __init__(self, capacity: int = 1000):
+        if capacity < 1:
+            raise ValueError("Capacity must be positive")
+        self.capacity = capacity
+        self.size = 0
+        self._next = 0  # slot of the next write, in [0, capacity)
+        self._open_time = np.zeros(2 * capacity, dtype=np.int64)
+        self._close_time = np.zeros(2 * capacity, dtype=np.int64)
+        self._values = np.zeros((len(COLUMNS), 2 * capacity))
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def last_open_time(self) -> Optional[int]:
+        return int(self._open_time[self._next + self.capacity - 1]) if self.size else None
+
+    @property
+    def last_close_time(self) -> Optional[int]:
+        return int(self._close_time[self._next + self.capacity - 1]) if self.size else None
+
+    def append(self, open_time: int, open_: float, high: float, low: float, close: float,
+               volume: float, close_time: int) -> None:
+        """Add one candle after the newest one"""
+        slot = self._next
+        for position in (slot, slot + self.capacity):
+            self._open_time[position] = open_time
+            self._close_time[position] = close_time
+            self._values[:, position] = (open_, high, low, close, volume)
+        self._next = (slot + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def extend_klines(self, klines: Iterable[Sequence[Any]]) -> int:
+        """Add Client.get_klines rows newer than the last candle; returns how many were added"""
+        last = self.last_open_time
+        rows = [k for k in klines if last is None or int(k[0]) > last]
+        if not rows:
+            return 0
+        added = len(rows)
+        rows = rows[-self.capacity:]
+        n = len(rows)
+        slots = (self._next + np.arange(n)) % self.capacity
+        open_time = np.fromiter((int(k[0]) for k in rows), dtype=np.int64, count=n)
+        close_time = np.fromiter((int(k[6]) for k in rows), dtype=np.int64, count=n)
+        values = np.array([k[1:6] for k in rows], dtype=np.float64).T
+        for positions in (slots, slots + self.capacity):
+            self._open_time[positions] = open_time
+            self._close_time[positions] = close_time
+            self._values[:, positions] = values
+        self._next = (self._next + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+        return added
+
+    def _window(self) -> slice:
+        end = self._next + self.capacity
+        return slice(end - self.size, end)
+
+    def view(self, column: str) -> np.ndarray:
+        """Read-only view of one column (a name of COLUMNS, open_time or close_time), oldest first
+
+        The view is invalid after the next append.
+        """
+        if column == 'open_time':
+            array = self._open_time[self._window()]
+        elif column == 'close_time':
+            array = self._close_time[self._window()]
+        elif column in COLUMNS:
+            array = self._values[COLUMNS.index(column), self._window()]
+        else:
+            raise ValueError(f"Unknown candle column: {column}")
+        array.flags.writeable = False
+        return array
+
+    def frame(self, copy: bool = False) -> pd.DataFrame:
+        """OHLCV and tempo_fechamento columns over views of the buffer
+
+        Building the frame does not copy the candles; writing into its
+        values raises, while adding columns to it is safe. The frame is
+        invalid after the next append unless ``copy`` is set.
+        """
+        columns = {name: self.view(name) for name in COLUMNS}
+        if copy:
+            columns = {name: values.copy() for name, values in columns.items()}
+        # Same close time column as DataFetcher.parse_klines
+        columns['tempo_fechamento'] = pd.arrays.DatetimeArray(
+            self.view('close_time').view('M8[ms]'), dtype=_CLOSE_TIME_DTYPE, copy=copy
+        )
+        return pd.DataFrame(columns, copy=False)
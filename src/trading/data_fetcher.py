@@ -3,20 +3,26 @@
 import pandas as pd
 from binance.client import Client
 from typing import Dict, Any
+from ..utils.profiling import profiler
 
 class DataFetcher:
     """Handle all market data fetching operations"""
     def __init__(self, client: Client):
         self.client = client
         
-    def get_market_data(self, symbol: str, interval: str) -> pd.DataFrame:
+    @profiler.profiled("data.fetch")
+    def get_market_data(self, symbol: str, interval: str, limit: int = 1000) -> pd.DataFrame:
         """Fetch and process market data"""
         candles = self.client.get_klines(
             symbol=symbol,
             interval=interval,
-            limit=1000
+            limit=limit
         )
+        return self.parse_klines(candles)
         
+    @staticmethod
+    def parse_klines(candles: list) -> pd.DataFrame:
+        """Convert raw klines into the close price frame used by the strategies"""
         df = pd.DataFrame(candles)
         df.columns = [
             "tempo_abertura", "abertura", "maxima", "minima",
@@ -31,4 +37,4 @@ class DataFetcher:
         df["tempo_fechamento"] = df["tempo_fechamento"].dt.tz_localize("UTC").dt.tz_convert("America/Sao_Paulo")
         df["fechamento"] = df["fechamento"].astype(float)
         
-        return df
\ No newline at end of file
+        return df
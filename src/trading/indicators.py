@@ -0,0 +1,258 @@
+# src/trading/indicators.py
+"""
+Technical indicators over NumPy arrays.
+
+Every indicator comes in two forms that produce the same numbers:
+
+- a batch function (``ema``, ``rsi``, ``macd``, ``bollinger_bands``, ``atr``,
+  ``vwap``) computing the whole series at once, for backtests and signal
+  generation;
+- a streaming class (``EMA``, ``RSI``, ``MACD``, ``BollingerBands``, ``ATR``,
+  ``VWAP``) updated with one bar at a time in O(1), for live loops that
+  receive candles as they close.
+
+Exponential averages follow pandas ``ewm(adjust=False)``: they are seeded
+with the first value, and Wilder's smoothing (RSI, ATR) uses
+``alpha = 1 / period``.
+"""
+import math
+from collections import deque
+from typing import Deque, Optional, Tuple
+import numpy as np
+
+def _as_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+def _exponential_smoothing(values: np.ndarray, alpha: float) -> np.ndarray:
+    """y[0] = x[0], y[t] = alpha * x[t] + (1 - alpha) * y[t-1]
+
+    The recurrence is solved in closed form over blocks short enough for the
+    decay powers to stay within float range, so the work is vectorized
+    except for one step per block.
+    """
+    n = len(values)
+    result = np.empty(n)
+    if n == 0:
+        return result
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        result[:] = values
+        return result
+
+    # Keep decay ** -block well below the float maximum (1e308)
+    block = max(1, min(n, int(280 / -math.log10(decay)) if decay < 1.0 else n))
+    powers = decay ** np.arange(1, block + 1)
+    # y[-1] = x[0] makes the first output equal to the first input
+    previous = values[0]
+    start = 0
+    while start < n:
+        chunk = values[start:start + block]
+        m = len(chunk)
+        # y[start+k] = decay^(k+1) * previous + alpha * sum_j decay^(k-j) * x[start+j]
+        weighted = np.cumsum(chunk / powers[:m]) * powers[:m]
+        result[start:start + m] = powers[:m] * previous + alpha * weighted
+        previous = result[start + m - 1]
+        start += m
+    return result
+
+def ema(values, period: int) -> np.ndarray:
+    """Exponential moving average with ``alpha = 2 / (period + 1)``"""
+    return _exponential_smoothing(_as_array(values), 2.0 / (period + 1))
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """Relative Strength Index (Wilder); the first value is NaN"""
+    close = _as_array(close)
+    result = np.full(len(close), np.nan)
+    if len(close) < 2:
+        return result
+    delta = np.diff(close)
+    average_gain = _exponential_smoothing(np.clip(delta, 0.0, None), 1.0 / period)
+    average_loss = _exponential_smoothing(np.clip(-delta, 0.0, None), 1.0 / period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result[1:] = 100.0 - 100.0 / (1.0 + average_gain / average_loss)
+    return result
+
+def macd(close, fast_period: int = 12, slow_period: int = 26,
+         signal_period: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD line, signal line and histogram"""
+    close = _as_array(close)
+    line = ema(close, fast_period) - ema(close, slow_period)
+    signal = ema(line, signal_period)
+    return line, signal, line - signal
+
+def bollinger_bands(close, period: int = 20,
+                    num_std: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Middle (SMA), upper and lower bands using the population standard deviation
+
+    The first ``period - 1`` values are NaN.
+    """
+    close = _as_array(close)
+    middle = np.full(len(close), np.nan)
+    deviation = np.full(len(close), np.nan)
+    if len(close) >= period:
+        windows = np.lib.stride_tricks.sliding_window_view(close, period)
+        middle[period - 1:] = windows.mean(axis=1)
+        deviation[period - 1:] = windows.std(axis=1)
+    return middle, middle + num_std * deviation, middle - num_std * deviation
+
+def true_range(high, low, close) -> np.ndarray:
+    """Bar range extended to the previous close"""
+    high, low, close = _as_array(high), _as_array(low), _as_array(close)
+    result = high - low
+    if len(close) > 1:
+        previous = close[:-1]
+        result[1:] = np.maximum.reduce([result[1:], np.abs(high[1:] - previous), np.abs(low[1:] - previous)])
+    return result
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """Average True Range with Wilder's smoothing"""
+    return _exponential_smoothing(true_range(high, low, close), 1.0 / period)
+
+def vwap(high, low, close, volume, window: Optional[int] = None) -> np.ndarray:
+    """Volume weighted average of the typical price, cumulative or over ``window`` bars"""
+    typical = (_as_array(high) + _as_array(low) + _as_array(close)) / 3.0
+    volume = _as_array(volume)
+    traded = np.cumsum(typical * volume)
+    total = np.cumsum(volume)
+    if window is not None and window < len(total):
+        traded[window:] = traded[window:] - traded[:-window]
+        total[window:] = total[window:] - total[:-window]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return traded / total
+
+class EMA:
+    """Streaming exponential moving average"""
+    def __init__(self, period: int, alpha: Optional[float] = None):
+        self.period = period
+        self.alpha = alpha if alpha is not None else 2.0 / (period + 1)
+        self.value = math.nan
+        self.count = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.period
+
+    def update(self, value: float) -> float:
+        self.count += 1
+        if self.count == 1:
+            self.value = float(value)
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+class RSI:
+    """Streaming Relative Strength Index"""
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._gain = EMA(period, alpha=1.0 / period)
+        self._loss = EMA(period, alpha=1.0 / period)
+        self._previous: Optional[float] = None
+        self.value = math.nan
+
+    @property
+    def ready(self) -> bool:
+        return self._gain.count >= self.period
+
+    def update(self, close: float) -> float:
+        if self._previous is not None:
+            delta = close - self._previous
+            gain = self._gain.update(max(delta, 0.0))
+            loss = self._loss.update(max(-delta, 0.0))
+            if loss > 0:
+                self.value = 100.0 - 100.0 / (1.0 + gain / loss)
+            else:
+                self.value = 100.0 if gain > 0 else math.nan
+        self._previous = close
+        return self.value
+
+class MACD:
+    """Streaming MACD; ``update`` returns (line, signal, histogram)"""
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        self._fast = EMA(fast_period)
+        self._slow = EMA(slow_period)
+        self._signal = EMA(signal_period)
+        self.value = (math.nan, math.nan, math.nan)
+
+    @property
+    def ready(self) -> bool:
+        return self._slow.ready and self._signal.ready
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        line = self._fast.update(close) - self._slow.update(close)
+        signal = self._signal.update(line)
+        self.value = (line, signal, line - signal)
+        return self.value
+
+class BollingerBands:
+    """Streaming Bollinger bands; ``update`` returns (middle, upper, lower)"""
+    def __init__(self, period: int = 20, num_std: float = 2.0):
+        self.period = period
+        self.num_std = num_std
+        self._window: Deque[float] = deque(maxlen=period)
+        self._sum = 0.0
+        self._sum_squares = 0.0
+        self.value = (math.nan, math.nan, math.nan)
+
+    @property
+    def ready(self) -> bool:
+        return len(self._window) == self.period
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        if len(self._window) == self.period:
+            oldest = self._window[0]
+            self._sum -= oldest
+            self._sum_squares -= oldest * oldest
+        self._window.append(close)
+        self._sum += close
+        self._sum_squares += close * close
+        if self.ready:
+            mean = self._sum / self.period
+            deviation = math.sqrt(max(self._sum_squares / self.period - mean * mean, 0.0))
+            self.value = (mean, mean + self.num_std * deviation, mean - self.num_std * deviation)
+        return self.value
+
+class ATR:
+    """Streaming Average True Range"""
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._average = EMA(period, alpha=1.0 / period)
+        self._previous_close: Optional[float] = None
+        self.value = math.nan
+
+    @property
+    def ready(self) -> bool:
+        return self._average.ready
+
+    def update(self, high: float, low: float, close: float) -> float:
+        bar_range = high - low
+        if self._previous_close is not None:
+            bar_range = max(bar_range, abs(high - self._previous_close), abs(low - self._previous_close))
+        self._previous_close = close
+        self.value = self._average.update(bar_range)
+        return self.value
+
+class VWAP:
+    """Streaming VWAP, cumulative or over the last ``window`` bars"""
+    def __init__(self, window: Optional[int] = None):
+        self.window = window
+        self._bars: Deque[Tuple[float, float]] = deque()
+        self._traded = 0.0
+        self._volume = 0.0
+        self.value = math.nan
+
+    @property
+    def ready(self) -> bool:
+        return self._volume > 0
+
+    def update(self, high: float, low: float, close: float, volume: float) -> float:
+        traded = (high + low + close) / 3.0 * volume
+        self._traded += traded
+        self._volume += volume
+        if self.window is not None:
+            self._bars.append((traded, volume))
+            if len(self._bars) > self.window:
+                old_traded, old_volume = self._bars.popleft()
+                self._traded -= old_traded
+                self._volume -= old_volume
+        self.value = self._traded / self._volume if self._volume > 0 else math.nan
+        return self.value
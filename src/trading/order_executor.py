@@ -0,0 +1,196 @@
+# src/trading/order_executor.py
+"""
+Order submission with idempotent retries and fill confirmation.
+
+Every order gets a client order ID (``newClientOrderId``) before its first
+attempt and keeps it across retries. Transient failures (network errors,
+timeouts, rate limits, 5xx responses) are retried with exponential
+backoff; before each retry the order is looked up by that ID, so a request
+that reached the exchange but whose response was lost is picked up instead
+of being sent twice. The response is parsed into an OrderResult carrying
+the executed quantity and average price, so callers act on what was
+filled rather than on what was asked.
+
+``submit_async`` and ``submit_many`` run submissions on a thread pool, so
+orders for several symbols go out concurrently instead of one after the
+other.
+"""
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import requests
+from binance.client import Client
+from binance.exceptions import BinanceAPIException, BinanceRequestException
+from ..utils.latency import LatencyRecorder
+from ..utils.logger import Logger
+
+# Binance error codes meaning "try again": unknown/disconnected, rate limits,
+# execution status unknown, server busy and timestamp outside recvWindow
+TRANSIENT_ERROR_CODES = {-1000, -1001, -1003, -1006, -1007, -1008, -1015, -1021}
+
+def is_transient(error: Exception) -> bool:
+    """Whether an order may succeed if sent again"""
+    if isinstance(error, BinanceAPIException):
+        # 418 is an IP ban: retrying only extends it
+        return error.code in TRANSIENT_ERROR_CODES or error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, (BinanceRequestException, requests.exceptions.ConnectionError,
+                              requests.exceptions.Timeout, ConnectionError, TimeoutError))
+
+def parse_fill(order: Dict[str, Any], requested_quantity: float = 0.0) -> Tuple[float, Optional[float], float]:
+    """Executed quantity, average price and quote quantity of an order response
+
+    Uses the ``fills`` of FULL responses, then executedQty and
+    cummulativeQuoteQty; a FILLED response without quantities counts as
+    ``requested_quantity`` at an unknown price.
+    """
+    fills = order.get('fills') or []
+    executed = sum(float(fill['qty']) for fill in fills)
+    if executed > 0:
+        quote = sum(float(fill['price']) * float(fill['qty']) for fill in fills)
+        return executed, quote / executed, quote
+
+    executed = float(order.get('executedQty') or 0.0)
+    quote = float(order.get('cummulativeQuoteQty') or 0.0)
+    if executed <= 0 and order.get('status') == 'FILLED':
+        executed = requested_quantity
+    price = quote / executed if executed > 0 and quote > 0 else None
+    return executed, price, quote
+
+@dataclass
+class OrderResult:
+    """Outcome of one order submission
+
+    ``status`` is the exchange status (FILLED, PARTIALLY_FILLED, NEW, ...),
+    REJECTED when the exchange refused the order and UNKNOWN when every
+    attempt failed without confirmation.
+    """
+    symbol: str
+    side: str
+    client_order_id: str
+    requested_quantity: float
+    status: str
+    executed_quantity: float = 0.0
+    average_price: Optional[float] = None
+    quote_quantity: float = 0.0
+    order_id: Optional[int] = None
+    attempts: int = 0
+    error: Optional[str] = None
+    response: Optional[Dict[str, Any]] = None
+
+    @property
+    def filled(self) -> bool:
+        return self.executed_quantity > 0
+
+class OrderExecutor:
+    """Send orders through a Binance-compatible client with retries and fill parsing"""
+    def __init__(self, client: Client, logger: Optional[Logger] = None,
+                 latency: Optional[LatencyRecorder] = None, max_retries: int = 3,
+                 backoff: float = 0.5, max_backoff: float = 8.0, jitter: float = 0.1,
+                 max_workers: int = 4, id_prefix: str = "cb",
+                 sleep: Callable[[float], None] = time.sleep):
+        self.client = client
+        self.logger = logger
+        self.latency = latency or LatencyRecorder()
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.max_workers = max_workers
+        self.id_prefix = id_prefix
+        self.sleep = sleep
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def new_client_order_id(self) -> str:
+        """Unique ID within Binance's 36 character limit"""
+        return f"{self.id_prefix}-{uuid.uuid4().hex}"[:36]
+
+    def backoff_delay(self, retry: int) -> float:
+        """Seconds to wait before retry number ``retry`` (1-based)"""
+        delay = min(self.max_backoff, self.backoff * 2 ** (retry - 1))
+        return delay * (1 + random.uniform(0, self.jitter)) if self.jitter > 0 else delay
+
+    def submit(self, symbol: str, side: str, quantity: float, order_type: str = Client.ORDER_TYPE_MARKET,
+               price: Optional[float] = None, client_order_id: Optional[str] = None) -> OrderResult:
+        """Send an order and wait for its confirmation"""
+        client_order_id = client_order_id or self.new_client_order_id()
+        params: Dict[str, Any] = {'symbol': symbol, 'side': side, 'type': order_type, 'quantity': quantity}
+        if order_type == Client.ORDER_TYPE_LIMIT:
+            params.update(timeInForce=Client.TIME_IN_FORCE_GTC, price=price)
+        params['newClientOrderId'] = client_order_id
+        result = OrderResult(symbol, side, client_order_id, quantity, 'UNKNOWN')
+
+        for attempt in range(self.max_retries + 1):
+            result.attempts = attempt + 1
+            if attempt:
+                self.sleep(self.backoff_delay(attempt))
+                # The previous attempt may have reached the exchange before failing
+                try:
+                    existing = self.client.get_order(symbol=symbol, origClientOrderId=client_order_id)
+                except Exception as e:
+                    if is_transient(e):
+                        result.error = str(e)
+                        continue
+                    existing = None
+                if existing:
+                    return self._confirm(result, existing)
+
+            try:
+                with self.latency.time('order'):
+                    order = self.client.create_order(**params)
+            except Exception as e:
+                result.error = str(e)
+                if not is_transient(e):
+                    result.status = 'REJECTED'
+                    self._log(f"Ordem {client_order_id} rejeitada: {e}")
+                    return result
+                self._log(f"Falha transitória na ordem {client_order_id} (tentativa {attempt + 1}): {e}")
+                continue
+
+            if 'status' not in order:
+                # ACK responses carry no execution details
+                try:
+                    order = self.client.get_order(symbol=symbol, origClientOrderId=client_order_id)
+                except Exception as e:
+                    self._log(f"Erro ao consultar ordem {client_order_id}: {e}")
+            return self._confirm(result, order)
+
+        self._log(f"Ordem {client_order_id} sem confirmação após {result.attempts} tentativas")
+        return result
+
+    def submit_async(self, symbol: str, side: str, quantity: float, **kwargs: Any) -> 'Future[OrderResult]':
+        """Submit on the executor's thread pool and return a future"""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="orders")
+            pool = self._pool
+        return pool.submit(self.submit, symbol, side, quantity, **kwargs)
+
+    def submit_many(self, orders: Iterable[Dict[str, Any]]) -> List[OrderResult]:
+        """Submit several orders (``submit`` keyword arguments) concurrently; results keep their order"""
+        futures = [self.submit_async(**order) for order in orders]
+        return [future.result() for future in futures]
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+    def _confirm(self, result: OrderResult, order: Dict[str, Any]) -> OrderResult:
+        result.response = order
+        result.status = order.get('status', 'UNKNOWN')
+        result.order_id = order.get('orderId')
+        result.executed_quantity, result.average_price, result.quote_quantity = parse_fill(
+            order, result.requested_quantity
+        )
+        result.error = None
+        return result
+
+    def _log(self, message: str) -> None:
+        if self.logger:
+            self.logger.log(message)
@@ -0,0 +1,370 @@
+# src/trading/paper_exchange.py
+"""
+Local simulated exchange for paper trading.
+
+PaperExchange implements the part of binance.client.Client used by the
+trading code (klines, ticker, symbol info, account, orders) on top of a
+candle DataFrame per symbol. A cursor marks the last closed candle: klines
+and prices only show candles up to it, market orders fill at its close and
+resting limit orders are matched against the following candles when the
+cursor advances. Costs come from the same FillModel used by the backtesters.
+"""
+import itertools
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+from binance.client import Client
+from ..backtesting.fill_model import FillModel
+from ..utils.logger import Logger
+
+class PaperExchangeError(Exception):
+    """Order rejected by the paper exchange"""
+    pass
+
+class PaperExchange:
+    """Simulated Binance exchange replaying historical candles
+
+    ``candles`` maps each symbol to a DataFrame with the backtest columns
+    (abertura, maxima, minima, fechamento, volume) on a datetime index; all
+    symbols must share the same index. Commissions are charged in the quote
+    asset. Constants such as SIDE_BUY are taken from binance.client.Client.
+    """
+    def __init__(self, candles: Dict[str, pd.DataFrame], balances: Optional[Dict[str, float]] = None,
+                 quote_asset: str = "BRL", fill_model: Optional[FillModel] = None,
+                 start: int = 0, min_notional: float = 10.0):
+        if not candles:
+            raise ValueError("Paper exchange needs candles for at least one symbol")
+        self.quote_asset = quote_asset
+        self.fill_model = fill_model or FillModel()
+        self.min_notional = min_notional
+        self.balances: Dict[str, float] = {quote_asset: 10000.0} if balances is None else dict(balances)
+        self.cursor = start
+        self.orders: Dict[int, Dict[str, Any]] = {}
+        self.fills: List[Dict[str, Any]] = []
+        self._order_ids = itertools.count(1)
+
+        self._symbols: Dict[str, Dict[str, Any]] = {}
+        lengths = set()
+        for symbol, frame in candles.items():
+            if not symbol.endswith(quote_asset):
+                raise ValueError(f"Symbol {symbol} is not quoted in {quote_asset}")
+            self._symbols[symbol] = self._prepare(frame)
+            self.balances.setdefault(symbol[:-len(quote_asset)], 0.0)
+            lengths.add(len(frame))
+        if len(lengths) != 1:
+            raise ValueError("All symbols must have the same number of candles")
+        self.length = lengths.pop()
+
+    @staticmethod
+    def _prepare(frame: pd.DataFrame) -> Dict[str, Any]:
+        """Price arrays and pre-formatted klines of one symbol"""
+        index = pd.DatetimeIndex(frame.index)
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        open_time = index.asi8 // 1_000_000
+        step = int(np.median(np.diff(open_time))) if len(open_time) > 1 else 60_000
+        columns = {name: frame[name].to_numpy(dtype=np.float64)
+                   for name in ('abertura', 'maxima', 'minima', 'fechamento')}
+        volume = frame['volume'].to_numpy(dtype=np.float64) if 'volume' in frame else np.zeros(len(frame))
+
+        # Formatted once so every get_klines call is a list slice
+        klines = [
+            [int(t), f"{o:.8f}", f"{h:.8f}", f"{l:.8f}", f"{c:.8f}", f"{v:.8f}",
+             int(t) + step - 1, f"{v * c:.8f}", 0, "0", "0", "0"]
+            for t, o, h, l, c, v in zip(open_time, columns['abertura'], columns['maxima'],
+                                        columns['minima'], columns['fechamento'], volume)
+        ]
+        return {'index': frame.index, 'klines': klines, 'open_time': open_time,
+                'close_time': open_time + step - 1, **columns}
+
+    def __getattr__(self, name: str) -> Any:
+        if name.isupper():
+            return getattr(Client, name)
+        raise AttributeError(name)
+
+    # Replay control
+
+    @property
+    def done(self) -> bool:
+        """True when the cursor is on the last candle"""
+        return self.cursor >= self.length - 1
+
+    @property
+    def current_time(self) -> pd.Timestamp:
+        """Timestamp of the candle under the cursor"""
+        first = next(iter(self._symbols.values()))
+        return first['index'][self.cursor]
+
+    def advance(self) -> bool:
+        """Move to the next candle and match resting orders against it"""
+        if self.done:
+            return False
+        self.cursor += 1
+        for order in list(self.orders.values()):
+            if order['status'] == 'NEW':
+                try:
+                    self._match_limit(order)
+                except PaperExchangeError:
+                    # Orders are validated when placed; a failed match must not stop the replay
+                    order['status'] = 'EXPIRED'
+        return True
+
+    def advance_to(self, timestamp: float) -> bool:
+        """Advance to the last candle closed at epoch time ``timestamp`` (seconds)"""
+        close_time = next(iter(self._symbols.values()))['close_time']
+        moved = False
+        while not self.done and close_time[self.cursor + 1] <= timestamp * 1000:
+            self.advance()
+            moved = True
+        return moved
+
+    def _check_symbol(self, symbol: str) -> Dict[str, Any]:
+        if symbol not in self._symbols:
+            raise PaperExchangeError(f"Invalid symbol: {symbol}")
+        return self._symbols[symbol]
+
+    def price(self, symbol: str) -> float:
+        """Close of the candle under the cursor"""
+        return float(self._check_symbol(symbol)['fechamento'][self.cursor])
+
+    def equity(self) -> float:
+        """Quote balance plus every base balance valued at the current price"""
+        total = self.balances.get(self.quote_asset, 0.0)
+        for symbol in self._symbols:
+            total += self.balances.get(symbol[:-len(self.quote_asset)], 0.0) * self.price(symbol)
+        return total
+
+    # Market data
+
+    def get_klines(self, symbol: str, interval: str = Client.KLINE_INTERVAL_1HOUR,
+                   limit: int = 500, **kwargs) -> List[list]:
+        """Last ``limit`` closed candles up to the cursor"""
+        klines = self._check_symbol(symbol)['klines']
+        end = self.cursor + 1
+        return klines[max(0, end - limit):end]
+
+    def get_historical_klines(self, symbol: str, interval: str, start_str: Any = None,
+                              end_str: Any = None, limit: int = 1000, **kwargs) -> List[list]:
+        """Closed candles opened between ``start_str`` and ``end_str`` (epoch ms); the last ``limit`` without them"""
+        if start_str is None and end_str is None:
+            return self.get_klines(symbol, interval, limit)
+        data = self._check_symbol(symbol)
+        open_time = data['open_time']
+        first = np.searchsorted(open_time, int(start_str)) if start_str is not None else 0
+        last = np.searchsorted(open_time, int(end_str), side='right') if end_str is not None else len(open_time)
+        return data['klines'][first:min(last, self.cursor + 1)]
+
+    def get_symbol_ticker(self, symbol: str, **kwargs) -> Dict[str, str]:
+        return {'symbol': symbol, 'price': f"{self.price(symbol):.8f}"}
+
+    def get_symbol_info(self, symbol: str) -> Dict[str, Any]:
+        self._check_symbol(symbol)
+        step_size = self.fill_model.step_size or 0.00000001
+        return {
+            'symbol': symbol,
+            'status': 'TRADING',
+            'baseAsset': symbol[:-len(self.quote_asset)],
+            'quoteAsset': self.quote_asset,
+            'filters': [
+                {'filterType': 'LOT_SIZE', 'minQty': f"{self.fill_model.min_qty:.8f}",
+                 'maxQty': "9000000.00000000", 'stepSize': f"{step_size:.8f}"},
+                {'filterType': 'MIN_NOTIONAL', 'minNotional': f"{self.min_notional:.8f}"}
+            ]
+        }
+
+    # Account
+
+    def get_account(self, **kwargs) -> Dict[str, Any]:
+        locked = self._locked()
+        return {
+            'canTrade': True,
+            'balances': [
+                {'asset': asset, 'free': f"{total - locked.get(asset, 0.0):.8f}",
+                 'locked': f"{locked.get(asset, 0.0):.8f}"}
+                for asset, total in self.balances.items()
+            ]
+        }
+
+    def get_asset_balance(self, asset: str, **kwargs) -> Dict[str, str]:
+        locked = self._locked().get(asset, 0.0)
+        return {'asset': asset, 'free': f"{self.balances.get(asset, 0.0) - locked:.8f}",
+                'locked': f"{locked:.8f}"}
+
+    def _available(self, asset: str, order: Optional[Dict[str, Any]] = None) -> float:
+        """Balance not reserved by resting limit orders other than ``order``"""
+        available = self.balances.get(asset, 0.0) - self._locked().get(asset, 0.0)
+        if order is not None and order.get('status') == 'NEW' and '_reserved' in order:
+            reserved_asset, amount = order['_reserved']
+            if reserved_asset == asset:
+                available += amount
+        return available
+
+    def _locked(self) -> Dict[str, float]:
+        """Balances reserved by resting limit orders"""
+        locked: Dict[str, float] = {}
+        for order in self.orders.values():
+            if order['status'] == 'NEW':
+                asset, amount = order['_reserved']
+                locked[asset] = locked.get(asset, 0.0) + amount
+        return locked
+
+    # Orders
+
+    def create_order(self, symbol: str, side: str, type: str, quantity: float,
+                     price: Optional[float] = None, newClientOrderId: Optional[str] = None,
+                     **kwargs) -> Dict[str, Any]:
+        """Place a MARKET order (filled now) or a LIMIT order (matched on later candles)"""
+        self._check_symbol(symbol)
+        if side not in (Client.SIDE_BUY, Client.SIDE_SELL):
+            raise PaperExchangeError(f"Invalid side: {side}")
+        quantity = self.fill_model.round_quantity(float(quantity))
+        if quantity <= 0:
+            raise PaperExchangeError("Invalid quantity")
+        if type == Client.ORDER_TYPE_LIMIT and price is not None:
+            reference = float(price)
+        else:
+            reference = self.fill_model.fill_price(side, self.price(symbol))
+        if quantity * reference < self.min_notional:
+            raise PaperExchangeError("Filter failure: MIN_NOTIONAL")
+
+        order_id = next(self._order_ids)
+        order = {
+            'symbol': symbol,
+            'orderId': order_id,
+            'clientOrderId': newClientOrderId or f"paper-{order_id}",
+            'transactTime': int(self.current_time.value // 1_000_000),
+            'price': "0.00000000",
+            'origQty': f"{quantity:.8f}",
+            'executedQty': "0.00000000",
+            'cummulativeQuoteQty': "0.00000000",
+            'status': 'NEW',
+            'type': type,
+            'side': side,
+            'fills': []
+        }
+
+        if type == Client.ORDER_TYPE_MARKET:
+            fill_price = self.fill_model.fill_price(side, self.price(symbol))
+            self._fill(order, quantity, fill_price, is_maker=False)
+        elif type == Client.ORDER_TYPE_LIMIT:
+            if price is None:
+                raise PaperExchangeError("LIMIT orders need a price")
+            price = float(price)
+            order['price'] = f"{price:.8f}"
+            order['_limit'] = price
+            order['_reserved'] = self._reserve(symbol, side, quantity, price)
+            self.orders[order_id] = order
+        else:
+            raise PaperExchangeError(f"Unsupported order type: {type}")
+
+        return self._public(order)
+
+    def order_market_buy(self, **params) -> Dict[str, Any]:
+        return self.create_order(side=Client.SIDE_BUY, type=Client.ORDER_TYPE_MARKET, **params)
+
+    def order_market_sell(self, **params) -> Dict[str, Any]:
+        return self.create_order(side=Client.SIDE_SELL, type=Client.ORDER_TYPE_MARKET, **params)
+
+    def get_order(self, symbol: str, orderId: Optional[int] = None,
+                  origClientOrderId: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        if orderId is None:
+            orderId = next((order_id for order_id, order in self.orders.items()
+                            if order['clientOrderId'] == origClientOrderId), None)
+        if orderId not in self.orders:
+            raise PaperExchangeError(f"Order does not exist: {orderId or origClientOrderId}")
+        return self._public(self.orders[orderId])
+
+    def get_open_orders(self, symbol: Optional[str] = None, **kwargs) -> List[Dict[str, Any]]:
+        return [self._public(order) for order in self.orders.values()
+                if order['status'] == 'NEW' and symbol in (None, order['symbol'])]
+
+    def cancel_order(self, symbol: str, orderId: int, **kwargs) -> Dict[str, Any]:
+        order = self.orders.get(orderId)
+        if order is None or order['status'] != 'NEW':
+            raise PaperExchangeError(f"Unknown order sent: {orderId}")
+        order['status'] = 'CANCELED'
+        return self._public(order)
+
+    def _reserve(self, symbol: str, side: str, quantity: float, price: float) -> tuple:
+        """Check that the balance covers a resting order and return what it reserves"""
+        base = symbol[:-len(self.quote_asset)]
+        if side == Client.SIDE_BUY:
+            needed = quantity * price + self.fill_model.fee(quantity * price, is_maker=True)
+            asset = self.quote_asset
+        else:
+            needed = quantity
+            asset = base
+        if self._available(asset) < needed - 1e-12:
+            raise PaperExchangeError("Account has insufficient balance for requested action.")
+        return asset, needed
+
+    def _match_limit(self, order: Dict[str, Any]) -> None:
+        """Fill a resting limit order if the cursor candle traded through its price"""
+        prices = self._symbols[order['symbol']]
+        limit = order['_limit']
+        if order['side'] == Client.SIDE_BUY:
+            touched = prices['minima'][self.cursor] <= limit
+        else:
+            touched = prices['maxima'][self.cursor] >= limit
+        if touched:
+            self._fill(order, float(order['origQty']), limit, is_maker=True)
+
+    def _fill(self, order: Dict[str, Any], quantity: float, price: float, is_maker: bool) -> None:
+        """Settle a fill against the balances not reserved by other resting orders"""
+        symbol = order['symbol']
+        base = symbol[:-len(self.quote_asset)]
+        notional = quantity * price
+        if notional < self.min_notional:
+            raise PaperExchangeError("Filter failure: MIN_NOTIONAL")
+        fee = self.fill_model.fee(notional, is_maker)
+
+        if order['side'] == Client.SIDE_BUY:
+            if self._available(self.quote_asset, order) < notional + fee - 1e-12:
+                raise PaperExchangeError("Account has insufficient balance for requested action.")
+            self.balances[self.quote_asset] -= notional + fee
+            self.balances[base] += quantity
+        else:
+            if self._available(base, order) < quantity - 1e-12:
+                raise PaperExchangeError("Account has insufficient balance for requested action.")
+            self.balances[base] -= quantity
+            self.balances[self.quote_asset] += notional - fee
+
+        order.update({
+            'status': 'FILLED',
+            'executedQty': f"{quantity:.8f}",
+            'cummulativeQuoteQty': f"{notional:.8f}",
+            'fills': [{'price': f"{price:.8f}", 'qty': f"{quantity:.8f}",
+                       'commission': f"{fee:.8f}", 'commissionAsset': self.quote_asset}]
+        })
+        self.orders[order['orderId']] = order
+        self.fills.append({
+            'timestamp': self.current_time, 'symbol': symbol, 'side': order['side'],
+            'price': price, 'quantity': quantity, 'fee': fee, 'order_id': order['orderId']
+        })
+
+    @staticmethod
+    def _public(order: Dict[str, Any]) -> Dict[str, Any]:
+        """Order response without internal bookkeeping"""
+        return {key: value for key, value in order.items() if not key.startswith('_')}
+
+def run_paper_trading(engine: Any, exchange: PaperExchange, steps: Optional[int] = None,
+                      logger: Optional[Logger] = None) -> pd.Series:
+    """Drive a TradingEngine over the exchange candles without waiting between iterations
+
+    The engine must have been created with ``client=exchange`` and have an
+    active session. Returns the account equity after every iteration.
+    """
+    equity = []
+    times = []
+    iterations = 0
+    while steps is None or iterations < steps:
+        engine.run_iteration()
+        equity.append(exchange.equity())
+        times.append(exchange.current_time)
+        iterations += 1
+        if not exchange.advance():
+            break
+
+    if logger:
+        logger.log(f"Paper trading finished after {iterations} iterations: equity {equity[-1]:.2f}")
+    return pd.Series(equity, index=pd.DatetimeIndex(times))
@@ -2,68 +2,101 @@
 
 from decimal import Decimal
 from typing import Optional, Dict, Any
+import pandas as pd
 from binance.client import Client
+from ..utils.exchange_rules import ExchangeRules, SymbolRules, adjust_quantity
+from ..utils.latency import LatencyRecorder
 from ..utils.logger import Logger
+from .order_executor import OrderExecutor, OrderResult, is_transient, parse_fill
+from .position_sizing import FixedFractionSizer, PositionSizer
 
 class PositionManager:
-    """Handle all position-related operations"""
-    def __init__(self, client: Client, logger: Logger):
+    """Handle all position-related operations
+    
+    With ``db`` every change of the position and every order in flight is
+    checkpointed as it happens, and ``restore`` rebuilds the position after
+    a restart from those rows and the exchange balances. Rows are stored
+    under ``mode`` ('live' or 'paper'), so paper runs keep their own state.
+    """
+    def __init__(self, client: Client, logger: Logger, latency: Optional[LatencyRecorder] = None,
+                 executor: Optional[OrderExecutor] = None, db: Optional[Any] = None,
+                 sizer: Optional[PositionSizer] = None, mode: str = 'live',
+                 rules: Optional[ExchangeRules] = None):
         self.client = client
         self.logger = logger
+        self.latency = latency or LatencyRecorder()
+        self.executor = executor or OrderExecutor(client, logger, self.latency)
+        self.db = db
+        self.mode = mode
+        self.sizer = sizer or FixedFractionSizer()
+        # Symbol filters are fetched once per symbol, not on every order
+        self.rules = rules or ExchangeRules(client)
         self.current_symbol: Optional[str] = None
         self.has_position = False
         self.position_size: Optional[float] = None
+        self.entry_price: Optional[float] = None
+        self.last_order: Optional[Dict[str, Any]] = None
+        self.last_result: Optional[OrderResult] = None
         
     def get_symbol_info(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get trading rules for a symbol"""
         try:
-            info = self.client.get_symbol_info(symbol)
-            for filter in info['filters']:
-                if filter['filterType'] == 'LOT_SIZE':
-                    return {
-                        'min_qty': float(filter['minQty']),
-                        'max_qty': float(filter['maxQty']),
-                        'step_size': float(filter['stepSize'])
-                    }
-            return None
+            rules = self._rules(symbol)
+            return {
+                'min_qty': rules.min_qty,
+                'max_qty': rules.max_qty,
+                'step_size': rules.step_size
+            }
         except Exception as e:
             self.logger.log(f"Erro ao obter informações do símbolo: {str(e)}")
             return None
             
-    def adjust_quantity(self, quantity: float, step_size: float) -> float:
+    @staticmethod
+    def adjust_quantity(quantity: float, step_size: float) -> float:
         """Adjust quantity to match symbol's step size"""
-        step_size_decimals = len(str(step_size).split('.')[-1])
-        return float(("{:." + str(step_size_decimals) + "f}").format(quantity - (quantity % step_size)))
+        return adjust_quantity(quantity, step_size)
+        
+    def calculate_position_size(self, equity: float, price: float,
+                                market_data: Optional[pd.DataFrame] = None) -> float:
+        """Quantity to buy at ``price`` with ``equity``, from the sizer and the candles already fetched"""
+        return self.sizer.quantity(equity, price, market_data)
         
-    def open_position(self, symbol: str, quantity: float) -> bool:
-        """Open a new position"""
+    def _rules(self, symbol: str) -> SymbolRules:
+        if symbol not in self.rules.symbols:
+            with self.latency.time('symbol_info'):
+                return self.rules.get(symbol)
+        return self.rules.get(symbol)
+        
+    def open_position(self, symbol: str, quantity: float, price: Optional[float] = None) -> bool:
+        """Open a new position; with ``price`` the minimum notional is checked before sending"""
         try:
-            symbol_info = self.get_symbol_info(symbol)
-            if not symbol_info:
+            rules = self._rules(symbol)
+            adjusted_quantity = rules.round_quantity(quantity)
+            
+            if adjusted_quantity < rules.min_qty:
+                self.logger.log(f"Quantidade muito pequena. Mínimo: {rules.min_qty}")
                 return False
                 
-            adjusted_quantity = self.adjust_quantity(quantity, symbol_info['step_size'])
-            
-            if adjusted_quantity < symbol_info['min_qty']:
-                self.logger.log(f"Quantidade muito pequena. Mínimo: {symbol_info['min_qty']}")
+            if adjusted_quantity > rules.max_qty:
+                self.logger.log(f"Quantidade muito grande. Máximo: {rules.max_qty}")
                 return False
                 
-            if adjusted_quantity > symbol_info['max_qty']:
-                self.logger.log(f"Quantidade muito grande. Máximo: {symbol_info['max_qty']}")
+            if price is not None and not rules.valid(adjusted_quantity, price):
+                self.logger.log(f"Valor da ordem abaixo do mínimo: {rules.min_notional}")
                 return False
                 
-            order = self.client.create_order(
-                symbol=symbol,
-                side=Client.SIDE_BUY,
-                type=Client.ORDER_TYPE_MARKET,
-                quantity=adjusted_quantity
-            )
+            result = self._execute(symbol, Client.SIDE_BUY, adjusted_quantity)
+            if not result.filled:
+                self.logger.log(f"Ordem de compra não executada ({result.status}): {result.error or symbol}")
+                return False
             
             self.has_position = True
-            self.position_size = adjusted_quantity
+            self.position_size = result.executed_quantity
             self.current_symbol = symbol
+            self.entry_price = result.average_price
+            self._checkpoint(symbol)
             
-            self.logger.log(f"Posição aberta: {adjusted_quantity} {symbol}")
+            self.logger.log(f"Posição aberta: {result.executed_quantity} {symbol}")
             return True
             
         except Exception as e:
@@ -76,20 +109,101 @@ class PositionManager:
             if not self.has_position or not self.position_size:
                 return False
                 
-            order = self.client.create_order(
-                symbol=symbol,
-                side=Client.SIDE_SELL,
-                type=Client.ORDER_TYPE_MARKET,
-                quantity=self.position_size
-            )
+            result = self._execute(symbol, Client.SIDE_SELL, self.position_size)
+            if not result.filled:
+                self.logger.log(f"Ordem de venda não executada ({result.status}): {result.error or symbol}")
+                return False
+            
+            remaining = self.position_size - result.executed_quantity
+            if remaining > 1e-12:
+                # Partially filled: keep what is still held
+                self.position_size = remaining
+                self._checkpoint(symbol)
+                self.logger.log(f"Posição parcialmente fechada: restam {remaining} {symbol}")
+                return False
             
             self.has_position = False
             self.position_size = None
             self.current_symbol = None
+            self.entry_price = None
+            self._checkpoint(symbol)
             
             self.logger.log(f"Posição fechada: {symbol}")
             return True
             
         except Exception as e:
             self.logger.log(f"Erro ao fechar posição: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+            
+    def restore(self, symbol: str) -> bool:
+        """Rebuild the position of ``symbol`` after a restart; True when one is open
+        
+        The checkpointed position is reconciled with the exchange balances,
+        read in a single get_account call: holdings sold outside the bot
+        shrink or close it, and balances the bot never bought are left
+        alone. Orders left pending by a crash are looked up by client order
+        ID, so a buy filled just before the crash is recovered too.
+        
+        Errors reading the database or the exchange are raised: starting
+        without knowing the position could buy it a second time.
+        """
+        self.has_position, self.position_size, self.current_symbol, self.entry_price = False, None, None, None
+        if self.db is None:
+            return False
+        stored = self.db.load_positions(self.mode).get(symbol)
+        quantity = stored['quantity'] if stored else 0.0
+        entry_price = stored['entry_price'] if stored else None
+        
+        for pending in self.db.load_pending_orders(symbol, mode=self.mode):
+            client_order_id = pending['client_order_id']
+            try:
+                order = self.client.get_order(symbol=symbol, origClientOrderId=client_order_id)
+            except Exception as e:
+                if is_transient(e):
+                    raise
+                order = None  # never reached the exchange
+            if order and order.get('status') in ('NEW', 'PARTIALLY_FILLED'):
+                self.logger.log(f"Ordem {client_order_id} ainda aberta na corretora")
+                continue
+            if order:
+                executed, price, _ = parse_fill(order, pending['quantity'])
+                if pending['side'] == Client.SIDE_BUY and executed > 0:
+                    quantity, entry_price = executed, price
+                elif pending['side'] == Client.SIDE_SELL:
+                    quantity = max(0.0, quantity - executed)
+            self.db.delete_pending_order(client_order_id)
+            
+        if quantity > 0:
+            info = self.client.get_symbol_info(symbol)
+            balances = {balance['asset']: float(balance['free']) + float(balance['locked'])
+                        for balance in self.client.get_account()['balances']}
+            held = balances.get(info['baseAsset'], 0.0)
+            if held < quantity:
+                self.logger.log(f"Saldo de {info['baseAsset']} menor que a posição salva: {held} < {quantity}")
+                quantity = held
+                
+        if quantity > 0:
+            self.has_position = True
+            self.position_size = quantity
+            self.current_symbol = symbol
+            self.entry_price = entry_price
+            self.logger.log(f"Posição recuperada: {quantity} {symbol}")
+        self._checkpoint(symbol)
+        return self.has_position
+        
+    def _checkpoint(self, symbol: str) -> None:
+        if self.db is not None:
+            self.db.save_position(symbol, self.position_size or 0.0, self.entry_price, mode=self.mode)
+            
+    def _execute(self, symbol: str, side: str, quantity: float) -> OrderResult:
+        """Send a market order through the executor and keep its response"""
+        client_order_id = self.executor.new_client_order_id()
+        if self.db is not None:
+            self.db.save_pending_order(client_order_id, symbol, side, quantity, mode=self.mode)
+        result = self.executor.submit(symbol, side, quantity, client_order_id=client_order_id)
+        # Unconfirmed orders stay pending for restore to look up
+        if self.db is not None and result.status != 'UNKNOWN':
+            self.db.delete_pending_order(client_order_id)
+        self.last_result = result
+        self.last_order = result.response
+        return result
@@ -0,0 +1,113 @@
+# src/trading/position_sizing.py
+"""
+Position sizing shared by the live engine and the backtesters.
+
+A PositionSizer turns the equity available to the bot into the fraction
+to invest on an entry:
+
+- ``FixedFractionSizer`` always invests the same fraction (the former
+  hard-coded 95%);
+- ``VolatilitySizer`` risks ``risk_fraction`` of equity per trade,
+  assuming a loss of ``atr_multiple`` ATRs, so quieter markets get bigger
+  positions;
+- ``KellySizer`` invests a scaled Kelly fraction of the win rate and
+  payoff ratio, capped at ``max_fraction``.
+
+Sizers only read candles already fetched for the strategy and the equity
+the caller tracks, so sizing an order costs no API call. ``fractions``
+gives one fraction per bar for the backtest kernels and ``fraction`` the
+one of the last bar for live entries.
+"""
+import math
+from typing import Optional, Sequence
+import numpy as np
+import pandas as pd
+from .indicators import atr
+
+class PositionSizer:
+    """Fraction of equity to invest when entering a position"""
+    def __init__(self, max_fraction: float = 0.95):
+        if not 0.0 < max_fraction <= 1.0:
+            raise ValueError("max_fraction must be in (0, 1]")
+        self.max_fraction = max_fraction
+
+    def fractions(self, data: pd.DataFrame) -> np.ndarray:
+        """Fraction to invest on an entry at each bar of ``data``"""
+        return np.full(len(data), self.max_fraction)
+
+    def fraction(self, data: Optional[pd.DataFrame] = None) -> float:
+        """Fraction to invest on an entry at the last bar"""
+        return self.max_fraction
+
+    def quantity(self, equity: float, price: float, data: Optional[pd.DataFrame] = None) -> float:
+        """Base asset quantity to buy at ``price``, before exchange rounding"""
+        if price <= 0 or equity <= 0:
+            return 0.0
+        return equity * self.fraction(data) / price
+
+class FixedFractionSizer(PositionSizer):
+    """Invest the same fraction of equity on every entry"""
+    def __init__(self, fraction: float = 0.95):
+        super().__init__(fraction)
+
+class VolatilitySizer(PositionSizer):
+    """Size positions so that ``atr_multiple`` ATRs against them lose ``risk_fraction`` of equity"""
+    def __init__(self, risk_fraction: float = 0.01, atr_multiple: float = 2.0, period: int = 14,
+                 max_fraction: float = 0.95):
+        super().__init__(max_fraction)
+        self.risk_fraction = risk_fraction
+        self.atr_multiple = atr_multiple
+        self.period = period
+
+    def fractions(self, data: pd.DataFrame) -> np.ndarray:
+        close = data['fechamento'].to_numpy(dtype=np.float64)
+        high = data['maxima'].to_numpy(dtype=np.float64) if 'maxima' in data else close
+        low = data['minima'].to_numpy(dtype=np.float64) if 'minima' in data else close
+        risk = self.atr_multiple * atr(high, low, close, self.period) / close
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fractions = np.where(risk > 0, self.risk_fraction / risk, self.max_fraction)
+        return np.minimum(np.nan_to_num(fractions, nan=0.0), self.max_fraction)
+
+    def fraction(self, data: Optional[pd.DataFrame] = None) -> float:
+        if data is None or len(data) == 0:
+            return 0.0
+        # The seed of the average weighs (1 - 1/period)^(10 * period) < 1e-4 after this many bars
+        return float(self.fractions(data.iloc[-10 * self.period:])[-1])
+
+class KellySizer(PositionSizer):
+    """Invest ``scale`` times the Kelly fraction, at most ``max_fraction``
+
+    ``win_rate`` is the share of winning trades and ``payoff`` the average
+    winning return over the average losing one.
+    """
+    def __init__(self, win_rate: float, payoff: float, scale: float = 0.5, max_fraction: float = 0.25):
+        super().__init__(max_fraction)
+        self.win_rate = win_rate
+        self.payoff = payoff
+        self.scale = scale
+
+    @classmethod
+    def from_returns(cls, returns: Sequence[float], scale: float = 0.5,
+                     max_fraction: float = 0.25) -> 'KellySizer':
+        """Sizer fitted to the returns of closed trades (profit over cost)"""
+        returns = np.asarray(returns, dtype=np.float64)
+        wins, losses = returns[returns > 0], returns[returns < 0]
+        win_rate = len(wins) / len(returns) if len(returns) else 0.0
+        if len(losses) == 0:
+            payoff = math.inf
+        else:
+            payoff = wins.mean() / -losses.mean() if len(wins) else 0.0
+        return cls(win_rate, payoff, scale, max_fraction)
+
+    @property
+    def kelly(self) -> float:
+        """Full Kelly fraction, negative when the edge is"""
+        if self.payoff <= 0:
+            return -1.0
+        return self.win_rate - (1.0 - self.win_rate) / self.payoff
+
+    def fractions(self, data: pd.DataFrame) -> np.ndarray:
+        return np.full(len(data), self.fraction())
+
+    def fraction(self, data: Optional[pd.DataFrame] = None) -> float:
+        return min(max(self.scale * self.kelly, 0.0), self.max_fraction)
@@ -0,0 +1,223 @@
+# src/trading/resampler.py
+"""
+Multi-timeframe candles built from one 1m feed.
+
+CandleResampler aggregates base candles into every configured interval.
+Each batch of new base candles is grouped by bucket with NumPy reductions;
+only the bucket still open carries over between batches, so adding a
+candle never recomputes closed bars. A bucket closes as soon as its last
+base candle arrives, without waiting for the next bucket. Frames are
+cached per interval and rebuilt only after that interval changes.
+
+ResamplingFetcher is a DataFetcher serving any interval from the resampled
+1m candles of each symbol: after the first call it only downloads the 1m
+candles closed since the previous one, so strategies can read several
+timeframes for the cost of one feed.
+"""
+import time
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from ..utils.clock import INTERVAL_SECONDS
+from .data_fetcher import DataFetcher
+
+DEFAULT_INTERVALS = ('1m', '5m', '15m', '1h', '4h', '1d')
+_FIELDS = ('open_time', 'abertura', 'maxima', 'minima', 'fechamento', 'volume')
+_WEEK_ORIGIN_MS = 4 * 24 * 60 * 60 * 1000  # 1970-01-05 was a Monday
+
+class _Timeframe:
+    """Closed bars and the open bucket of one interval"""
+    def __init__(self, interval: str, max_bars: Optional[int]):
+        self.interval = interval
+        self.length = INTERVAL_SECONDS[interval] * 1000
+        self.origin = _WEEK_ORIGIN_MS if interval == '1w' else 0
+        self.max_bars = max_bars
+        self.bars: Dict[str, np.ndarray] = {
+            'open_time': np.empty(0, dtype=np.int64),
+            **{name: np.empty(0) for name in _FIELDS[1:]}
+        }
+        self.partial: Optional[List[float]] = None  # open_time, open, high, low, close, volume
+        self.version = 0  # bumped whenever a bar closes
+        self._frames: Dict[bool, Any] = {}
+
+    def add(self, open_time: np.ndarray, close_time: np.ndarray, open_: np.ndarray,
+            high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray) -> None:
+        starts = (open_time - self.origin) // self.length * self.length + self.origin
+        first = np.concatenate(([0], np.flatnonzero(np.diff(starts)) + 1))
+        last = np.concatenate((first[1:] - 1, [len(starts) - 1]))
+        groups = [
+            starts[first], open_[first], np.maximum.reduceat(high, first),
+            np.minimum.reduceat(low, first), close[last], np.add.reduceat(volume, first)
+        ]
+
+        partial = self.partial
+        if partial is not None:
+            if partial[0] == groups[0][0]:
+                # The batch continues the open bucket
+                groups[1][0] = partial[1]
+                groups[2][0] = max(groups[2][0], partial[2])
+                groups[3][0] = min(groups[3][0], partial[3])
+                groups[5][0] += partial[5]
+            else:
+                # The open bucket ended with a gap in the base candles
+                groups = [np.concatenate(([value], column)) for value, column in zip(partial, groups)]
+
+        # Every bucket but the last is followed by newer candles; the last one is
+        # closed once its final base candle is in
+        closed = len(groups[0]) - 1
+        if close_time[-1] >= groups[0][-1] + self.length - 1:
+            closed += 1
+        self.partial = [column[-1].item() for column in groups] if closed < len(groups[0]) else None
+
+        if closed:
+            for name, column in zip(_FIELDS, groups):
+                merged = np.concatenate((self.bars[name], column[:closed]))
+                self.bars[name] = merged[-self.max_bars:] if self.max_bars else merged
+            self.version += 1
+            self._frames.clear()
+        else:
+            self._frames.pop(True, None)
+
+    def frame(self, include_partial: bool) -> pd.DataFrame:
+        cached = self._frames.get(include_partial)
+        if cached is not None:
+            return cached
+        columns = dict(self.bars)
+        if include_partial and self.partial is not None:
+            columns = {name: np.append(column, value) for (name, column), value in zip(columns.items(), self.partial)}
+        open_time = columns.pop('open_time').astype(np.int64)
+        index = pd.to_datetime(open_time, unit='ms', utc=True)
+        frame = pd.DataFrame(columns, index=index)
+        # Same close time column as DataFetcher.parse_klines
+        frame['tempo_fechamento'] = (index + pd.Timedelta(milliseconds=self.length - 1)).tz_convert("America/Sao_Paulo")
+        self._frames[include_partial] = frame
+        return frame
+
+class CandleResampler:
+    """Incremental aggregation of base candles into higher timeframes"""
+    def __init__(self, intervals: Sequence[str] = DEFAULT_INTERVALS, base_interval: str = '1m',
+                 max_bars: Optional[int] = 5000):
+        if base_interval not in INTERVAL_SECONDS:
+            raise ValueError(f"Unknown kline interval: {base_interval}")
+        self.base_interval = base_interval
+        self.base_length = INTERVAL_SECONDS[base_interval] * 1000
+        self.timeframes: Dict[str, _Timeframe] = {}
+        for interval in intervals:
+            self.add_interval(interval, max_bars)
+        self.last_open_time: Optional[int] = None
+
+    def add_interval(self, interval: str, max_bars: Optional[int] = 5000) -> None:
+        """Start aggregating another interval (from the next candles on)"""
+        if interval not in INTERVAL_SECONDS or interval == '1M':
+            raise ValueError(f"Cannot resample to {interval}")
+        length = INTERVAL_SECONDS[interval] * 1000
+        if length % self.base_length:
+            raise ValueError(f"{interval} is not a multiple of {self.base_interval}")
+        self.timeframes.setdefault(interval, _Timeframe(interval, max_bars))
+
+    @property
+    def last_close_time(self) -> Optional[int]:
+        """Close time (ms) of the newest base candle"""
+        return None if self.last_open_time is None else self.last_open_time + self.base_length - 1
+
+    def update(self, klines: Iterable[Sequence[Any]]) -> int:
+        """Add closed base klines (Client.get_klines rows); returns how many were new"""
+        rows = [k for k in klines if self.last_open_time is None or int(k[0]) > self.last_open_time]
+        if not rows:
+            return 0
+        open_time = np.fromiter((int(k[0]) for k in rows), dtype=np.int64, count=len(rows))
+        values = np.array([k[1:6] for k in rows], dtype=np.float64)
+        self._add(open_time, *values.T)
+        return len(rows)
+
+    def update_frame(self, frame: pd.DataFrame) -> int:
+        """Add base candles in the backtest layout (CryptoDatabase.load_candles)"""
+        index = pd.DatetimeIndex(frame.index)
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        open_time = index.asi8 // 1_000_000
+        new = open_time > self.last_open_time if self.last_open_time is not None else slice(None)
+        columns = [frame[name].to_numpy(dtype=np.float64)[new] for name in _FIELDS[1:]]
+        open_time = open_time[new]
+        if not len(open_time):
+            return 0
+        self._add(open_time, *columns)
+        return len(open_time)
+
+    def _add(self, open_time: np.ndarray, open_, high, low, close, volume) -> None:
+        close_time = open_time + self.base_length - 1
+        for timeframe in self.timeframes.values():
+            timeframe.add(open_time, close_time, open_, high, low, close, volume)
+        self.last_open_time = int(open_time[-1])
+
+    def get(self, interval: str, include_partial: bool = False) -> pd.DataFrame:
+        """Candles of ``interval`` (abertura..volume, tempo_fechamento) indexed by open time (UTC)
+
+        The returned frame is cached and shared; copy it before modifying.
+        """
+        if interval not in self.timeframes:
+            raise ValueError(f"Interval {interval} is not being resampled")
+        return self.timeframes[interval].frame(include_partial)
+
+class ResamplingFetcher(DataFetcher):
+    """DataFetcher serving every interval from the resampled 1m candles of each symbol
+
+    With ``db`` the stored 1m candles seed the resampler and every new
+    candle is saved back, so restarts only download what is missing.
+
+    Without stored candles the first sync downloads at most
+    ``max_history`` 1m candles (``max_bars`` by default, about 3.5 days for
+    5000), whatever ``limit`` asks for: 1000 daily bars would take 1.44M
+    minutes and some 1,440 requests. Longer histories of the higher
+    intervals come from the database, filled beforehand with ``sync-data``.
+    """
+    def __init__(self, client: Any, intervals: Sequence[str] = DEFAULT_INTERVALS, db: Any = None,
+                 max_bars: Optional[int] = 5000, max_history: Optional[int] = None):
+        super().__init__(client)
+        self.intervals = tuple(intervals)
+        self.db = db
+        self.max_bars = max_bars
+        self.max_history = max_history if max_history is not None else max_bars
+        self.resamplers: Dict[str, CandleResampler] = {}
+
+    def get_market_data(self, symbol: str, interval: str, limit: int = 1000) -> pd.DataFrame:
+        """Last ``limit`` closed candles of ``interval``, refreshing the 1m feed first"""
+        # One extra bucket so the oldest bar is complete
+        resampler = self.sync(symbol, history_ms=(limit + 1) * INTERVAL_SECONDS[interval] * 1000)
+        if interval not in resampler.timeframes:
+            raise ValueError(f"Interval {interval} is not being resampled")
+        return resampler.get(interval).iloc[-limit:]
+
+    def get_timeframes(self, symbol: str, intervals: Iterable[str], limit: int = 1000) -> Dict[str, pd.DataFrame]:
+        """Candles of several intervals from a single refresh of the 1m feed"""
+        intervals = list(intervals)
+        longest = max(INTERVAL_SECONDS[interval] for interval in intervals)
+        resampler = self.sync(symbol, history_ms=(limit + 1) * longest * 1000)
+        return {interval: resampler.get(interval).iloc[-limit:] for interval in intervals}
+
+    def sync(self, symbol: str, history_ms: int = 0) -> CandleResampler:
+        """Download the 1m candles closed since the last sync, or ``history_ms`` of them at first
+
+        The first download is capped at ``max_history`` candles.
+        """
+        resampler = self.resamplers.get(symbol)
+        if resampler is None:
+            resampler = self.resamplers[symbol] = CandleResampler(self.intervals, '1m', self.max_bars)
+            if self.db is not None:
+                resampler.update_frame(self.db.load_candles(symbol, '1m'))
+
+        now_ms = int(time.time() * 1000)
+        if resampler.last_open_time is not None:
+            start = resampler.last_open_time + 60_000
+        else:
+            # Anchor the history on the exchange's latest candle, not the local clock
+            latest = self.client.get_klines(symbol=symbol, interval='1m', limit=1)
+            if self.max_history is not None:
+                history_ms = min(history_ms, self.max_history * 60_000)
+            start = (int(latest[-1][0]) if latest else now_ms) - history_ms
+        klines = self.client.get_historical_klines(symbol, '1m', start)
+        # The last kline is usually the candle still forming
+        closed = [k for k in klines if int(k[6]) < now_ms]
+        if resampler.update(closed) and self.db is not None:
+            self.db.save_candles(symbol, '1m', closed)
+        return resampler
@@ -0,0 +1,137 @@
+# src/trading/risk_manager.py
+"""
+Stops and exposure limits evaluated on every price.
+
+PositionRisk holds the stop, target and highest price of one long
+position and checks a bar (or a single tick, as a bar whose open, high and
+low are the price) in O(1): the stop loss and trailing stop fill at the
+stop price (or the open when the bar gaps through it) if the low reaches
+them, the take profit at its price (or the open) if the high reaches it.
+These are the rules of the backtest kernels, so ``Backtester`` with
+``risk=RiskLimits(...)`` exits on the same bars at the same prices in its
+bar loop and in ``fast=True`` mode.
+
+RiskManager applies them around a PositionManager in the live engine:
+it closes positions whose stop is hit, blocks re-entry until the strategy
+emits a SELL, and refuses entries above the exposure limit.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+from ..utils.logger import Logger
+from .position_manager import PositionManager
+
+@dataclass
+class RiskLimits:
+    """Exit and exposure rules; stops are fractions of the entry price, 0 disables them
+
+    ``trailing_stop`` trails the highest high since entry and
+    ``max_exposure`` caps the notional of open positions as a fraction of
+    the capital.
+    """
+    stop_loss: float = 0.0
+    take_profit: float = 0.0
+    trailing_stop: float = 0.0
+    max_exposure: float = 0.0
+
+    @property
+    def has_stops(self) -> bool:
+        return self.stop_loss > 0 or self.take_profit > 0 or self.trailing_stop > 0
+
+class PositionRisk:
+    """Stop levels of one open long position"""
+    __slots__ = ('limits', 'entry_price', 'notional', 'peak')
+
+    def __init__(self, limits: RiskLimits, entry_price: float, notional: float = 0.0):
+        self.limits = limits
+        self.entry_price = entry_price
+        self.notional = notional
+        self.peak = entry_price
+
+    @property
+    def stop(self) -> float:
+        """Highest of the stop loss and trailing stop prices (0 when neither is set)"""
+        limits = self.limits
+        stop = self.entry_price * (1.0 - limits.stop_loss) if limits.stop_loss > 0 else 0.0
+        if limits.trailing_stop > 0 and self.peak * (1.0 - limits.trailing_stop) > stop:
+            stop = self.peak * (1.0 - limits.trailing_stop)
+        return stop
+
+    @property
+    def target(self) -> float:
+        return self.entry_price * (1.0 + self.limits.take_profit) if self.limits.take_profit > 0 else 0.0
+
+    def check(self, open_: float, high: float, low: float) -> float:
+        """Exit price if the bar hits a stop or the target, else 0 (and the peak is updated)"""
+        stop = self.stop
+        if stop > 0.0 and low <= stop:
+            return open_ if open_ < stop else stop
+        target = self.target
+        if target > 0.0 and high >= target:
+            return open_ if open_ > target else target
+        if high > self.peak:
+            self.peak = high
+        return 0.0
+
+    def check_price(self, price: float) -> float:
+        """Exit price if a tick at ``price`` hits a stop or the target, else 0"""
+        return self.check(price, price, price)
+
+class RiskManager:
+    """Stops and exposure limits around a PositionManager"""
+    def __init__(self, position_manager: PositionManager, limits: Optional[RiskLimits] = None,
+                 logger: Optional[Logger] = None):
+        self.position_manager = position_manager
+        self.limits = limits or RiskLimits()
+        self.logger = logger
+        self.positions: Dict[str, PositionRisk] = {}
+        self.exposure = 0.0  # entry notional of the open positions
+        # Symbols stopped out, waiting for a SELL signal before buying again
+        self.blocked: Set[str] = set()
+
+    def allow_entry(self, symbol: str, quantity: float, price: float, capital: float) -> bool:
+        """Whether buying ``quantity`` at ``price`` respects the stop block and exposure limit"""
+        if symbol in self.blocked:
+            return False
+        if self.limits.max_exposure > 0 and self.exposure + quantity * price > self.limits.max_exposure * capital:
+            self._log(f"Exposição máxima atingida: {self.exposure + quantity * price:.2f} > "
+                      f"{self.limits.max_exposure * capital:.2f}")
+            return False
+        return True
+
+    def on_entry(self, symbol: str, price: float, quantity: float) -> None:
+        self.on_exit(symbol)
+        self.positions[symbol] = PositionRisk(self.limits, price, price * quantity)
+        self.exposure += price * quantity
+
+    def on_exit(self, symbol: str) -> None:
+        position = self.positions.pop(symbol, None)
+        if position is not None:
+            self.exposure = max(0.0, self.exposure - position.notional)
+
+    def on_signal(self, symbol: str, signal: Optional[str]) -> None:
+        """A SELL signal lifts the re-entry block left by a stop"""
+        if signal == "SELL":
+            self.blocked.discard(symbol)
+
+    def on_price(self, symbol: str, price: float) -> Optional[float]:
+        """Check a price tick; returns the stop price when the position was closed"""
+        return self.on_bar(symbol, price, price, price)
+
+    def on_bar(self, symbol: str, open_: float, high: float, low: float) -> Optional[float]:
+        """Check a bar; returns the exit price when the position was closed"""
+        position = self.positions.get(symbol)
+        if position is None or not self.limits.has_stops:
+            return None
+        exit_price = position.check(open_, high, low)
+        if exit_price <= 0.0:
+            return None
+        self._log(f"Stop atingido em {symbol}: {exit_price:.8f} (entrada {position.entry_price:.8f})")
+        if not self.position_manager.close_position(symbol):
+            return None
+        self.on_exit(symbol)
+        self.blocked.add(symbol)
+        return exit_price
+
+    def _log(self, message: str) -> None:
+        if self.logger:
+            self.logger.log(message)
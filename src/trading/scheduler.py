@@ -0,0 +1,146 @@
+# src/trading/scheduler.py
+"""
+Candle-close aligned scheduler.
+
+Each (symbol, interval) job wakes up ``close_delay`` seconds after its
+candle closes, plus a fixed per-job jitter that spreads many symbols over a
+few seconds instead of hitting the API at the same instant. The first run
+fetches a full window of candles; later runs only request the candles that
+closed since the previous run and append them in place to the job's
+CandleBuffer, whose frame view is handed to the callback. When no
+new candle has closed yet the callback is skipped and the job retries
+shortly, up to ``max_retries`` times before waiting for the next close.
+"""
+import random
+import threading
+import time
+import pandas as pd
+from typing import Callable, Dict, List, Optional, Tuple
+from ..utils.clock import INTERVAL_SECONDS, Clock, SystemClock, next_candle_close
+from ..utils.logger import Logger
+from ..utils.profiling import profiler
+from .candle_buffer import CandleBuffer
+from .data_fetcher import DataFetcher
+
+class ScheduledJob:
+    """State of one symbol/interval subscription"""
+    def __init__(self, symbol: str, interval: str, callback: Callable[['ScheduledJob'], None],
+                 offset: float):
+        self.symbol = symbol
+        self.interval = interval
+        self.callback = callback
+        self.offset = offset  # jitter added after every close, in seconds
+        self.next_run = 0.0
+        self.buffer: Optional[CandleBuffer] = None
+        self.data: Optional[pd.DataFrame] = None  # view of buffer, rebuilt after each fetch and invalid after the next
+        self.last_close_ms: Optional[int] = None
+        self.fetch_seconds = 0.0
+        self.new_candles = 0
+        self.retries = 0
+        self.runs = 0
+        self.skipped = 0
+
+class CandleScheduler:
+    """Run callbacks once per closed candle of each symbol/interval"""
+    def __init__(self, fetcher: DataFetcher, clock: Optional[Clock] = None, close_delay: float = 2.0,
+                 jitter: float = 0.0, window: int = 1000, retry_delay: float = 5.0,
+                 max_retries: int = 3, logger: Optional[Logger] = None):
+        self.fetcher = fetcher
+        self.clock = clock or SystemClock()
+        self.close_delay = close_delay
+        self.jitter = jitter
+        self.window = window
+        self.retry_delay = retry_delay
+        self.max_retries = max_retries
+        self.logger = logger
+        self.jobs: Dict[Tuple[str, str], ScheduledJob] = {}
+        self._lock = threading.Lock()
+
+    def add(self, symbol: str, interval: str, callback: Callable[[ScheduledJob], None]) -> ScheduledJob:
+        """Schedule ``callback(job)`` after every close; the first run happens immediately"""
+        if interval not in INTERVAL_SECONDS:
+            raise ValueError(f"Unknown kline interval: {interval}")
+        # Seeded by the job key so the spread is stable between restarts
+        offset = random.Random(f"{symbol}:{interval}").uniform(0, self.jitter) if self.jitter > 0 else 0.0
+        job = ScheduledJob(symbol, interval, callback, offset)
+        job.next_run = self.clock.now()
+        with self._lock:
+            self.jobs[(symbol, interval)] = job
+        return job
+
+    def remove(self, symbol: str, interval: str) -> None:
+        with self._lock:
+            self.jobs.pop((symbol, interval), None)
+
+    def next_wakeup(self) -> Optional[float]:
+        """Epoch time of the earliest due job"""
+        with self._lock:
+            return min((job.next_run for job in self.jobs.values()), default=None)
+
+    def run_pending(self) -> int:
+        """Run every due job and return how many callbacks were invoked"""
+        now = self.clock.now()
+        with self._lock:
+            due: List[ScheduledJob] = sorted(
+                (job for job in self.jobs.values() if job.next_run <= now),
+                key=lambda job: job.next_run
+            )
+
+        invoked = 0
+        for job in due:
+            if self._refresh(job, self.clock.now()):
+                job.runs += 1
+                invoked += 1
+                job.callback(job)
+        return invoked
+
+    def run(self, stop: threading.Event) -> None:
+        """Run jobs until ``stop`` is set"""
+        while not stop.is_set():
+            self.run_pending()
+            wakeup = self.next_wakeup()
+            if wakeup is None:
+                wakeup = self.clock.now() + self.retry_delay
+            self.clock.sleep_until(wakeup, stop)
+
+    def _refresh(self, job: ScheduledJob, now: float) -> bool:
+        """Fetch the candles closed since the last run; False when nothing changed"""
+        now_ms = int(now * 1000)
+        length_ms = INTERVAL_SECONDS[job.interval] * 1000
+        if job.last_close_ms is None:
+            limit = self.window
+        else:
+            # Candles closed since the last run plus the one still forming
+            limit = min(self.window, int((now_ms - job.last_close_ms) // length_ms) + 1)
+
+        started = time.perf_counter()
+        with profiler.phase("data.fetch"):
+            klines = self.fetcher.client.get_klines(symbol=job.symbol, interval=job.interval, limit=limit)
+        # Keep closed candles only; the last kline is usually the one still forming
+        new = [k for k in klines
+               if int(k[6]) <= now_ms and (job.last_close_ms is None or int(k[6]) > job.last_close_ms)]
+        job.fetch_seconds = time.perf_counter() - started
+
+        next_close = next_candle_close(now - job.offset, job.interval, self.close_delay) + job.offset
+        if not new:
+            job.skipped += 1
+            if job.retries < self.max_retries:
+                job.retries += 1
+                job.next_run = min(now + self.retry_delay, next_close)
+            else:
+                job.retries = 0
+                job.next_run = next_close
+            return False
+
+        if job.buffer is None:
+            job.buffer = CandleBuffer(self.window)
+        job.buffer.extend_klines(new)
+        job.data = job.buffer.frame()
+        job.last_close_ms = int(new[-1][6])
+        job.new_candles = len(new)
+        job.retries = 0
+        job.next_run = next_close
+
+        if self.logger and len(new) > 1 and job.runs > 0:
+            self.logger.log(f"{job.symbol} {job.interval}: {len(new)} candles recuperados após atraso")
+        return True
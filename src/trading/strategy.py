@@ -1,40 +1,276 @@
 # src/trading/strategy.py
 
+import importlib
+import numpy as np
 import pandas as pd
-from typing import Literal, Optional
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Type
+from . import indicators
+
+# Encoding used by generate_signals: one int8 per bar
+SIGNAL_BUY = 1
+SIGNAL_SELL = -1
+SIGNAL_NONE = 0
 
 class TradingStrategy:
     """Base class for trading strategies"""
+    # Intervals read besides the trading interval, passed to update_timeframes
+    timeframes: Tuple[str, ...] = ()
+    
     def update(self, data: pd.DataFrame) -> None:
         raise NotImplementedError
         
+    def update_timeframes(self, frames: Dict[str, pd.DataFrame]) -> None:
+        """Receive the candles of ``timeframes`` before each update"""
+        self.frames = frames
+        
     def get_signal(self) -> Optional[Literal["BUY", "SELL"]]:
         raise NotImplementedError
+        
+    def get_state(self) -> Dict[str, Any]:
+        """JSON-serializable state checkpointed by the engine; empty when derived from the data"""
+        return {}
+        
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """Restore the state returned by get_state before a restart"""
+        pass
+        
+    def generate_signals(self, data: pd.DataFrame) -> np.ndarray:
+        """Return the signal of every bar as an int8 array (1 BUY, -1 SELL, 0 none).
+        
+        The default implementation replays update/get_signal bar by bar;
+        strategies that can compute their signals in one pass should override it.
+        """
+        signals = np.zeros(len(data), dtype=np.int8)
+        for i in range(len(data)):
+            self.update(data.iloc[:i+1])
+            signal = self.get_signal()
+            if signal == "BUY":
+                signals[i] = SIGNAL_BUY
+            elif signal == "SELL":
+                signals[i] = SIGNAL_SELL
+        return signals
+
+# Strategy classes by registry name
+STRATEGIES: Dict[str, Type[TradingStrategy]] = {}
+
+def register_strategy(name: str) -> Callable[[Type[TradingStrategy]], Type[TradingStrategy]]:
+    """Class decorator adding a strategy to the registry under ``name``"""
+    def decorator(cls: Type[TradingStrategy]) -> Type[TradingStrategy]:
+        if name in STRATEGIES and STRATEGIES[name] is not cls:
+            raise ValueError(f"Strategy {name} already registered")
+        STRATEGIES[name] = cls
+        return cls
+    return decorator
+
+def get_strategy(name: str) -> Type[TradingStrategy]:
+    """Strategy class by registry name or "package.module:ClassName" path
+    
+    Importing the module of a dotted path also registers the strategies it
+    decorates, which is how plugins outside this package are loaded.
+    """
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+    if ":" in name:
+        module_name, class_name = name.split(":", 1)
+        cls = getattr(importlib.import_module(module_name), class_name, None)
+        if isinstance(cls, type) and issubclass(cls, TradingStrategy):
+            return cls
+    raise ValueError(f"Unknown strategy: {name} (available: {', '.join(available_strategies())})")
+
+def create_strategy(name: str, **params: Any) -> TradingStrategy:
+    """Instantiate a registered strategy with its parameters"""
+    return get_strategy(name)(**params)
+
+def available_strategies() -> List[str]:
+    return sorted(STRATEGIES)
 
+def _state_signals(buy: np.ndarray, sell: np.ndarray, warmup: int) -> np.ndarray:
+    """int8 signals from boolean conditions, silent during the warmup bars"""
+    signals = np.zeros(len(buy), dtype=np.int8)
+    signals[buy] = SIGNAL_BUY
+    signals[sell] = SIGNAL_SELL
+    signals[:warmup] = SIGNAL_NONE
+    return signals
+
+def _to_signal(value: int) -> Optional[Literal["BUY", "SELL"]]:
+    if value == SIGNAL_BUY:
+        return "BUY"
+    if value == SIGNAL_SELL:
+        return "SELL"
+    return None
+
+@register_strategy("moving_average")
 class MovingAverageStrategy(TradingStrategy):
     """Moving average crossover strategy"""
     def __init__(self, fast_period: int = 7, slow_period: int = 40):
         self.fast_period = fast_period
         self.slow_period = slow_period
-        self.data: Optional[pd.DataFrame] = None
+        self._bars = 0
+        self.media_rapida = np.nan
+        self.media_devagar = np.nan
         
     def update(self, data: pd.DataFrame) -> None:
-        """Update strategy with new market data"""
-        self.data = data
-        self.data["media_rapida"] = self.data["fechamento"].rolling(window=self.fast_period).mean()
-        self.data["media_devagar"] = self.data["fechamento"].rolling(window=self.slow_period).mean()
+        """Update strategy with new market data
+        
+        Only the averages of the last bar are needed, so they are taken from
+        the tail of the close prices without adding columns to ``data``.
+        ``data`` is not kept: a CandleBuffer frame is overwritten by the
+        next append.
+        """
+        self._bars = len(data)
+        close = data["fechamento"].to_numpy(dtype=np.float64)
+        self.media_rapida = close[-self.fast_period:].mean() if len(close) >= self.fast_period else np.nan
+        self.media_devagar = close[-self.slow_period:].mean() if len(close) >= self.slow_period else np.nan
         
     def get_signal(self) -> Optional[Literal["BUY", "SELL"]]:
         """Generate trading signal based on strategy"""
-        if self.data is None or len(self.data) < self.slow_period:
+        if self._bars < self.slow_period:
             return None
             
-        ultima_media_rapida = self.data["media_rapida"].iloc[-1]
-        ultima_media_devagar = self.data["media_devagar"].iloc[-1]
+        ultima_media_rapida = self.media_rapida
+        ultima_media_devagar = self.media_devagar
         
         if ultima_media_rapida > ultima_media_devagar:
             return "BUY"
         elif ultima_media_rapida < ultima_media_devagar:
             return "SELL"
             
-        return None
\ No newline at end of file
+        return None
+        
+    def generate_signals(self, data: pd.DataFrame) -> np.ndarray:
+        """Vectorized equivalent of calling update/get_signal on every prefix of data"""
+        close = data["fechamento"].astype(float)
+        fast = close.rolling(window=self.fast_period).mean().to_numpy()
+        slow = close.rolling(window=self.slow_period).mean().to_numpy()
+        
+        signals = np.zeros(len(data), dtype=np.int8)
+        signals[fast > slow] = SIGNAL_BUY
+        signals[fast < slow] = SIGNAL_SELL
+        signals[:self.slow_period - 1] = SIGNAL_NONE
+        return signals
+
+def _bar_keys(data: pd.DataFrame):
+    """Close times identifying the bars of ``data``, or its index without them"""
+    return data['tempo_fechamento'].array if 'tempo_fechamento' in data.columns else data.index
+
+class IndicatorStrategy(TradingStrategy):
+    """Base for strategies whose signal is a function of indicator arrays
+    
+    Subclasses implement ``generate_signals``; ``get_signal`` returns the
+    signal of the last bar given to ``update``. Subclasses that also
+    implement ``_new_stream`` and ``_step`` are updated in O(1) per bar
+    with the streaming indicators: ``update`` only feeds the bars added
+    since the previous call, found by close time (or index). Otherwise, or
+    when ``data`` does not continue the previous bars, ``update`` evaluates
+    the signals over the whole data. The data itself is not kept.
+    """
+    def __init__(self):
+        self._signal: Optional[Literal["BUY", "SELL"]] = None
+        self._stream: Any = None
+        self._bars = 0
+        self._last_key: Any = None
+        
+    def _new_stream(self) -> Any:
+        """Fresh streaming indicator fed by ``_step``; None when the strategy has none"""
+        return None
+        
+    def _step(self, close: float) -> int:
+        """Feed one close to ``self._stream`` and return the signal of that bar"""
+        raise NotImplementedError
+        
+    def _resume(self, keys) -> Optional[int]:
+        """Position of the first bar not yet streamed, or None when ``keys`` don't continue them"""
+        if self._stream is None or self._last_key is None:
+            return None
+        # The last streamed bar is almost always the one before the newest
+        for i in range(len(keys) - 1, -1, -1):
+            if keys[i] == self._last_key:
+                return i + 1
+        return None
+        
+    def update(self, data: pd.DataFrame) -> None:
+        """Update strategy with new market data"""
+        keys = _bar_keys(data)
+        start = self._resume(keys)
+        if start is None:
+            start, self._bars, self._stream = 0, 0, self._new_stream()
+            if self._stream is None:
+                signals = self.generate_signals(data)
+                self._signal = _to_signal(signals[-1]) if len(signals) else None
+                return
+            self._signal = None
+        close = data["fechamento"].to_numpy(dtype=np.float64)
+        for value in close[start:]:
+            self._bars += 1
+            self._signal = _to_signal(self._step(float(value)))
+        self._last_key = keys[-1] if len(keys) else None
+        
+    def get_signal(self) -> Optional[Literal["BUY", "SELL"]]:
+        return self._signal
+
+@register_strategy("rsi")
+class RSIStrategy(IndicatorStrategy):
+    """Buy when RSI is oversold, sell when it is overbought"""
+    def __init__(self, period: int = 14, oversold: float = 30.0, overbought: float = 70.0):
+        super().__init__()
+        self.period = period
+        self.oversold = oversold
+        self.overbought = overbought
+        
+    def generate_signals(self, data: pd.DataFrame) -> np.ndarray:
+        values = indicators.rsi(data["fechamento"].to_numpy(dtype=np.float64), self.period)
+        return _state_signals(values < self.oversold, values > self.overbought, self.period)
+        
+    def _new_stream(self) -> indicators.RSI:
+        return indicators.RSI(self.period)
+        
+    def _step(self, close: float) -> int:
+        value = self._stream.update(close)
+        if self._bars <= self.period:
+            return SIGNAL_NONE
+        return SIGNAL_BUY if value < self.oversold else SIGNAL_SELL if value > self.overbought else SIGNAL_NONE
+
+@register_strategy("macd")
+class MACDStrategy(IndicatorStrategy):
+    """MACD line above its signal line is a buy, below is a sell"""
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        super().__init__()
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self.signal_period = signal_period
+        
+    def generate_signals(self, data: pd.DataFrame) -> np.ndarray:
+        line, signal, _ = indicators.macd(data["fechamento"].to_numpy(dtype=np.float64),
+                                          self.fast_period, self.slow_period, self.signal_period)
+        return _state_signals(line > signal, line < signal, self.slow_period + self.signal_period - 1)
+        
+    def _new_stream(self) -> indicators.MACD:
+        return indicators.MACD(self.fast_period, self.slow_period, self.signal_period)
+        
+    def _step(self, close: float) -> int:
+        line, signal, _ = self._stream.update(close)
+        if self._bars <= self.slow_period + self.signal_period - 1:
+            return SIGNAL_NONE
+        return SIGNAL_BUY if line > signal else SIGNAL_SELL if line < signal else SIGNAL_NONE
+
+@register_strategy("bollinger")
+class BollingerStrategy(IndicatorStrategy):
+    """Buy closes below the lower band, sell closes above the upper band"""
+    def __init__(self, period: int = 20, num_std: float = 2.0):
+        super().__init__()
+        self.period = period
+        self.num_std = num_std
+        
+    def generate_signals(self, data: pd.DataFrame) -> np.ndarray:
+        close = data["fechamento"].to_numpy(dtype=np.float64)
+        _, upper, lower = indicators.bollinger_bands(close, self.period, self.num_std)
+        return _state_signals(close < lower, close > upper, self.period - 1)
+        
+    def _new_stream(self) -> indicators.BollingerBands:
+        return indicators.BollingerBands(self.period, self.num_std)
+        
+    def _step(self, close: float) -> int:
+        _, upper, lower = self._stream.update(close)
+        if self._bars <= self.period - 1:
+            return SIGNAL_NONE
+        return SIGNAL_BUY if close < lower else SIGNAL_SELL if close > upper else SIGNAL_NONE
@@ -1,45 +1,156 @@
 # src/trading/trading_engine.py
 
-from typing import Optional, Callable
+from typing import Any, Optional, Callable, Deque, Dict
+from collections import deque
 from datetime import datetime
+import math
 import threading
 import time
+import pandas as pd
 from binance.client import Client
 from ..database.crypto_db import CryptoDatabase
+from ..utils.clock import Clock, SystemClock
+from ..utils.latency import LatencyRecorder
+from ..utils.profiling import profiler
+from ..utils.telemetry import InstrumentedClient, MetricsRegistry, latency_collector
+from ..utils.trade_journal import TradeJournal
 from ..utils.logger import Logger
 from .data_fetcher import DataFetcher
-from .strategy import MovingAverageStrategy
+from .strategy import MovingAverageStrategy, TradingStrategy
+from .paper_exchange import PaperExchange
 from .position_manager import PositionManager
+from .position_sizing import PositionSizer
+from .risk_manager import RiskLimits, RiskManager
+from .scheduler import CandleScheduler, ScheduledJob
 
 class TradingEngine:
     """Main trading engine that coordinates all trading operations"""
-    def __init__(self, api_key: str, api_secret: str, db: CryptoDatabase, logger: Logger):
+    def __init__(self, api_key: str, api_secret: str, db: CryptoDatabase, logger: Logger,
+                 client: Optional[Client] = None, interval: str = Client.KLINE_INTERVAL_1HOUR,
+                 clock: Optional[Clock] = None, close_delay: float = 2.0, jitter: float = 0.0,
+                 latency: Optional[LatencyRecorder] = None, registry: Optional[MetricsRegistry] = None,
+                 strategy: Optional[TradingStrategy] = None, data_fetcher: Optional[DataFetcher] = None,
+                 risk: Optional[RiskLimits] = None, sizer: Optional[PositionSizer] = None,
+                 journal: Optional[TradeJournal] = None, mode: Optional[str] = None):
         self.db = db
         self.logger = logger
-        self.client = Client(api_key, api_secret)
-        self.data_fetcher = DataFetcher(self.client)
-        self.position_manager = PositionManager(self.client, self.logger)
-        self.strategy = MovingAverageStrategy()
+        # An injected client (PaperExchange, ReplayClient) avoids connecting to Binance
+        self.client = client if client is not None else Client(api_key, api_secret)
+        # Checkpointed state is kept per mode, so paper runs never resume or overwrite live state
+        self.mode = mode or ('paper' if isinstance(client, PaperExchange) else 'live')
+        # A client already instrumented (BinanceClient with a registry) is not counted twice
+        if registry is not None and not isinstance(self.client, InstrumentedClient):
+            self.client = InstrumentedClient(self.client, registry)
+        self.interval = interval
+        self.clock = clock or SystemClock()
+        self.close_delay = close_delay  # seconds after a candle close before evaluating
+        # Hot path histograms; exported at most every latency_export_interval seconds
+        # when the recorder has an export path, and when the session stops
+        self.latency = latency or LatencyRecorder()
+        self.latency_export_interval = 5.0
+        self._latency_exported = -math.inf
+        # A ResamplingFetcher serves every interval from one 1m feed
+        self.data_fetcher = data_fetcher or DataFetcher(self.client)
+        self.position_manager = PositionManager(
+            self.client, self.logger, self.latency, db=self.db, sizer=sizer, mode=self.mode
+        )
+        # Without a sizer every entry buys the session quantity
+        self.sized = sizer is not None
+        self.risk_manager = RiskManager(self.position_manager, risk, self.logger)
+        self.journal = journal
+        self.strategy = strategy or MovingAverageStrategy()
+        self.scheduler = CandleScheduler(
+            self.data_fetcher, self.clock, close_delay=close_delay, jitter=jitter, logger=self.logger
+        )
         
         self.trading_active = False
         self.current_trading_id = None
         self.trading_thread: Optional[threading.Thread] = None
+        self.symbol: Optional[str] = None
+        self.quantity: Optional[float] = None
+        self.investment_value = 0.0
+        # Orders come from the trading loop and from price ticks (on_price)
+        self._order_lock = threading.RLock()
+        self._stop_event = threading.Event()
+        self._deadline: Optional[float] = None
+        # Latency of the last iterations in seconds, per phase
+        self.iteration_timings: Deque[Dict[str, float]] = deque(maxlen=1000)
+        self.realized_pnl = 0.0
+        self.entry_price: Optional[float] = None
+        self.entry_quantity = 0.0
+        self.metrics = self._create_metrics(registry) if registry is not None else None
+        self._saved_state: Optional[Dict[str, Any]] = None
+        
+    def _create_metrics(self, registry: MetricsRegistry) -> Dict[str, Any]:
+        """Register the engine metrics and expose the latency histograms"""
+        registry.register_collector(latency_collector(self.latency))
+        return {
+            'iteration': registry.histogram("trading_iteration_duration_seconds", "Trading loop iteration duration"),
+            'signals': registry.counter("trading_signals_total", "Strategy signals", ["signal"]),
+            'orders': registry.counter("trading_orders_total", "Orders placed", ["side"]),
+            'open_positions': registry.gauge("trading_open_positions", "Open positions"),
+            'realized_pnl': registry.gauge("trading_realized_pnl", "Realized PnL in quote currency, before fees"),
+            'unrealized_pnl': registry.gauge("trading_unrealized_pnl", "Unrealized PnL of the open position in quote currency"),
+        }
+        
+    def open_session(self, symbol: str, investment_value: float, quantity: float) -> bool:
+        """Register a trading session in the database without starting the loop thread
+        
+        Fails without registering it when the checkpointed state can't be recovered.
+        """
+        self.symbol = symbol
+        try:
+            self._restore_state()
+        except Exception as e:
+            self.logger.log(f"Erro ao recuperar estado: {str(e)}")
+            return False
+            
+        self.current_trading_id = self.db.start_trading_session(
+            crypto_code=symbol,
+            investment_value=investment_value,
+            investment_quantity=quantity
+        )
+        
+        if not self.current_trading_id:
+            self.logger.log("Erro ao iniciar sessão de trading no banco de dados")
+            return False
+            
+        self.quantity = quantity
+        self.investment_value = investment_value
+        self.trading_active = True
+        self._stop_event.clear()
+        return True
+        
+    def _state_key(self) -> str:
+        return f"{self.symbol}:{self.interval}:{type(self.strategy).__name__}"
+        
+    def _restore_state(self) -> None:
+        """Recover the open position and the strategy state checkpointed before a restart"""
+        started = time.perf_counter()
+        if self.position_manager.restore(self.symbol):
+            self.entry_price = self.position_manager.entry_price
+            self.entry_quantity = self.position_manager.position_size
+            if self.entry_price:
+                self.risk_manager.on_entry(self.symbol, self.entry_price, self.entry_quantity)
+        state = self.db.load_strategy_state(self._state_key(), mode=self.mode)
+        if state:
+            self.strategy.set_state(state.get('strategy', {}))
+            self.realized_pnl = state.get('realized_pnl', 0.0)
+        self._saved_state = state
+        self.logger.log(f"Estado recuperado em {(time.perf_counter() - started) * 1000:.0f} ms")
+        
+    def _checkpoint_state(self) -> None:
+        """Store the strategy state and realized PnL when they changed"""
+        state = {'strategy': self.strategy.get_state(), 'realized_pnl': self.realized_pnl}
+        if state != self._saved_state and self.db.save_strategy_state(self._state_key(), state, mode=self.mode):
+            self._saved_state = state
         
     def start_trading_session(self, symbol: str, investment_value: float, quantity: float) -> bool:
         """Start a new trading session"""
         try:
-            # Initialize trading session in database
-            self.current_trading_id = self.db.start_trading_session(
-                codigo_ativo=symbol,
-                value_investido=investment_value,
-                qtde_investida=quantity
-            )
-            
-            if not self.current_trading_id:
-                self.logger.log("Erro ao iniciar sessão de trading no banco de dados")
+            if not self.open_session(symbol, investment_value, quantity):
                 return False
                 
-            self.trading_active = True
             self.trading_thread = threading.Thread(target=self._trading_loop)
             self.trading_thread.daemon = True
             self.trading_thread.start()
@@ -61,45 +172,184 @@ class TradingEngine:
                     self.logger.log("Erro ao finalizar sessão no banco de dados")
                     
             self.trading_active = False
+            self._stop_event.set()
             self.current_trading_id = None
+            if self.journal is not None:
+                self.journal.flush()
+            self.latency.export_json()
             return True
             
         except Exception as e:
             self.logger.log(f"Erro ao parar trading: {str(e)}")
             return False
             
+    def _fetch_timeframes(self) -> Dict[str, pd.DataFrame]:
+        """Candles of the extra intervals read by the strategy"""
+        intervals = self.strategy.timeframes
+        if hasattr(self.data_fetcher, 'get_timeframes'):
+            return self.data_fetcher.get_timeframes(self.symbol, intervals)
+        return {interval: self.data_fetcher.get_market_data(self.symbol, interval) for interval in intervals}
+        
+    @profiler.profiled("engine.iteration")
+    def run_iteration(self, market_data: Optional[pd.DataFrame] = None,
+                      fetch_seconds: float = 0.0) -> Optional[str]:
+        """Update the strategy and act on its signal once, fetching market data if not given"""
+        started = time.perf_counter()
+        timings = {
+            'time': self.clock.now(),
+            # How late the loop woke up compared with its scheduled deadline
+            'lag': self.clock.now() - self._deadline if self._deadline is not None else 0.0
+        }
+        
+        # Get market data
+        if market_data is None:
+            market_data = self.data_fetcher.get_market_data(
+                symbol=self.symbol,
+                interval=self.interval
+            )
+        if self.strategy.timeframes:
+            self.strategy.update_timeframes(self._fetch_timeframes())
+        fetched = time.perf_counter()
+        
+        # Update strategy and get signals
+        with profiler.phase("strategy.update"):
+            self.strategy.update(market_data)
+            signal = self.strategy.get_signal()
+        evaluated = time.perf_counter()
+        
+        # Execute trades based on signals; stops are checked on the closed bar first
+        with self._order_lock:
+            stopped = self._check_stops(market_data)
+            self.risk_manager.on_signal(self.symbol, signal)
+            price = float(market_data["fechamento"].iloc[-1])
+            if signal == "BUY" and not self.position_manager.has_position and not stopped:
+                quantity = self._entry_quantity(price, market_data)
+                if self.risk_manager.allow_entry(
+                    self.symbol, quantity, price, self.investment_value
+                ) and self.position_manager.open_position(
+                    symbol=self.symbol,
+                    quantity=quantity,
+                    price=price
+                ):
+                    self._record_operation("COMPRA", market_data)
+                    self.risk_manager.on_entry(self.symbol, self.entry_price, self.entry_quantity)
+            elif signal == "SELL" and self.position_manager.has_position and not stopped:
+                if self.position_manager.close_position(
+                    symbol=self.symbol
+                ):
+                    self._record_operation("VENDA", market_data)
+                    self.risk_manager.on_exit(self.symbol)
+        finished = time.perf_counter()
+        
+        timings.update({
+            'fetch': fetched - started + fetch_seconds,
+            'signal': evaluated - fetched,
+            'order': finished - evaluated,
+            'total': finished - started + fetch_seconds
+        })
+        self.iteration_timings.append(timings)
+        self.latency.record('fetch', timings['fetch'])
+        self.latency.record('signal', timings['signal'])
+        self.latency.record('iteration', timings['total'])
+        if time.monotonic() - self._latency_exported >= self.latency_export_interval:
+            self.latency.export_json()
+            self._latency_exported = time.monotonic()
+        if self.metrics is not None:
+            self._update_metrics(signal, timings['total'], float(market_data["fechamento"].iloc[-1]))
+        self._checkpoint_state()
+        return signal
+        
+    def _entry_quantity(self, price: float, market_data: pd.DataFrame) -> float:
+        """Session quantity, or the sizer's quantity for the investment plus realized PnL"""
+        if not self.sized:
+            return self.quantity
+        equity = self.investment_value + self.realized_pnl
+        return self.position_manager.calculate_position_size(equity, price, market_data)
+        
+    def _check_stops(self, market_data: pd.DataFrame) -> bool:
+        """Close the position if the last closed bar hit a stop; True when it did"""
+        if self.symbol not in self.risk_manager.positions:
+            return False
+        close = float(market_data["fechamento"].iloc[-1])
+        bar = [float(market_data[name].iloc[-1]) if name in market_data else close
+               for name in ("abertura", "maxima", "minima")]
+        if self.risk_manager.on_bar(self.symbol, *bar) is None:
+            return False
+        self._record_operation("VENDA", market_data)
+        return True
+        
+    def on_price(self, price: float) -> bool:
+        """Check the stops of the open position against a streamed price; True when it was closed
+        
+        Meant to be fed by a ticker stream between candle closes, so stops
+        do not wait for the next iteration.
+        """
+        with self._order_lock:
+            if self.risk_manager.on_price(self.symbol, price) is None:
+                return False
+            self._record_operation("VENDA", fallback_price=price)
+            return True
+        
+    def _update_metrics(self, signal: Optional[str], duration: float, price: float) -> None:
+        """Publish the iteration results to the metrics registry"""
+        self.metrics['iteration'].observe(duration)
+        self.metrics['signals'].labels(signal or "NONE").inc()
+        self.metrics['open_positions'].set(1 if self.position_manager.has_position else 0)
+        self.metrics['realized_pnl'].set(self.realized_pnl)
+        unrealized = (price - self.entry_price) * self.entry_quantity if self.entry_price else 0.0
+        self.metrics['unrealized_pnl'].set(unrealized)
+        
+    def _record_operation(self, operation_type: str, market_data: Optional[pd.DataFrame] = None,
+                          fallback_price: float = 0.0) -> None:
+        """Store an executed order and the delay between candle close and order ack"""
+        if market_data is not None:
+            candle_close = market_data["tempo_fechamento"].iloc[-1].timestamp()
+            self.latency.record('close_to_order', max(0.0, self.clock.now() - candle_close))
+            fallback_price = float(market_data["fechamento"].iloc[-1])
+        
+        # Executed quantity and average price confirmed by the exchange
+        result = self.position_manager.last_result
+        quantity = result.executed_quantity if result is not None else float(self.quantity or 0.0)
+        price = result.average_price if result is not None else None
+        if price is None:
+            price = fallback_price
+            
+        if operation_type == "COMPRA":
+            self.entry_price, self.entry_quantity = price, quantity
+        elif self.entry_price is not None:
+            self.realized_pnl += (price - self.entry_price) * quantity
+            self.entry_price, self.entry_quantity = None, 0.0
+        if self.metrics is not None:
+            self.metrics['orders'].labels("BUY" if operation_type == "COMPRA" else "SELL").inc()
+            
+        if self.current_trading_id:
+            with self.latency.time('db_write'):
+                self.db.add_operation(self.current_trading_id, operation_type, self.symbol, price, quantity)
+        if self.journal is not None:
+            self.journal.append(operation_type, self.symbol, quantity, price, sessao=self.current_trading_id)
+        
+    def _on_candle(self, job: ScheduledJob) -> None:
+        """Scheduler callback run once per closed candle"""
+        self.run_iteration(job.data, job.fetch_seconds)
+        
     def _trading_loop(self):
-        """Main trading loop"""
-        while self.trading_active:
-            try:
-                # Get market data
-                market_data = self.data_fetcher.get_market_data(
-                    symbol=self.position_manager.current_symbol,
-                    interval=Client.KLINE_INTERVAL_1HOUR
-                )
-                
-                # Update strategy and get signals
-                self.strategy.update(market_data)
-                signal = self.strategy.get_signal()
-                
-                # Execute trades based on signals
-                if signal == "BUY" and not self.position_manager.has_position:
-                    self.position_manager.open_position(
-                        symbol=self.position_manager.current_symbol,
-                        quantity=self.position_manager.calculate_position_size()
-                    )
-                elif signal == "SELL" and self.position_manager.has_position:
-                    self.position_manager.close_position(
-                        symbol=self.position_manager.current_symbol
-                    )
-                    
-                # Wait for next iteration
-                for minute in range(5, 0, -1):
-                    if not self.trading_active:
-                        break
-                    self.logger.log(f"Próxima análise em {minute} minutos")
-                    time.sleep(60)
+        """Main trading loop, evaluated just after every candle close"""
+        self.scheduler.add(self.symbol, self.interval, self._on_candle)
+        try:
+            while self.trading_active:
+                try:
+                    self.scheduler.run_pending()
                     
-            except Exception as e:
-                self.logger.log(f"Erro no loop de trading: {str(e)}")
-                time.sleep(60)
\ No newline at end of file
+                    # Wait for next candle close; the deadline is absolute so the
+                    # time spent in the iteration does not accumulate as drift
+                    self._deadline = self.scheduler.next_wakeup()
+                    self.logger.log(
+                        f"Próxima análise às {datetime.fromtimestamp(self._deadline).strftime('%Y-%m-%d %H:%M:%S')}"
+                    )
+                    self.clock.sleep_until(self._deadline, self._stop_event)
+                        
+                except Exception as e:
+                    self.logger.log(f"Erro no loop de trading: {str(e)}")
+                    self.clock.sleep(60, self._stop_event)
+        finally:
+            self.scheduler.remove(self.symbol, self.interval)
@@ -1,6 +1,55 @@
 # src/utils/__init__.py
-from .config import Config
-from .logger import Logger
-from .binance_client import BinanceClient
+from .._lazy import lazy_exports
 
-__all__ = ['Config', 'Logger', 'BinanceClient']
\ No newline at end of file
+_EXPORTS = {
+    'Config': '.config',
+    'Logger': '.logger',
+    'BinanceClient': '.binance_client',
+    'Clock': '.clock',
+    'SimulatedClock': '.clock',
+    'SystemClock': '.clock',
+    'next_candle_close': '.clock',
+    'ExchangeRules': '.exchange_rules',
+    'SymbolRules': '.exchange_rules',
+    'adjust_quantity': '.exchange_rules',
+    'LatencyHistogram': '.latency',
+    'LatencyRecorder': '.latency',
+    'InstrumentedClient': '.telemetry',
+    'MetricsRegistry': '.telemetry',
+    'MetricsServer': '.telemetry',
+    'Profiler': '.profiling',
+    'profiler': '.profiling',
+    'RecordingClient': '.replay',
+    'ReplayClient': '.replay',
+    'record_market_fixture': '.replay',
+    'TradeJournal': '.trade_journal',
+    'read_journal': '.trade_journal'
+}
+
+__all__ = [
+    'Config',
+    'Logger',
+    'BinanceClient',
+    'Clock',
+    'SimulatedClock',
+    'SystemClock',
+    'next_candle_close',
+    'ExchangeRules',
+    'SymbolRules',
+    'adjust_quantity',
+    'LatencyHistogram',
+    'LatencyRecorder',
+    'InstrumentedClient',
+    'MetricsRegistry',
+    'MetricsServer',
+    'Profiler',
+    'profiler',
+    'RecordingClient',
+    'ReplayClient',
+    'record_market_fixture',
+    'TradeJournal',
+    'read_journal'
+]
+
+# Submodules are imported on first access so importing the package stays cheap
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, __all__)
@@ -4,11 +4,17 @@ from binance.client import Client
 from binance.exceptions import BinanceAPIException
 from decimal import Decimal
 import pandas as pd
+from .profiling import profiler
+from .telemetry import InstrumentedClient, MetricsRegistry
 
 class BinanceClient:
     """Wrapper for Binance API client with additional functionality"""
-    def __init__(self, api_key: str, api_secret: str):
-        self.client = Client(api_key, api_secret)
+    def __init__(self, api_key: str, api_secret: str, client: Optional[Client] = None,
+                 registry: Optional[MetricsRegistry] = None):
+        # An injected client (e.g. a ReplayClient) avoids connecting to Binance
+        self.client = client if client is not None else Client(api_key, api_secret)
+        if registry is not None:
+            self.client = InstrumentedClient(self.client, registry)
         
     def get_account_balance(self, asset: Optional[str] = None) -> Dict[str, float]:
         """Get account balance for specific asset or all assets"""
@@ -77,6 +83,7 @@ class BinanceClient:
         except BinanceAPIException as e:
             raise Exception(f"Error placing order: {str(e)}")
             
+    @profiler.profiled("data.load")
     def get_historical_klines(
         self,
         symbol: str,
@@ -0,0 +1,110 @@
+# src/utils/clock.py
+"""
+Clocks used by the trading loops.
+
+SystemClock follows wall time; SimulatedClock only moves when the loop
+sleeps, so a replayed session runs as fast as the work allows (or at a
+chosen multiple of real time). Both wait until absolute deadlines, which
+keeps the loop aligned to candle closes instead of accumulating the time
+spent fetching data and placing orders.
+"""
+import threading
+import time
+from typing import Callable, List, Optional
+
+# Binance kline intervals (Client.KLINE_INTERVAL_*) in seconds
+INTERVAL_SECONDS = {
+    '1s': 1,
+    '1m': 60,
+    '3m': 3 * 60,
+    '5m': 5 * 60,
+    '15m': 15 * 60,
+    '30m': 30 * 60,
+    '1h': 60 * 60,
+    '2h': 2 * 60 * 60,
+    '4h': 4 * 60 * 60,
+    '6h': 6 * 60 * 60,
+    '8h': 8 * 60 * 60,
+    '12h': 12 * 60 * 60,
+    '1d': 24 * 60 * 60,
+    '3d': 3 * 24 * 60 * 60,
+    '1w': 7 * 24 * 60 * 60,
+    '1M': 30 * 24 * 60 * 60,
+}
+
+def next_candle_close(now: float, interval: str, delay: float = 0.0) -> float:
+    """Epoch time of the next close of an ``interval`` candle, plus ``delay`` seconds
+
+    Candles are aligned to the Unix epoch like Binance klines (weekly candles
+    open on Monday, monthly ones are approximated by 30 days).
+    """
+    if interval not in INTERVAL_SECONDS:
+        raise ValueError(f"Unknown kline interval: {interval}")
+    length = INTERVAL_SECONDS[interval]
+    origin = 4 * 24 * 60 * 60 if interval == '1w' else 0  # 1970-01-05 was a Monday
+    boundary = ((now - delay - origin) // length + 1) * length + origin
+    return boundary + delay
+
+class Clock:
+    """Source of time for the trading loop"""
+    def now(self) -> float:
+        """Current epoch time in seconds"""
+        raise NotImplementedError
+
+    def sleep(self, seconds: float, stop: Optional[threading.Event] = None) -> bool:
+        """Wait ``seconds``; returns False if ``stop`` was set meanwhile"""
+        raise NotImplementedError
+
+    def sleep_until(self, deadline: float, stop: Optional[threading.Event] = None) -> bool:
+        """Wait until the epoch time ``deadline``; returns False if interrupted"""
+        return self.sleep(max(0.0, deadline - self.now()), stop)
+
+class SystemClock(Clock):
+    """Wall clock"""
+    def now(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float, stop: Optional[threading.Event] = None) -> bool:
+        if stop is None:
+            time.sleep(seconds)
+            return True
+        return not stop.wait(seconds)
+
+class SimulatedClock(Clock):
+    """Virtual clock advanced by sleeps
+
+    With ``speed=0`` sleeping is instantaneous; otherwise the thread really
+    sleeps ``seconds / speed``. Callbacks registered with ``subscribe`` get the
+    new time after every advance (e.g. to move a PaperExchange forward).
+    """
+    def __init__(self, start: float = 0.0, speed: float = 0.0):
+        self._now = float(start)
+        self.speed = speed
+        self._listeners: List[Callable[[float], None]] = []
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        return self._now
+
+    def subscribe(self, callback: Callable[[float], None]) -> None:
+        """Call ``callback(now)`` whenever the clock advances"""
+        self._listeners.append(callback)
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward without waiting"""
+        with self._lock:
+            self._now += max(0.0, seconds)
+        for callback in self._listeners:
+            callback(self._now)
+
+    def sleep(self, seconds: float, stop: Optional[threading.Event] = None) -> bool:
+        if stop is not None and stop.is_set():
+            return False
+        if self.speed > 0:
+            real = seconds / self.speed
+            if stop is not None and stop.wait(real):
+                return False
+            if stop is None:
+                time.sleep(real)
+        self.advance(seconds)
+        return stop is None or not stop.is_set()
@@ -17,6 +17,14 @@ class DatabaseConfig:
     """Database configuration parameters"""
     db_name: str = "crypto.db"
     log_file: str = "trading_log.csv"
+    journal_file: str = "trading_journal.arrow"
+
+@dataclass
+class MetricsConfig:
+    """Metrics exporter configuration parameters"""
+    host: str = "127.0.0.1"
+    port: int = 0  # 0 disables the HTTP endpoint
+    latency_file: str = ""
 
 class Config:
     """Central configuration management"""
@@ -24,6 +32,11 @@ class Config:
         self.load_environment()
         self.trading = TradingConfig()
         self.database = DatabaseConfig()
+        self.metrics = MetricsConfig(
+            host=os.getenv("METRICS_HOST", "127.0.0.1"),
+            port=int(os.getenv("METRICS_PORT", "0")),
+            latency_file=os.getenv("LATENCY_FILE", "")
+        )
         
     def load_environment(self) -> None:
         """Load environment variables"""
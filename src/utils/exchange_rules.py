@@ -0,0 +1,156 @@
+# src/utils/exchange_rules.py
+"""
+Exact rounding of order quantities and prices to exchange filters.
+
+Binance publishes step sizes, tick sizes and minimum notionals as decimal
+strings. SymbolRules parses them once with Decimal into a power of ten
+``scale`` and an integer step in units of ``1 / scale``. Rounding is then
+a multiplication by the scale, a floor division by the integer step and a
+division back, so a step of ``1e-05`` or ``0.1`` rounds exactly where
+float modulo does not. The same code runs on scalars and NumPy arrays,
+for order placement and for backtest sweeps.
+
+Binary floats carry small representation errors (0.29 * 100 is
+28.999999999999996), so a value within ``1e-9`` steps (or a few ulps)
+below a multiple of the step counts as on it.
+"""
+import math
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Union
+import numpy as np
+
+Number = Union[float, np.ndarray]
+
+# Fraction of a step, plus a few ulps of the value in steps, absorbing the
+# float error of quantity * scale / units
+_TOLERANCE = 1e-9
+_RELATIVE_ERROR = 1e-15
+
+def _scaling(increment: Union[str, float, Decimal]) -> Tuple[int, int]:
+    """(scale, units): ``increment == units / scale`` with scale a power of ten"""
+    value = Decimal(str(increment)).normalize()
+    if value <= 0:
+        raise ValueError(f"Increment must be positive: {increment}")
+    decimals = max(0, -value.as_tuple().exponent)
+    scale = 10 ** decimals
+    return scale, int(value * scale)
+
+@lru_cache(maxsize=256)
+def _cached_scaling(increment: Union[str, float]) -> Tuple[int, int]:
+    return _scaling(increment)
+
+def _steps(values: Number, scale: int, units: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Values in steps and the float error margin around them"""
+    steps = np.asarray(values, dtype=np.float64) * scale / units
+    return steps, _TOLERANCE + np.abs(steps) * _RELATIVE_ERROR
+
+def _floor_to(values: Number, scale: int, units: int) -> Number:
+    if isinstance(values, (float, int)):
+        # Plain float arithmetic is several times faster than NumPy on scalars
+        steps = values * scale / units
+        return math.floor(steps + _TOLERANCE + abs(steps) * _RELATIVE_ERROR) * units / scale
+    steps, margin = _steps(values, scale, units)
+    # steps * units is an exact integer, so the division gives the nearest float
+    result = np.floor(steps + margin) * units / scale
+    return float(result) if np.ndim(result) == 0 else result
+
+def _ceil_to(values: Number, scale: int, units: int) -> Number:
+    if isinstance(values, (float, int)):
+        steps = values * scale / units
+        return math.ceil(steps - _TOLERANCE - abs(steps) * _RELATIVE_ERROR) * units / scale
+    steps, margin = _steps(values, scale, units)
+    result = np.ceil(steps - margin) * units / scale
+    return float(result) if np.ndim(result) == 0 else result
+
+def adjust_quantity(quantity: Number, step_size: Union[str, float]) -> Number:
+    """Round a quantity (or an array of them) down to a multiple of ``step_size``"""
+    return _floor_to(quantity, *_cached_scaling(step_size))
+
+class SymbolRules:
+    """LOT_SIZE, PRICE_FILTER and MIN_NOTIONAL filters of one symbol"""
+    def __init__(self, step_size: Union[str, float] = "0.00000001", tick_size: Union[str, float] = "0.00000001",
+                 min_qty: float = 0.0, max_qty: float = math.inf, min_notional: float = 0.0,
+                 symbol: Optional[str] = None):
+        self.symbol = symbol
+        self.step_size = float(step_size)
+        self.tick_size = float(tick_size)
+        self.min_qty = float(min_qty)
+        self.max_qty = float(max_qty)
+        self.min_notional = float(min_notional)
+        self.quantity_scale, self.step_units = _scaling(step_size)
+        self.price_scale, self.tick_units = _scaling(tick_size)
+        self.quantity_decimals = len(str(self.quantity_scale)) - 1
+        self.price_decimals = len(str(self.price_scale)) - 1
+
+    @classmethod
+    def from_symbol_info(cls, info: Dict[str, Any]) -> 'SymbolRules':
+        """Rules from a Client.get_symbol_info response (or a get_exchange_info symbol)"""
+        filters = {item['filterType']: item for item in info.get('filters', [])}
+        lot = filters.get('LOT_SIZE', {})
+        price = filters.get('PRICE_FILTER', {})
+        # Newer symbols publish NOTIONAL instead of MIN_NOTIONAL
+        notional = filters.get('MIN_NOTIONAL') or filters.get('NOTIONAL') or {}
+        tick_size = price.get('tickSize', "0.00000001")
+        return cls(
+            step_size=lot.get('stepSize', "0.00000001"),
+            tick_size=tick_size if float(tick_size) > 0 else "0.00000001",
+            min_qty=float(lot.get('minQty', 0.0)),
+            max_qty=float(lot.get('maxQty') or math.inf),
+            min_notional=float(notional.get('minNotional', 0.0)),
+            symbol=info.get('symbol')
+        )
+
+    def round_quantity(self, quantity: Number) -> Number:
+        """Quantity rounded down to the step size"""
+        return _floor_to(quantity, self.quantity_scale, self.step_units)
+
+    def round_price(self, price: Number, up: bool = False) -> Number:
+        """Price rounded to the tick size, down (buys) or ``up`` (sells)"""
+        if up:
+            return _ceil_to(price, self.price_scale, self.tick_units)
+        return _floor_to(price, self.price_scale, self.tick_units)
+
+    def format_quantity(self, quantity: float) -> str:
+        """Rounded quantity as the decimal string sent to the API"""
+        return f"{self.round_quantity(quantity):.{self.quantity_decimals}f}"
+
+    def format_price(self, price: float, up: bool = False) -> str:
+        return f"{self.round_price(price, up):.{self.price_decimals}f}"
+
+    def valid(self, quantity: Number, price: Number) -> Union[bool, np.ndarray]:
+        """Whether already rounded quantities pass the quantity limits and minimum notional"""
+        quantity = np.asarray(quantity, dtype=np.float64)
+        ok = (quantity >= self.min_qty) & (quantity <= self.max_qty) & (quantity > 0)
+        ok &= quantity * np.asarray(price, dtype=np.float64) >= self.min_notional
+        return bool(ok) if np.ndim(ok) == 0 else ok
+
+    def max_buy_quantity(self, cash: Number, price: Number, fee_rate: float = 0.0) -> Number:
+        """Largest valid quantity whose cost plus fee fits in ``cash``; 0 where none does"""
+        quantity = self.round_quantity(np.asarray(cash, dtype=np.float64) / (np.asarray(price) * (1 + fee_rate)))
+        quantity = np.minimum(quantity, self.max_qty)
+        quantity = np.where(self.valid(quantity, price), quantity, 0.0)
+        return float(quantity) if np.ndim(quantity) == 0 else quantity
+
+class ExchangeRules:
+    """SymbolRules per symbol, fetched once from the client"""
+    def __init__(self, client: Any = None):
+        self.client = client
+        self.symbols: Dict[str, SymbolRules] = {}
+
+    def load_exchange_info(self, exchange_info: Optional[Dict[str, Any]] = None) -> int:
+        """Parse every symbol of a get_exchange_info response in one call; returns the count"""
+        if exchange_info is None:
+            exchange_info = self.client.get_exchange_info()
+        for info in exchange_info.get('symbols', []):
+            self.symbols[info['symbol']] = SymbolRules.from_symbol_info(info)
+        return len(exchange_info.get('symbols', []))
+
+    def get(self, symbol: str) -> SymbolRules:
+        rules = self.symbols.get(symbol)
+        if rules is None:
+            info = self.client.get_symbol_info(symbol) if self.client is not None else None
+            if not info:
+                raise ValueError(f"Unknown symbol: {symbol}")
+            rules = self.symbols[symbol] = SymbolRules.from_symbol_info(info)
+        return rules
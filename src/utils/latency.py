@@ -0,0 +1,115 @@
+# src/utils/latency.py
+"""
+Latency histograms for the trading hot path.
+
+Each histogram counts samples in fixed, geometrically spaced buckets (10%
+apart, from 1 microsecond to 1000 seconds), so recording is a bisect plus an
+increment and memory does not grow with the number of samples. Percentiles
+are read from the cumulative counts and are accurate to one bucket width.
+"""
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+_MIN_LATENCY = 1e-6
+_GROWTH = 1.1
+BUCKET_BOUNDS: List[float] = [
+    _MIN_LATENCY * _GROWTH ** i
+    for i in range(int(math.log(1e3 / _MIN_LATENCY) / math.log(_GROWTH)) + 2)
+]
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in seconds"""
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one sample"""
+        self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (0-100)"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                bound = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.max
+                return min(max(bound, self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, extremes and p50/p95/p99 in seconds"""
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+        }
+
+class LatencyRecorder:
+    """Named latency histograms shared by the trading components"""
+    def __init__(self, export_path: Optional[str] = None):
+        self.export_path = export_path
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add a sample to the histogram ``name``"""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.record(seconds)
+
+    @contextmanager
+    def time(self, name: str) -> Iterator[None]:
+        """Record the duration of the block, measured with a monotonic timer"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def histogram(self, name: str) -> Optional[LatencyHistogram]:
+        return self._histograms.get(name)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Summary of every histogram"""
+        with self._lock:
+            return {name: histogram.summary() for name, histogram in sorted(self._histograms.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def export_json(self, path: Optional[str] = None) -> Optional[str]:
+        """Write the snapshot to a JSON file, replacing it atomically"""
+        path = path or self.export_path
+        if not path:
+            return None
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump({'updated': time.time(), 'latency': self.snapshot()}, f, indent=2)
+        os.replace(temporary, path)
+        return path
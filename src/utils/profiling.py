@@ -0,0 +1,243 @@
+# src/utils/profiling.py
+"""
+Profiling mode for backtests and the live loop.
+
+Code marks its phases with ``profiler.phase("name")`` or the
+``profiler.profiled("name")`` decorator; while the profiler is disabled they
+reduce to an attribute check, so instrumented hot loops pay almost nothing.
+When enabled:
+
+- every phase records its call count and wall time;
+- the outermost phase of each thread runs under cProfile (one ``.prof`` file
+  per phase, readable with pstats or snakeviz);
+- a sampling thread captures the stacks of threads inside a phase and writes
+  them as folded stacks (``profile.folded``) rooted at the phase path, ready
+  for flamegraph.pl or speedscope.
+
+The module-level ``profiler`` can be switched on and off at runtime, from
+code or with a signal (``install_signal_toggle``); disabling writes the
+collected profiles to the output directory.
+"""
+import cProfile
+import contextlib
+import functools
+import io
+import os
+import pstats
+import signal
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+_NULL_PHASE = contextlib.nullcontext()
+
+class _Phase:
+    """Context manager timing one phase"""
+    __slots__ = ('profiler', 'name', 'started', 'profile')
+
+    def __init__(self, profiler: 'Profiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> '_Phase':
+        self.profile = self.profiler._enter(self.name)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        elapsed = time.perf_counter() - self.started
+        self.profiler._exit(self.name, elapsed, self.profile)
+
+class Profiler:
+    """Per-phase cProfile and sampling profiler, toggleable at runtime"""
+    def __init__(self, output_dir: str = "profiles", sample_interval: float = 0.005,
+                 use_cprofile: bool = True):
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self.use_cprofile = use_cprofile
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._stacks: Dict[int, List[str]] = {}
+        self._profiles: Dict[Tuple[str, int], cProfile.Profile] = {}
+        self._timings: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+        self._samples: Counter = Counter()
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_sampler = threading.Event()
+        self._toggle_requested = threading.Event()
+        self._toggler: Optional[threading.Thread] = None
+
+    # Instrumentation
+
+    def phase(self, name: str):
+        """Context manager marking a profiled phase"""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def profiled(self, name: str) -> Callable:
+        """Decorator running the whole function as a phase"""
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Phase(self, name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _enter(self, name: str) -> Optional[cProfile.Profile]:
+        ident = threading.get_ident()
+        stack = self._stacks.setdefault(ident, [])
+        stack.append(name)
+        if len(stack) > 1 or not self.use_cprofile or sys.getprofile() is not None:
+            return None
+        with self._lock:
+            profile = self._profiles.get((name, ident))
+            if profile is None:
+                profile = self._profiles[(name, ident)] = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def _exit(self, name: str, elapsed: float, profile: Optional[cProfile.Profile]) -> None:
+        if profile is not None:
+            profile.disable()
+        stack = self._stacks.get(threading.get_ident())
+        if stack:
+            stack.pop()
+        with self._lock:
+            timing = self._timings[name]
+            timing[0] += 1
+            timing[1] += elapsed
+
+    # Control
+
+    def enable(self, output_dir: Optional[str] = None) -> None:
+        """Start profiling new phases"""
+        if output_dir:
+            self.output_dir = output_dir
+        if self.enabled:
+            return
+        self.enabled = True
+        if self.sample_interval > 0:
+            self._stop_sampler.clear()
+            self._sampler = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+            self._sampler.start()
+
+    def disable(self, write: bool = True) -> Optional[str]:
+        """Stop profiling and, by default, write what was collected"""
+        if not self.enabled:
+            return None
+        self.enabled = False
+        self._stop_sampler.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+        return self.write() if write else None
+
+    def toggle(self) -> bool:
+        """Switch profiling on or off; returns the new state"""
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+        return self.enabled
+
+    def install_signal_toggle(self, signum: Optional[int] = None) -> bool:
+        """Toggle profiling when the process receives ``signum`` (SIGUSR1 by default)
+
+        The handler only sets an event: joining the sampler and writing the
+        profiles happen on a separate thread, never inside the interrupted code.
+        """
+        signum = signum if signum is not None else getattr(signal, 'SIGUSR1', None)
+        if signum is None or threading.current_thread() is not threading.main_thread():
+            return False
+        if self._toggler is None:
+            self._toggler = threading.Thread(target=self._toggle_loop, name="profiler-toggle", daemon=True)
+            self._toggler.start()
+        signal.signal(signum, lambda *args: self._toggle_requested.set())
+        return True
+
+    def _toggle_loop(self) -> None:
+        while True:
+            self._toggle_requested.wait()
+            self._toggle_requested.clear()
+            self.toggle()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+            self._timings.clear()
+            self._samples.clear()
+
+    # Sampling
+
+    def _sample_loop(self) -> None:
+        own = threading.get_ident()
+        while not self._stop_sampler.wait(self.sample_interval):
+            frames = sys._current_frames()
+            for ident, stack in list(self._stacks.items()):
+                if ident == own or not stack or ident not in frames:
+                    continue
+                self._samples[self._fold(stack, frames[ident])] += 1
+
+    @staticmethod
+    def _fold(phases: List[str], frame) -> str:
+        """Folded stack of a frame, rooted at the active phases"""
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        names.reverse()
+        return ";".join(name.replace(";", ",") for name in list(phases) + names)
+
+    # Output
+
+    def timings(self) -> Dict[str, Dict[str, float]]:
+        """Calls and wall time of every phase"""
+        with self._lock:
+            return {name: {'calls': calls, 'seconds': seconds}
+                    for name, (calls, seconds) in sorted(self._timings.items())}
+
+    def folded(self) -> str:
+        """Sampled stacks in the folded format ("frame;frame count" per line)"""
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self._samples.items()))
+
+    def write(self, output_dir: Optional[str] = None) -> str:
+        """Write .prof files, folded stacks and a text summary, then reset"""
+        output_dir = output_dir or self.output_dir
+        os.makedirs(output_dir, exist_ok=True)
+
+        with self._lock:
+            profiles = dict(self._profiles)
+        merged: Dict[str, pstats.Stats] = {}
+        for (name, _), profile in profiles.items():
+            if name in merged:
+                merged[name].add(profile)
+            else:
+                merged[name] = pstats.Stats(profile)
+
+        summary = io.StringIO()
+        summary.write("phase                              calls      seconds\n")
+        for name, timing in self.timings().items():
+            summary.write(f"{name:<30} {timing['calls']:>9} {timing['seconds']:>12.4f}\n")
+        for name, stats in merged.items():
+            filename = name.replace("/", "_").replace(" ", "_")
+            stats.dump_stats(os.path.join(output_dir, f"{filename}.prof"))
+            summary.write(f"\n=== {name} ===\n")
+            stats.stream = summary
+            stats.sort_stats("cumulative").print_stats(25)
+
+        with open(os.path.join(output_dir, "profile.folded"), "w") as f:
+            f.write(self.folded())
+        with open(os.path.join(output_dir, "summary.txt"), "w") as f:
+            f.write(summary.getvalue())
+
+        self.reset()
+        return output_dir
+
+# Shared profiler used by the instrumented phases
+profiler = Profiler()
@@ -0,0 +1,157 @@
+# src/utils/replay.py
+"""
+Record/replay layer for Binance clients.
+
+RecordingClient wraps a live client (binance.client.Client or anything with
+the same methods) and stores every call with its response and latency in a
+gzip-compressed JSON-lines fixture. ReplayClient serves those responses back
+deterministically, optionally sleeping the recorded (or a fixed) latency, so
+BinanceClient, DataFetcher and PositionManager can run without a network.
+"""
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+from binance.client import Client
+
+class ReplayMissError(KeyError):
+    """Raised when a replayed call was never recorded"""
+    pass
+
+class ReplayedError(Exception):
+    """Exception recorded from the live client and raised again on replay"""
+    def __init__(self, error_type: str, message: str):
+        super().__init__(f"{error_type}: {message}")
+        self.error_type = error_type
+
+def _call_key(method: str, args: Iterable, kwargs: Dict[str, Any]) -> str:
+    """Canonical key of a call"""
+    return json.dumps([method, list(args), kwargs], sort_keys=True, default=str)
+
+class RecordingClient:
+    """Proxy that records every method call of the wrapped client"""
+    def __init__(self, client: Any, fixture_path: str):
+        self._client = client
+        self._fixture_path = fixture_path
+        self._records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._client, name)
+        if not callable(attribute) or name.startswith('_'):
+            return attribute
+
+        def recorded(*args, **kwargs):
+            record = {'method': name, 'args': list(args), 'kwargs': kwargs}
+            start = time.perf_counter()
+            try:
+                response = attribute(*args, **kwargs)
+                record['response'] = response
+                return response
+            except Exception as e:
+                record['error'] = {'type': type(e).__name__, 'message': str(e)}
+                raise
+            finally:
+                record['latency'] = time.perf_counter() - start
+                with self._lock:
+                    self._records.append(record)
+
+        return recorded
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        """Calls recorded so far"""
+        return list(self._records)
+
+    def save(self) -> str:
+        """Write the recorded calls to the compressed fixture file"""
+        with self._lock, gzip.open(self._fixture_path, 'wt', encoding='utf-8') as f:
+            for record in self._records:
+                f.write(json.dumps(record, default=str) + '\n')
+        return self._fixture_path
+
+    def __enter__(self) -> 'RecordingClient':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.save()
+
+class ReplayClient:
+    """Client that answers calls from a recorded fixture
+
+    Repeated identical calls are answered in recording order; once a call's
+    responses are exhausted the last one is repeated (``loop=True``) or a
+    ReplayMissError is raised. ``latency`` overrides the recorded latency and
+    ``speed`` divides it (speed=10 replays ten times faster). Constants such as
+    SIDE_BUY or KLINE_INTERVAL_1HOUR come from binance.client.Client.
+    """
+    def __init__(self, fixture_path: str, latency: Optional[float] = None,
+                 speed: float = 1.0, loop: bool = True,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.fixture_path = fixture_path
+        self.latency = latency
+        self.speed = speed
+        self.loop = loop
+        self.calls = 0
+        self._sleep = sleep
+        self._responses: Dict[str, Deque[Tuple[Dict[str, Any], float]]] = defaultdict(deque)
+        self._last: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """Read the fixture into per-call queues"""
+        with gzip.open(self.fixture_path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                key = _call_key(record['method'], record['args'], record['kwargs'])
+                self._responses[key].append((record, record.get('latency', 0.0)))
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if name.isupper():
+            return getattr(Client, name)
+
+        def replayed(*args, **kwargs):
+            return self._replay(name, args, kwargs)
+
+        return replayed
+
+    def _replay(self, method: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
+        """Return (or raise) the recorded outcome of a call"""
+        key = _call_key(method, args, kwargs)
+        with self._lock:
+            queue = self._responses.get(key)
+            if queue:
+                entry = queue.popleft()
+                self._last[key] = entry
+            elif self.loop and key in self._last:
+                entry = self._last[key]
+            else:
+                raise ReplayMissError(f"No recorded response for {method}(*{args}, **{kwargs})")
+            self.calls += 1
+
+        record, recorded_latency = entry
+        delay = self.latency if self.latency is not None else recorded_latency
+        if delay and self.speed > 0:
+            self._sleep(delay / self.speed)
+
+        if 'error' in record:
+            raise ReplayedError(record['error']['type'], record['error']['message'])
+        return record['response']
+
+def record_market_fixture(client: Any, fixture_path: str, symbols: Iterable[str],
+                          interval: str = Client.KLINE_INTERVAL_1HOUR, limit: int = 1000) -> str:
+    """Capture the market data calls used by the trading loop into a fixture"""
+    with RecordingClient(client, fixture_path) as recorder:
+        for symbol in symbols:
+            recorder.get_klines(symbol=symbol, interval=interval, limit=limit)
+            recorder.get_symbol_info(symbol)
+            recorder.get_symbol_ticker(symbol=symbol)
+        recorder.get_account()
+    return fixture_path
@@ -0,0 +1,318 @@
+# src/utils/telemetry.py
+"""
+Prometheus-style metrics for the bot.
+
+Counters, gauges and histograms live in a MetricsRegistry and are rendered
+in the Prometheus text exposition format (version 0.0.4) by MetricsServer,
+a small HTTP server running on its own daemon thread. Updating a metric
+only takes a per-metric lock and a float addition, so the trading thread
+never waits on the exporter. Components are only instrumented when a
+registry is passed to them.
+"""
+import math
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+class _Metric:
+    """Base of every metric type; children hold one value per label set"""
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str, **kwargs: str) -> Any:
+        """Child metric for a set of label values"""
+        if kwargs:
+            values = tuple(str(kwargs[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(value) for value in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _default(self) -> Any:
+        if self.labelnames:
+            raise ValueError(f"{self.name} has labels; use .labels(...)")
+        return self.labels()
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        """(suffix, labels, value) of every series"""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+class Counter(_Metric):
+    """Monotonically increasing value"""
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self._default().inc(amount)
+
+    def samples(self):
+        for values, child in list(self._children.items()):
+            yield "", dict(zip(self.labelnames, values)), child.value
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+    kind = "gauge"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default().dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+    def samples(self):
+        for values, child in list(self._children.items()):
+            yield "", dict(zip(self.labelnames, values)), child.value
+
+class _HistogramValue:
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def time(self) -> '_Timer':
+        return _Timer(self.observe)
+
+class _Timer:
+    """Context manager observing the block duration"""
+    def __init__(self, observe: Callable[[float], None]):
+        self._observe = observe
+
+    def __enter__(self) -> '_Timer':
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._observe(time.perf_counter() - self._start)
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets"""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def time(self) -> _Timer:
+        return self._default().time()
+
+    def samples(self):
+        for values, child in list(self._children.items()):
+            labels = dict(zip(self.labelnames, values))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), child.counts):
+                cumulative += count
+                yield "_bucket", {**labels, 'le': _format_value(bound)}, cumulative
+            yield "_count", labels, cumulative
+            yield "_sum", labels, child.sum
+
+class MetricsRegistry:
+    """Collection of metrics rendered together"""
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], List[str]]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered with another type or labels")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def register_collector(self, collector: Callable[[], List[str]]) -> None:
+        """Add a callable returning exposition lines computed at scrape time"""
+        self._collectors.append(collector)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format"""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        for collector in list(self._collectors):
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+def latency_collector(recorder: Any, name: str = "trading_latency_seconds") -> Callable[[], List[str]]:
+    """Expose a LatencyRecorder as a Prometheus summary with p50/p95/p99 quantiles"""
+    def collect() -> List[str]:
+        lines = [f"# HELP {name} Trading hot path latency by phase",
+                 f"# TYPE {name} summary"]
+        for phase, summary in recorder.snapshot().items():
+            for quantile in ("p50", "p95", "p99"):
+                labels = _format_labels({'phase': phase, 'quantile': f"0.{quantile[1:]}"})
+                lines.append(f"{name}{labels} {_format_value(summary[quantile])}")
+            labels = _format_labels({'phase': phase})
+            lines.append(f"{name}_count{labels} {summary['count']}")
+            lines.append(f"{name}_sum{labels} {_format_value(summary['mean'] * summary['count'])}")
+        return lines
+    return collect
+
+class InstrumentedClient:
+    """Proxy counting calls, errors, latency and request weight of a Binance client"""
+    def __init__(self, client: Any, registry: MetricsRegistry):
+        self._client = client
+        self._calls = registry.counter("binance_api_calls_total", "Binance API calls", ["endpoint"])
+        self._errors = registry.counter("binance_api_errors_total", "Failed Binance API calls", ["endpoint"])
+        self._latency = registry.histogram("binance_api_latency_seconds", "Binance API call latency",
+                                           ["endpoint"])
+        self._weight = registry.gauge("binance_used_weight_1m", "Request weight used in the current minute")
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._client, name)
+        if not callable(attribute) or name.startswith('_') or name.isupper():
+            return attribute
+        calls = self._calls.labels(name)
+        errors = self._errors.labels(name)
+        latency = self._latency.labels(name)
+
+        def instrumented(*args, **kwargs):
+            calls.inc()
+            started = time.perf_counter()
+            try:
+                return attribute(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                latency.observe(time.perf_counter() - started)
+                # python-binance keeps the last HTTP response on the client
+                response = getattr(self._client, 'response', None)
+                headers = getattr(response, 'headers', None)
+                if headers and headers.get('x-mbx-used-weight-1m') is not None:
+                    self._weight.set(float(headers['x-mbx-used-weight-1m']))
+
+        return instrumented
+
+class MetricsServer:
+    """HTTP endpoint serving a registry on /metrics from a daemon thread"""
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9108):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> int:
+        """Start serving and return the bound port (useful with port=0)"""
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.port
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
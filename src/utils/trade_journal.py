@@ -0,0 +1,224 @@
+# src/utils/trade_journal.py
+"""
+Append-only trade journal in a compressed columnar file.
+
+TradeJournal keeps executed trades in memory and writes them in batches,
+when ``flush_rows`` trades are pending, when the oldest pending trade is
+``flush_interval`` seconds old (a timer thread writes it even if no other
+trade follows), or on ``flush``/``close``. Each flush
+appends one complete Arrow IPC stream (schema, zstd-compressed record
+batch, end marker) to the file, so the file is never rewritten, a crash
+loses at most the pending trades, and no footer has to be patched.
+Opening a journal truncates a flush torn by a crash (an incomplete last
+stream or CSV line), so the trades appended afterwards stay readable.
+
+``read_journal`` memory-maps the file and reads every stream back into a
+single table, optionally filtered by period and symbol, which takes
+milliseconds for months of trades.
+
+pyarrow is optional. A path ending in ``.csv`` selects the plain CSV
+format of the former ``trading_log.csv``, written with the same buffered
+flushes; that is also the only format available without pyarrow.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc as ipc
+    ARROW_AVAILABLE = True
+except ImportError:  # pyarrow is optional
+    pa = pc = ipc = None
+    ARROW_AVAILABLE = False
+
+COLUMNS = ('timestamp', 'tipo', 'par', 'quantidade', 'preco', 'total', 'sessao')
+
+def _schema():
+    return pa.schema([
+        ('timestamp', pa.timestamp('ms', tz='UTC')),
+        ('tipo', pa.string()),
+        ('par', pa.string()),
+        ('quantidade', pa.float64()),
+        ('preco', pa.float64()),
+        ('total', pa.float64()),
+        ('sessao', pa.int64()),
+    ])
+
+def _is_csv(path: str) -> bool:
+    return path.lower().endswith('.csv')
+
+class TradeJournal:
+    """Buffered writer of executed trades"""
+    def __init__(self, path: str, flush_rows: int = 100, flush_interval: float = 60.0,
+                 compression: Optional[str] = 'zstd'):
+        self.path = path
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.compression = compression
+        self.csv = _is_csv(path)
+        if not self.csv and not ARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for Arrow trade journals; use a .csv path without it")
+        self._rows: List[Dict[str, Any]] = []
+        self._first_pending: Optional[float] = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            _repair(path, self.csv)
+
+    def __enter__(self) -> 'TradeJournal':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def append(self, tipo: str, par: str, quantidade: float, preco: float,
+               sessao: Optional[int] = None, timestamp: Optional[datetime] = None) -> None:
+        """Queue one trade, writing the pending ones when a flush threshold is reached"""
+        row = {
+            'timestamp': _utc(timestamp).to_pydatetime() if timestamp is not None else datetime.now(timezone.utc),
+            'tipo': tipo,
+            'par': par,
+            'quantidade': float(quantidade),
+            'preco': float(preco),
+            'total': float(quantidade) * float(preco),
+            'sessao': sessao,
+        }
+        with self._lock:
+            self._rows.append(row)
+            if self._first_pending is None:
+                self._first_pending = time.monotonic()
+                if self.flush_interval and self.flush_interval > 0:
+                    self._timer = threading.Timer(self.flush_interval, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+            due = (len(self._rows) >= self.flush_rows
+                   or time.monotonic() - self._first_pending >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write the pending trades; returns how many were written"""
+        with self._lock:
+            rows, self._rows, self._first_pending = self._rows, [], None
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if rows:
+                if self.csv:
+                    self._write_csv(rows)
+                else:
+                    self._write_arrow(rows)
+        return len(rows)
+
+    def close(self) -> None:
+        self.flush()
+
+    def _write_arrow(self, rows: List[Dict[str, Any]]) -> None:
+        schema = _schema()
+        batch = pa.RecordBatch.from_pylist(rows, schema=schema)
+        options = ipc.IpcWriteOptions(compression=self.compression)
+        with open(self.path, 'ab') as sink:
+            with ipc.new_stream(sink, schema, options=options) as writer:
+                writer.write_batch(batch)
+
+    def _write_csv(self, rows: List[Dict[str, Any]]) -> None:
+        columns = list(COLUMNS)
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        if not new_file:
+            # Files started by the old logger have no session column
+            with open(self.path) as source:
+                columns = source.readline().strip().split(',')
+        with open(self.path, 'a') as sink:
+            if new_file:
+                sink.write(','.join(columns) + '\n')
+            for row in rows:
+                values = {
+                    'timestamp': row['timestamp'].astimezone().strftime("%Y-%m-%d %H:%M:%S"),
+                    'tipo': row['tipo'],
+                    'par': row['par'],
+                    'quantidade': f"{row['quantidade']:.8f}",
+                    'preco': f"{row['preco']:.8f}",
+                    'total': f"{row['total']:.8f}",
+                    'sessao': '' if row['sessao'] is None else str(row['sessao']),
+                }
+                sink.write(','.join(values.get(column, '') for column in columns) + '\n')
+
+def _utc(value: datetime) -> pd.Timestamp:
+    """Aware UTC timestamp; naive values are taken as UTC"""
+    value = pd.Timestamp(value)
+    return value.tz_localize('UTC') if value.tz is None else value.tz_convert('UTC')
+
+def _local(value: datetime) -> pd.Timestamp:
+    """Naive local timestamp, as written in CSV journals"""
+    value = pd.Timestamp(value)
+    return value if value.tz is None else value.tz_convert(datetime.now().astimezone().tzinfo).tz_localize(None)
+
+def _valid_length(path: str, csv: bool) -> int:
+    """Bytes of ``path`` up to the end of the last complete stream (or CSV line)"""
+    if csv:
+        with open(path, 'rb') as source:
+            data = source.read()
+        return data.rfind(b'\n') + 1
+    end = 0
+    with pa.memory_map(path) as source:
+        while source.tell() < source.size():
+            try:
+                for _ in ipc.open_stream(source):
+                    pass
+            except pa.ArrowInvalid:
+                break
+            end = source.tell()
+    return end
+
+def _repair(path: str, csv: bool) -> None:
+    """Drop the torn tail left by a flush interrupted by a crash"""
+    length = _valid_length(path, csv)
+    if length < os.path.getsize(path):
+        with open(path, 'r+b') as sink:
+            sink.truncate(length)
+
+def _read_arrow(path: str):
+    """Every stream appended to the file, as one table"""
+    batches = []
+    with pa.memory_map(path) as source:
+        while source.tell() < source.size():
+            try:
+                batches.extend(ipc.open_stream(source))
+            except pa.ArrowInvalid:
+                break  # a flush cut short by a crash
+    return pa.Table.from_batches(batches, schema=_schema())
+
+def read_journal(path: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                 symbol: Optional[str] = None) -> pd.DataFrame:
+    """Trades of a journal, optionally from ``start`` (inclusive) to ``end`` (exclusive) for one symbol"""
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=list(COLUMNS))
+    if _is_csv(path):
+        data = pd.read_csv(path, parse_dates=['timestamp'])
+        mask = pd.Series(True, index=data.index)
+        if start is not None:
+            mask &= data['timestamp'] >= _local(start)
+        if end is not None:
+            mask &= data['timestamp'] < _local(end)
+        if symbol is not None:
+            mask &= data['par'] == symbol
+        return data[mask].reset_index(drop=True)
+
+    table = _read_arrow(path)
+    # Filtering before the conversion keeps pandas out of the rows that are dropped
+    timestamp_type = table.schema.field('timestamp').type
+    if start is not None:
+        table = table.filter(pc.greater_equal(table['timestamp'], pa.scalar(_utc(start), timestamp_type)))
+    if end is not None:
+        table = table.filter(pc.less(table['timestamp'], pa.scalar(_utc(end), timestamp_type)))
+    if symbol is not None:
+        table = table.filter(pc.equal(table['par'], symbol))
+    return table.to_pandas()
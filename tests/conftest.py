@@ -2,11 +2,25 @@
 import pytest
 import os
 from unittest.mock import Mock
+import numpy as np
 import pandas as pd
 from src.utils.binance_client import BinanceClient
 from src.database.crypto_db import CryptoDatabase
 from src.utils.logger import Logger
 
+def make_candles(n=300, seed=7, start='2024-01-01', freq='1h'):
+    """Random-walk OHLCV candles, shared by the tests and the benchmarks"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    return pd.DataFrame({
+        'abertura': open_,
+        'maxima': np.maximum(open_, close) * 1.002,
+        'minima': np.minimum(open_, close) * 0.998,
+        'fechamento': close,
+        'volume': np.ones(n),
+    }, index=pd.date_range(start=start, periods=n, freq=freq))
+
 @pytest.fixture
 def mock_binance_client():
     """Mock Binance client for testing"""
@@ -33,4 +47,48 @@ def test_db():
 def test_logger(tmp_path):
     """Test logger fixture"""
     log_file = tmp_path / "test.log"
-    return Logger(str(log_file))
\ No newline at end of file
+    return Logger(str(log_file))
+
+class StaticMarket:
+    """Deterministic stand-in for the live Binance client used to record fixtures"""
+    def __init__(self, candles: int = 200):
+        self.klines = [
+            [
+                1704067200000 + i * 3600000, "100.0", "101.0", "99.0",
+                f"{100.0 + (i % 50) - 25:.2f}", "10.0", 1704067200000 + (i + 1) * 3600000 - 1,
+                "1000.0", 10, "5.0", "500.0", "0"
+            ]
+            for i in range(candles)
+        ]
+
+    def get_klines(self, symbol, interval, limit=500, **kwargs):
+        return self.klines[-limit:]
+
+    def get_symbol_info(self, symbol):
+        return {
+            'symbol': symbol,
+            'baseAsset': symbol[:-3],
+            'quoteAsset': symbol[-3:],
+            'filters': [
+                {'filterType': 'LOT_SIZE', 'minQty': '0.001', 'maxQty': '100000.0', 'stepSize': '0.001'},
+                {'filterType': 'MIN_NOTIONAL', 'minNotional': '10.0'}
+            ]
+        }
+
+    def get_symbol_ticker(self, symbol):
+        return {'symbol': symbol, 'price': self.klines[-1][4]}
+
+    def get_account(self):
+        return {'balances': [{'asset': 'BRL', 'free': '1000.0', 'locked': '0.0'}]}
+
+@pytest.fixture
+def market_fixture(tmp_path):
+    """Compressed fixture recorded from StaticMarket for BTCBRL 1h"""
+    from src.utils.replay import record_market_fixture
+    return record_market_fixture(StaticMarket(), str(tmp_path / "market.jsonl.gz"), ["BTCBRL"])
+
+@pytest.fixture
+def replay_client(market_fixture):
+    """ReplayClient over the recorded market fixture, without simulated latency"""
+    from src.utils.replay import ReplayClient
+    return ReplayClient(market_fixture, latency=0.0)
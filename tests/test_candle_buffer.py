@@ -0,0 +1,82 @@
+# tests/test_candle_buffer.py
+import numpy as np
+import pytest
+from src.trading.candle_buffer import CandleBuffer
+from src.trading.data_fetcher import DataFetcher
+from src.trading.strategy import MovingAverageStrategy
+from tests.test_cli import to_klines
+from tests.conftest import make_candles
+
+def test_wraparound_keeps_newest_candles_in_order():
+    """Test uneven batches past the capacity against the tail of the candles"""
+    candles = make_candles(500)
+    klines = to_klines(candles)
+    buffer = CandleBuffer(capacity=100)
+    start = 0
+    for size in (1, 60, 7, 99, 150, 3, 180):
+        assert buffer.extend_klines(klines[start:start + size]) == size
+        start += size
+        expected = candles.iloc[max(0, start - 100):start]
+        assert len(buffer) == len(expected)
+        np.testing.assert_array_equal(buffer.view('fechamento'), expected['fechamento'].to_numpy())
+        np.testing.assert_array_equal(buffer.view('maxima'), expected['maxima'].to_numpy())
+    assert buffer.last_open_time == klines[-1][0]
+    assert buffer.last_close_time == klines[-1][6]
+
+    # Rows already in the buffer are ignored
+    assert buffer.extend_klines(klines[-10:]) == 0
+
+    buffer.append(*klines[-1][:6], klines[-1][6])
+    assert buffer.view('fechamento')[-1] == klines[-1][4]
+
+def test_frame_is_a_read_only_view():
+    """Test that the frame shares the buffer memory and matches parse_klines"""
+    klines = to_klines(make_candles(50))
+    buffer = CandleBuffer(capacity=30)
+    buffer.extend_klines(klines)
+    frame = buffer.frame()
+
+    parsed = DataFetcher.parse_klines([k + [0] * 5 for k in klines[-30:]])
+    np.testing.assert_array_equal(frame['fechamento'].to_numpy(), parsed['fechamento'].to_numpy())
+    assert (frame['tempo_fechamento'] == parsed['tempo_fechamento']).all()
+    assert np.shares_memory(frame['fechamento'].to_numpy(), buffer.view('fechamento'))
+    with pytest.raises(ValueError):
+        frame.loc[0, 'fechamento'] = 0.0
+    with pytest.raises(ValueError):
+        buffer.view('fechamento')[0] = 0.0
+
+def test_moving_average_update_leaves_frame_untouched():
+    """Test that the live update matches generate_signals without adding columns"""
+    candles = make_candles(200)
+    buffer = CandleBuffer(capacity=100)
+    strategy = MovingAverageStrategy(fast_period=5, slow_period=20)
+    expected = strategy.generate_signals(candles)
+    for i, kline in enumerate(to_klines(candles)):
+        buffer.extend_klines([kline])
+        frame = buffer.frame()
+        strategy.update(frame)
+        signal = {"BUY": 1, "SELL": -1, None: 0}[strategy.get_signal()]
+        assert signal == expected[i]
+        assert list(frame.columns) == ['abertura', 'maxima', 'minima', 'fechamento', 'volume', 'tempo_fechamento']
+
+def test_frames_kept_across_appends():
+    """Test that appends tear kept views, not copies or the strategy state"""
+    candles = make_candles(120)
+    klines = to_klines(candles)
+    buffer = CandleBuffer(capacity=50)
+    buffer.extend_klines(klines[:60])
+    view = buffer.frame()
+    copy = buffer.frame(copy=True)
+    strategy = MovingAverageStrategy(fast_period=5, slow_period=20)
+    strategy.update(view)
+    signal = strategy.get_signal()
+    expected = candles['fechamento'].iloc[10:60].to_numpy()
+
+    buffer.extend_klines(klines[60:])
+    # The view now shows other candles; the copy and the strategy are unaffected
+    assert not np.array_equal(view['fechamento'].to_numpy(), expected)
+    np.testing.assert_array_equal(copy['fechamento'].to_numpy(), expected)
+    assert not np.shares_memory(copy['fechamento'].to_numpy(), buffer.view('fechamento'))
+    assert (copy['tempo_fechamento'].astype('int64') == [k[6] for k in klines[10:60]]).all()
+    assert strategy.get_signal() == signal
+    assert not hasattr(strategy, 'data')
@@ -0,0 +1,125 @@
+# tests/test_cli.py
+import json
+import os
+import subprocess
+import sys
+import pytest
+from src.cli import _sizer, build_parser, main
+from src.database.crypto_db import CryptoDatabase
+from src.trading.position_sizing import VolatilitySizer
+from tests.conftest import make_candles
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("pandas", "numpy", "plotly", "customtkinter", "binance")
+
+def to_klines(candles):
+    """Binance kline rows for a candle frame"""
+    open_times = candles.index.asi8 // 1_000_000
+    return [
+        [int(t), o, h, l, c, v, int(t) + 3_599_999]
+        for t, o, h, l, c, v in zip(open_times, candles['abertura'], candles['maxima'],
+                                    candles['minima'], candles['fechamento'], candles['volume'])
+    ]
+
+def json_output(out):
+    """JSON document printed by the CLI after the log lines"""
+    return json.loads(out[out.index("{\n"):])
+
+@pytest.fixture
+def candle_db(tmp_path):
+    """Database holding 600 hourly BTCBRL candles"""
+    path = str(tmp_path / "candles.db")
+    CryptoDatabase(path).save_candles("BTCBRL", "1h", to_klines(make_candles(600)))
+    return path
+
+def test_cli_import_is_lightweight():
+    """Test that importing the CLI and printing help load no heavy dependency"""
+    code = (
+        "import sys, contextlib, io\n"
+        "from src.cli import main\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    try:\n"
+        "        main(['backtest', '--help'])\n"
+        "    except SystemExit:\n"
+        "        pass\n"
+        f"print([m for m in sys.modules if m.split('.')[0] in {HEAVY_MODULES!r}])\n"
+    )
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                            text=True, check=True).stdout
+    assert output.strip() == "[]"
+
+def test_candles_round_trip(tmp_path):
+    """Test saving klines and loading them back as backtest candles"""
+    db = CryptoDatabase(str(tmp_path / "candles.db"))
+    candles = make_candles(50)
+    klines = to_klines(candles)
+
+    assert db.get_last_candle_time("BTCBRL", "1h") is None
+    assert db.save_candles("BTCBRL", "1h", klines[:30]) == 30
+    # Overlapping rows are replaced, not duplicated
+    assert db.save_candles("BTCBRL", "1h", klines[25:]) == 25
+    assert db.get_last_candle_time("BTCBRL", "1h") == klines[-1][0]
+
+    loaded = db.load_candles("BTCBRL", "1h")
+    assert len(loaded) == 50
+    assert loaded.index.tz is not None
+    assert (loaded.index.tz_localize(None) == candles.index).all()
+    assert loaded["fechamento"].to_numpy() == pytest.approx(candles["fechamento"].to_numpy())
+
+    window = db.load_candles("BTCBRL", "1h", start_time=klines[10][0], end_time=klines[19][0])
+    assert len(window) == 10
+    assert db.load_candles("ETHBRL", "1h").empty
+
+def test_cli_backtest(candle_db, capsys):
+    """Test both backtest engines on stored candles"""
+    for engine in ("simple", "event"):
+        assert main(["backtest", "BTCBRL", "--db", candle_db, "--engine", engine,
+                     "--fast", "5", "--slow", "20", "--json"]) == 0
+        metrics = json_output(capsys.readouterr().out)
+        assert metrics["total_trades"] > 0
+
+    assert main(["backtest", "BTCBRL", "--db", candle_db, "--strategy", "rsi",
+                 "--param", "period=10", "--param", "oversold=35", "--json"]) == 0
+    assert json_output(capsys.readouterr().out)["total_trades"] > 0
+
+def test_cli_optimize(candle_db, capsys):
+    """Test walk-forward optimization on stored candles"""
+    assert main(["optimize", "BTCBRL", "--db", candle_db, "--fast", "3-5", "--slow", "20,30",
+                 "--in-sample", "200", "--out-of-sample", "100", "--workers", "1", "--json"]) == 0
+    output = json_output(capsys.readouterr().out)
+    assert len(output["windows"]) == 4
+    assert output["windows"][0]["fast_period"] in (3, 4, 5)
+
+def test_cli_paper_run(candle_db, tmp_path, capsys):
+    """Test the paper trading run over stored candles"""
+    assert main(["run", "BTCBRL", "--paper", "--db", candle_db, "--quantity", "1", "--steps", "100",
+                 "--log-file", str(tmp_path / "trading.log"), "--json"]) == 0
+    output = json_output(capsys.readouterr().out)
+    assert output["iterations"] == 100
+    assert output["final_equity"] > 0
+
+def test_cli_paper_run_with_sizer(candle_db, tmp_path, capsys):
+    """Test that the run command passes the chosen sizer to the engine"""
+    assert main(["run", "BTCBRL", "--paper", "--db", candle_db, "--quantity", "1", "--steps", "100",
+                 "--sizer", "volatility", "--risk-fraction", "0.005",
+                 "--log-file", str(tmp_path / "trading.log"), "--json"]) == 0
+    output = json_output(capsys.readouterr().out)
+    assert output["iterations"] == 100
+    assert output["final_equity"] > 0
+
+    args = build_parser().parse_args(["run", "BTCBRL", "--quantity", "1", "--sizer", "volatility",
+                                      "--risk-fraction", "0.005"])
+    sizer = _sizer(args)
+    assert isinstance(sizer, VolatilitySizer)
+    assert sizer.risk_fraction == 0.005
+    assert _sizer(build_parser().parse_args(["run", "BTCBRL", "--quantity", "1"])) is None
+
+def test_cli_run_installs_profiler_toggle(candle_db, tmp_path, capsys, monkeypatch):
+    """Test that a headless run can be profiled on demand with SIGUSR1"""
+    from src.utils.profiling import profiler
+    installed = []
+    monkeypatch.setattr(profiler, "install_signal_toggle", lambda: installed.append(True) or True)
+    assert main(["run", "BTCBRL", "--paper", "--db", candle_db, "--quantity", "1", "--steps", "5",
+                 "--log-file", str(tmp_path / "trading.log")]) == 0
+    assert installed == [True]
+    assert not profiler.enabled
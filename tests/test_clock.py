@@ -0,0 +1,64 @@
+# tests/test_clock.py
+import threading
+import pandas as pd
+import pytest
+from src.backtesting.fill_model import FillModel
+from src.trading.paper_exchange import PaperExchange
+from src.trading.trading_engine import TradingEngine
+from src.utils.clock import SimulatedClock, SystemClock, next_candle_close
+from tests.conftest import make_candles
+
+def test_next_candle_close_alignment():
+    """Test boundaries for several intervals"""
+    start = pd.Timestamp("2024-01-01 10:17:30", tz="UTC").timestamp()
+
+    assert next_candle_close(start, "1h") == pd.Timestamp("2024-01-01 11:00", tz="UTC").timestamp()
+    assert next_candle_close(start, "15m", delay=2) == pd.Timestamp("2024-01-01 10:30:02", tz="UTC").timestamp()
+    # Exactly on a boundary (after the delay) waits for the next one
+    on_close = pd.Timestamp("2024-01-01 11:00:02", tz="UTC").timestamp()
+    assert next_candle_close(on_close, "1h", delay=2) == on_close + 3600
+    # Weekly candles close on Monday 00:00 UTC
+    assert pd.Timestamp(next_candle_close(start, "1w"), unit="s").day_name() == "Monday"
+    with pytest.raises(ValueError):
+        next_candle_close(start, "7m")
+
+def test_clocks_sleep_and_interrupt():
+    """Test simulated advance, listeners and stop events"""
+    clock = SimulatedClock(start=100.0)
+    seen = []
+    clock.subscribe(seen.append)
+
+    assert clock.sleep_until(160.0)
+    assert clock.now() == 160.0
+    assert clock.sleep_until(100.0)  # past deadlines return immediately
+    assert seen == [160.0, 160.0]
+
+    stop = threading.Event()
+    stop.set()
+    assert not clock.sleep(10, stop)
+    assert not SystemClock().sleep(10, stop)
+
+def test_trading_loop_runs_on_simulated_clock(test_db, test_logger):
+    """Test the real loop aligned to candle closes, faster than real time"""
+    candles = make_candles(200)
+    exchange = PaperExchange({"BTCBRL": candles}, balances={"BRL": 1000.0},
+                             fill_model=FillModel(step_size=0.001), start=40)
+    clock = SimulatedClock(start=exchange.current_time.timestamp() + 3600 + 2)
+    engine = TradingEngine("key", "secret", test_db, test_logger, client=exchange, clock=clock)
+
+    def on_tick(now):
+        exchange.advance_to(now)
+        if exchange.done:
+            engine.stop_trading_session()
+
+    clock.subscribe(on_tick)
+    assert engine.open_session("BTCBRL", 1000.0, 5.0)
+    engine._trading_loop()
+
+    timings = list(engine.iteration_timings)
+    assert exchange.done
+    assert len(timings) == len(candles) - 41
+    assert all(t['lag'] == 0.0 for t in timings)
+    assert [t['time'] % 3600 for t in timings[1:]] == [2.0] * (len(timings) - 1)
+    assert all(t['total'] >= t['fetch'] + t['signal'] for t in timings)
+    assert exchange.fills
@@ -0,0 +1,63 @@
+# tests/test_event_engine.py
+import numpy as np
+import pandas as pd
+import pytest
+from src.backtesting.event_engine import EventDrivenBacktester
+from src.backtesting.fill_model import FillModel
+from src.trading.strategy import MovingAverageStrategy
+from src.trading.position_manager import PositionManager
+from tests.conftest import make_candles
+
+def test_fill_model_costs():
+    """Test slippage, spread, fees and lot size rounding"""
+    model = FillModel(taker_fee=0.001, maker_fee=0.0, slippage=0.001,
+                      spread=0.002, step_size=0.001)
+
+    assert model.fill_price("BUY", 100.0) == pytest.approx(100.2)
+    assert model.fill_price("SELL", 100.0) == pytest.approx(99.8)
+    assert model.fill_price("BUY", 100.0, is_maker=True) == 100.0
+    assert model.fee(1000.0) == pytest.approx(1.0)
+    assert model.fee(1000.0, is_maker=True) == 0.0
+    assert model.round_quantity(0.12345678) == PositionManager.adjust_quantity(0.12345678, 0.001)
+
+def test_event_driven_backtest_charges_fees():
+    """Test that fills happen on the next bar and pay fees"""
+    data = make_candles(seed=42)
+    model = FillModel(taker_fee=0.001, slippage=0.0005, step_size=0.001)
+    backtester = EventDrivenBacktester(data, MovingAverageStrategy(), fill_model=model)
+    result = backtester.run()
+
+    assert len(result.equity_curve) == len(data)
+    assert result.metrics['total_trades'] > 0
+    assert result.metrics['total_fees'] > 0
+
+    signals = MovingAverageStrategy().generate_signals(data)
+    first = result.trades[0]
+    bar = data.index.get_loc(first['timestamp'])
+    assert first['type'] == 'BUY'
+    assert signals[bar - 1] == 1
+    assert first['quantity'] * 1000 == pytest.approx(round(first['quantity'] * 1000))
+
+def test_event_driven_backtest_without_costs_matches_close_to_open():
+    """Test that zero costs leave equity equal to cash plus marked position"""
+    data = make_candles(seed=42)
+    model = FillModel(taker_fee=0.0, maker_fee=0.0, slippage=0.0)
+    backtester = EventDrivenBacktester(data, MovingAverageStrategy(), fill_model=model)
+    result = backtester.run()
+
+    final = backtester.capital + backtester.current_position * data['fechamento'].iloc[-1]
+    assert result.equity_curve.iloc[-1] == pytest.approx(final)
+    assert result.metrics['total_fees'] == 0.0
+
+def test_vectorized_signals_match_incremental_updates():
+    """Test that generate_signals matches update/get_signal on every prefix"""
+    data = make_candles(120, seed=42)
+    strategy = MovingAverageStrategy(fast_period=5, slow_period=20)
+    vectorized = strategy.generate_signals(data)
+
+    expected = []
+    for i in range(len(data)):
+        strategy.update(data.iloc[:i+1].copy())
+        expected.append({"BUY": 1, "SELL": -1, None: 0}[strategy.get_signal()])
+
+    assert vectorized.tolist() == expected
@@ -0,0 +1,55 @@
+# tests/test_exchange_rules.py
+from decimal import Decimal, ROUND_FLOOR
+import numpy as np
+import pytest
+from src.utils.exchange_rules import ExchangeRules, SymbolRules, adjust_quantity
+from src.trading.paper_exchange import PaperExchange
+from tests.conftest import make_candles
+
+def decimal_floor(value, step):
+    step = Decimal(step)
+    return float((Decimal(repr(float(value))) / step).to_integral_value(ROUND_FLOOR) * step)
+
+@pytest.mark.parametrize("step", ["0.00000001", "0.00001", "0.001", "0.1", "1", "5", "0.25"])
+def test_quantities_round_like_decimal(step):
+    """Test scalar and array rounding against Decimal arithmetic"""
+    rng = np.random.default_rng(3)
+    quantities = np.round(rng.uniform(0, 1000, 2000), rng.integers(0, 9))
+    expected = [decimal_floor(q, step) for q in quantities]
+
+    np.testing.assert_array_equal(adjust_quantity(quantities, step), expected)
+    assert [adjust_quantity(float(q), float(step)) for q in quantities[:200]] == expected[:200]
+
+def test_steps_that_broke_float_modulo():
+    """Test the cases the str()/modulo implementation got wrong"""
+    assert adjust_quantity(0.12345678, 0.001) == 0.123
+    assert adjust_quantity(0.0001, 0.001) == 0.0
+    assert adjust_quantity(0.123456, 1e-05) == 0.12345
+    assert adjust_quantity(0.29, 0.01) == 0.29
+    assert adjust_quantity(7.3, 0.1) == 7.3
+    assert adjust_quantity(12.0, 5) == 10.0
+
+def test_symbol_rules_from_exchange():
+    """Test filters parsed from symbol info, price ticks and notional checks"""
+    info = {
+        'symbol': "BTCBRL",
+        'filters': [
+            {'filterType': 'PRICE_FILTER', 'minPrice': '1.00', 'maxPrice': '1000000.00', 'tickSize': '0.01000000'},
+            {'filterType': 'LOT_SIZE', 'minQty': '0.00001000', 'maxQty': '9000.00000000', 'stepSize': '0.00001000'},
+            {'filterType': 'NOTIONAL', 'minNotional': '10.00000000'},
+        ]
+    }
+    rules = SymbolRules.from_symbol_info(info)
+    assert rules.format_quantity(0.0123456) == "0.01234"
+    assert rules.round_price(123.456) == 123.45
+    assert rules.format_price(123.451, up=True) == "123.46"
+    assert rules.valid(0.0002, 100000.0) is True
+    assert not rules.valid(0.00005, 100000.0)
+    np.testing.assert_array_equal(rules.max_buy_quantity(np.array([1000.0, 5.0]), 100000.0), [0.01, 0.0])
+
+    exchange = PaperExchange({"BTCBRL": make_candles()})
+    cache = ExchangeRules(exchange)
+    assert cache.get("BTCBRL") is cache.get("BTCBRL")
+    assert cache.get("BTCBRL").min_notional == exchange.min_notional
+    assert cache.load_exchange_info({'symbols': [info]}) == 1
+    assert cache.get("BTCBRL").step_size == 0.00001
@@ -0,0 +1,90 @@
+# tests/test_indicators.py
+import numpy as np
+import pandas as pd
+import pytest
+from src.trading import indicators
+from tests.conftest import make_candles
+
+@pytest.fixture
+def candles():
+    data = make_candles(3000)
+    data['volume'] = np.random.default_rng(3).uniform(1, 100, len(data))
+    return data
+
+def assert_series(actual, expected):
+    np.testing.assert_allclose(actual, np.asarray(expected, dtype=float), rtol=1e-9, atol=1e-9)
+
+def pandas_rsi(close, period):
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / period, adjust=False).mean()
+    return 100 - 100 / (1 + gain / loss)
+
+def pandas_true_range(data):
+    previous = data['fechamento'].shift()
+    return pd.concat([data['maxima'] - data['minima'],
+                      (data['maxima'] - previous).abs(),
+                      (data['minima'] - previous).abs()], axis=1).max(axis=1)
+
+@pytest.mark.parametrize("period", [1, 2, 12, 200])
+def test_ema_matches_pandas(candles, period):
+    """Test the blocked EMA recurrence against pandas ewm"""
+    close = candles['fechamento']
+    assert_series(indicators.ema(close, period), close.ewm(span=period, adjust=False).mean())
+
+def test_batch_indicators_match_pandas(candles):
+    """Test RSI, MACD, Bollinger, ATR and VWAP against pandas reference implementations"""
+    close = candles['fechamento']
+    high, low, volume = candles['maxima'], candles['minima'], candles['volume']
+
+    assert_series(indicators.rsi(close, 14), pandas_rsi(close, 14))
+
+    line, signal, histogram = indicators.macd(close, 12, 26, 9)
+    expected = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    assert_series(line, expected)
+    assert_series(signal, expected.ewm(span=9, adjust=False).mean())
+    assert_series(histogram, line - signal)
+
+    middle, upper, lower = indicators.bollinger_bands(close, 20, 2.0)
+    assert_series(middle, close.rolling(20).mean())
+    assert_series(upper - middle, 2.0 * close.rolling(20).std(ddof=0))
+    assert_series(middle - lower, 2.0 * close.rolling(20).std(ddof=0))
+
+    assert_series(indicators.atr(high, low, close, 14),
+                  pandas_true_range(candles).ewm(alpha=1 / 14, adjust=False).mean())
+
+    typical = (high + low + close) / 3
+    assert_series(indicators.vwap(high, low, close, volume),
+                  (typical * volume).cumsum() / volume.cumsum())
+    assert_series(indicators.vwap(high, low, close, volume, window=24),
+                  (typical * volume).rolling(24, min_periods=1).sum() / volume.rolling(24, min_periods=1).sum())
+
+def test_streaming_indicators_match_batch(candles):
+    """Test that feeding bars one at a time reproduces the batch values"""
+    high, low, close, volume = (candles[c].to_numpy() for c in ('maxima', 'minima', 'fechamento', 'volume'))
+    ema, rsi, macd = indicators.EMA(20), indicators.RSI(14), indicators.MACD()
+    bands, atr, vwap = indicators.BollingerBands(20), indicators.ATR(14), indicators.VWAP(24)
+
+    streamed = {name: [] for name in ('ema', 'rsi', 'macd', 'bands', 'atr', 'vwap')}
+    for h, l, c, v in zip(high, low, close, volume):
+        streamed['ema'].append(ema.update(c))
+        streamed['rsi'].append(rsi.update(c))
+        streamed['macd'].append(macd.update(c))
+        streamed['bands'].append(bands.update(c))
+        streamed['atr'].append(atr.update(h, l, c))
+        streamed['vwap'].append(vwap.update(h, l, c, v))
+
+    assert_series(streamed['ema'], indicators.ema(close, 20))
+    assert_series(streamed['rsi'], indicators.rsi(close, 14))
+    assert_series(np.array(streamed['macd']).T, np.array(indicators.macd(close)))
+    assert_series(np.array(streamed['bands']).T, np.array(indicators.bollinger_bands(close, 20)))
+    assert_series(streamed['atr'], indicators.atr(high, low, close, 14))
+    assert_series(streamed['vwap'], indicators.vwap(high, low, close, volume, window=24))
+    assert ema.ready and rsi.ready and macd.ready and bands.ready and atr.ready and vwap.ready
+
+def test_indicators_on_short_input():
+    """Test empty and single-bar inputs"""
+    assert len(indicators.ema([], 10)) == 0
+    assert np.isnan(indicators.rsi([100.0], 14)).all()
+    assert np.isnan(indicators.bollinger_bands([1.0, 2.0], 20)[0]).all()
+    assert not indicators.BollingerBands(20).ready
@@ -0,0 +1,106 @@
+# tests/test_kernels.py
+import numpy as np
+import pytest
+from src.backtesting.engine import Backtester
+from src.backtesting.kernels import NUMBA_AVAILABLE, simulate_long_flat
+from src.trading.position_sizing import KellySizer
+from src.trading.strategy import SIGNAL_BUY, SIGNAL_NONE, SIGNAL_SELL, MovingAverageStrategy
+from tests.conftest import make_candles
+
+def assert_same_run(left, right):
+    np.testing.assert_allclose(left[0], right[0], rtol=1e-12)
+    assert (left[1] == right[1]).all()
+    for name in left[2].dtype.names:
+        np.testing.assert_allclose(left[2][name], right[2][name], rtol=1e-12)
+
+def test_fast_backtester_matches_bar_loop():
+    """Test that the kernel path reproduces the per-bar Backtester"""
+    data = make_candles(500)
+    loop = Backtester(data.copy(), MovingAverageStrategy(5, 20)).run()
+    fast = Backtester(data.copy(), MovingAverageStrategy(5, 20), fast=True).run()
+
+    np.testing.assert_allclose(fast.equity_curve.to_numpy(), loop.equity_curve.to_numpy(), rtol=1e-9)
+    assert (fast.positions == loop.positions).all()
+    assert fast.metrics['total_trades'] == loop.metrics['total_trades'] > 0
+    assert fast.metrics['total_profit'] == pytest.approx(loop.metrics['total_profit'])
+    assert (fast.trades.to_frame()['type'] == loop.trades.to_frame()['type']).all()
+
+def test_backends_agree():
+    """Test the vectorized and loop backends on the same signals"""
+    data = make_candles(2000)
+    close = data['fechamento'].to_numpy()
+    signals = MovingAverageStrategy(5, 20).generate_signals(data)
+    assert_same_run(simulate_long_flat(close, signals, backend="numpy"),
+                    simulate_long_flat(close, signals, backend="python"))
+    with pytest.raises(ValueError):
+        simulate_long_flat(close, signals, stop_loss=0.05, backend="numpy")
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")
+def test_numba_backend_matches_python():
+    """Test the compiled loop against the interpreted one, with stops"""
+    data = make_candles(2000)
+    arrays = dict(open_=data['abertura'].to_numpy(), high=data['maxima'].to_numpy(),
+                  low=data['minima'].to_numpy(), stop_loss=0.02, take_profit=0.05, trailing_stop=0.03)
+    signals = MovingAverageStrategy(5, 20).generate_signals(data)
+    close = data['fechamento'].to_numpy()
+    assert_same_run(simulate_long_flat(close, signals, backend="numba", **arrays),
+                    simulate_long_flat(close, signals, backend="python", **arrays))
+
+def test_stops_exit_and_wait_for_sell():
+    """Test stop loss, trailing stop and take profit fills"""
+    close = np.array([100.0, 100.0, 104.0, 110.0, 104.0, 103.0, 100.0, 100.0])
+    high = close + 1.0
+    low = close - 1.0
+    buy_then_hold = np.array([SIGNAL_BUY] * 6 + [SIGNAL_SELL, SIGNAL_BUY], dtype=np.int8)
+
+    # Trailing 5% below the 111 high: low 103 on bar 4 crosses 105.45
+    equity, positions, fills = simulate_long_flat(close, buy_then_hold, 1000.0, 1.0, high=high, low=low,
+                                                  trailing_stop=0.05, backend="python")
+    assert list(fills['bar']) == [0, 4, 7]
+    assert fills['price'][1] == pytest.approx(111.0 * 0.95)
+    # Re-entry waits for the SELL on bar 6 before buying again on bar 7
+    assert list(positions) == [1, 1, 1, 1, 0, 0, 0, 1]
+    assert equity[5] == pytest.approx(1000.0 * 111.0 * 0.95 / 100.0)
+
+    # Gap through the take profit fills at the open
+    open_ = close.copy()
+    open_[3] = 109.0
+    _, _, fills = simulate_long_flat(close, buy_then_hold, 1000.0, 1.0, open_=open_, high=high, low=low,
+                                     take_profit=0.08, backend="python")
+    assert fills['price'][1] == pytest.approx(109.0)
+
+    _, _, fills = simulate_long_flat(close, np.array([SIGNAL_BUY] + [SIGNAL_NONE] * 7, dtype=np.int8),
+                                     1000.0, 1.0, high=high, low=low, stop_loss=0.005, backend="python")
+    assert list(fills['bar']) == [0, 1] and fills['price'][1] == pytest.approx(99.5)
+
+def test_zero_fractions_skip_entries_on_every_backend():
+    """Test that BUY bars sized at 0 or NaN don't enter, identically on every path"""
+    close = np.array([100.0, 101.0, 102.0, 103.0, 104.0, 105.0, 110.0])
+    signals = np.full(7, SIGNAL_BUY, dtype=np.int8)
+    fractions = np.array([0.0] * 5 + [0.5, 0.5])
+    backends = ["numpy", "python"] + (["numba"] if NUMBA_AVAILABLE else [])
+    runs = [simulate_long_flat(close, signals, 1000.0, fractions, backend=backend) for backend in backends]
+    equity, positions, fills = runs[0]
+    assert len(fills) == 1 and fills['bar'][0] == 5
+    assert equity[-1] == pytest.approx(1000.0 + 500.0 / 105.0 * 5.0)
+    for run in runs[1:]:
+        assert_same_run(runs[0], run)
+
+    data = make_candles(500)
+    signals = MovingAverageStrategy(3, 8).generate_signals(data)
+    fractions = np.where(np.arange(500) % 3 == 0, np.nan, 0.5)
+    fractions[:100] = 0.0
+    runs = [simulate_long_flat(data['fechamento'].to_numpy(), signals, 10000.0, fractions, backend=backend)
+            for backend in backends]
+    assert (runs[0][2]['quantity'] > 0).all()
+    for run in runs[1:]:
+        assert_same_run(runs[0], run)
+
+def test_backtester_without_edge_never_trades():
+    """Test that a sizer investing nothing leaves both Backtester paths flat"""
+    data = make_candles(300)
+    for fast in (False, True):
+        result = Backtester(data.copy(), MovingAverageStrategy(3, 8), sizer=KellySizer(0.3, 1.0), fast=fast).run()
+        assert result.metrics['total_trades'] == 0
+        assert (result.positions == 0).all()
+        assert (result.equity_curve == 10000.0).all()
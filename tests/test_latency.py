@@ -0,0 +1,73 @@
+# tests/test_latency.py
+import json
+import numpy as np
+import pytest
+from src.backtesting.fill_model import FillModel
+from src.trading.paper_exchange import PaperExchange, run_paper_trading
+from src.trading.trading_engine import TradingEngine
+from src.utils.latency import LatencyHistogram, LatencyRecorder
+from tests.conftest import make_candles
+
+def test_histogram_percentiles_within_one_bucket():
+    """Test percentiles against numpy on lognormal samples"""
+    samples = np.random.default_rng(1).lognormal(np.log(0.01), 1.0, 20000)
+    histogram = LatencyHistogram()
+    for value in samples:
+        histogram.record(float(value))
+
+    summary = histogram.summary()
+    assert summary['count'] == len(samples)
+    assert summary['mean'] == pytest.approx(samples.mean())
+    assert summary['max'] == samples.max()
+    for q in (50, 95, 99):
+        expected = np.percentile(samples, q)
+        assert expected <= summary[f'p{q}'] <= expected * 1.1 + 1e-12
+
+def test_recorder_times_blocks_and_exports(tmp_path):
+    """Test the context manager timer and the JSON export"""
+    recorder = LatencyRecorder(str(tmp_path / "latency.json"))
+    with recorder.time("fetch"):
+        sum(range(1000))
+    recorder.record("order", 0.25)
+
+    path = recorder.export_json()
+    with open(path) as f:
+        exported = json.load(f)['latency']
+    assert set(exported) == {"fetch", "order"}
+    assert exported["order"]["p99"] == 0.25
+    assert exported["fetch"]["count"] == 1
+
+def test_engine_records_hot_path_latency(test_db, test_logger):
+    """Test that a paper session fills every hot path histogram and the trades table"""
+    exchange = PaperExchange({"BTCBRL": make_candles(300)}, balances={"BRL": 1000.0},
+                             fill_model=FillModel(step_size=0.001), start=40)
+    engine = TradingEngine("key", "secret", test_db, test_logger, client=exchange)
+    assert engine.open_session("BTCBRL", 1000.0, 5.0)
+
+    run_paper_trading(engine, exchange)
+    snapshot = engine.latency.snapshot()
+
+    assert {'fetch', 'signal', 'iteration', 'symbol_info', 'order', 'db_write',
+            'close_to_order'} <= set(snapshot)
+    assert snapshot['iteration']['count'] == 260
+    assert snapshot['order']['count'] == len(exchange.fills)
+    operations = test_db.get_session_operations(engine.current_trading_id)
+    assert len(operations) == len(exchange.fills)
+
+def test_engine_throttles_latency_export(test_db, test_logger, tmp_path):
+    """Test that the latency file is rewritten at most once per interval and on stop"""
+    exchange = PaperExchange({"BTCBRL": make_candles(300)}, balances={"BRL": 1000.0},
+                             fill_model=FillModel(step_size=0.001), start=40)
+    recorder = LatencyRecorder(str(tmp_path / "latency.json"))
+    exports = []
+    export_json = recorder.export_json
+    recorder.export_json = lambda *args: exports.append(export_json(*args))
+    engine = TradingEngine("key", "secret", test_db, test_logger, client=exchange, latency=recorder)
+    engine.latency_export_interval = 3600.0
+    assert engine.open_session("BTCBRL", 1000.0, 5.0)
+
+    run_paper_trading(engine, exchange, steps=50)
+    assert len(exports) == 1
+    engine.stop_trading_session()
+    assert len(exports) == 2
+    assert json.load(open(exports[-1]))['latency']['iteration']['count'] == 50
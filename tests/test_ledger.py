@@ -0,0 +1,63 @@
+# tests/test_ledger.py
+import numpy as np
+import pandas as pd
+import pytest
+from src.backtesting.engine import BacktestResult
+from src.backtesting.ledger import TradeLedger, SIDE_BUY, SIDE_SELL
+
+def test_ledger_grows_and_round_trips_trades():
+    """Test appending past the initial capacity and reading trades back"""
+    ledger = TradeLedger(capacity=2)
+    timestamps = pd.date_range(start='2024-01-01', periods=5, freq='1h', tz='America/Sao_Paulo')
+    for i, timestamp in enumerate(timestamps):
+        ledger.append(timestamp, 'BUY' if i % 2 == 0 else 'SELL', 100.0 + i, 0.5, cost=50.0, profit=float(i))
+
+    assert len(ledger) == 5
+    assert ledger[0]['timestamp'] == timestamps[0]
+    assert ledger[-1]['type'] == 'BUY'
+    assert ledger[1]['profit'] == 1.0
+    assert list(ledger.timestamps()) == list(timestamps)
+    assert ledger.column('price').tolist() == [100.0, 101.0, 102.0, 103.0, 104.0]
+    assert ledger.nbytes == 5 * 49
+
+def test_ledger_bulk_extend_with_integer_index():
+    """Test extending from arrays when the data has a plain integer index"""
+    ledger = TradeLedger(capacity=1)
+    ledger.extend(
+        pd.Index([3, 7]), np.array([SIDE_BUY, SIDE_SELL]), np.array([10.0, 12.0]),
+        np.array([1.0, 1.0]), np.array([10.0, 0.0]), np.array([0.0, 2.0])
+    )
+
+    frame = ledger.to_frame()
+    assert frame['timestamp'].tolist() == [3, 7]
+    assert frame['type'].tolist() == ['BUY', 'SELL']
+    assert ledger[1]['timestamp'] == 7
+
+def test_ledger_bulk_extend_with_millisecond_index():
+    """Test that non-nanosecond datetime indexes keep their timestamps"""
+    timestamps = pd.date_range(start='2024-01-01', periods=2, freq='1h', tz='UTC').as_unit('ms')
+    ledger = TradeLedger()
+    ledger.extend(
+        timestamps, np.array([SIDE_BUY, SIDE_SELL]), np.array([10.0, 12.0]),
+        np.array([1.0, 1.0]), np.array([10.0, 0.0]), np.array([0.0, 2.0])
+    )
+    assert ledger[0]['timestamp'] == timestamps[0]
+    assert list(ledger.timestamps()) == list(timestamps)
+
+def test_metrics_from_ledger():
+    """Test metrics computed from the ledger columns"""
+    result = BacktestResult()
+    for i, profit in enumerate([0.0, 30.0, 0.0, -10.0, 0.0, 20.0]):
+        result.add_trade({
+            'timestamp': i, 'type': 'BUY' if i % 2 == 0 else 'SELL',
+            'price': 100.0, 'quantity': 1.0, 'cost': 100.0, 'profit': profit
+        })
+    result.equity_curve = pd.Series([100.0, 130.0, 120.0, 140.0])
+    result.calculate_metrics()
+
+    assert result.metrics['total_trades'] == 6
+    assert result.metrics['winning_trades'] == 2
+    assert result.metrics['losing_trades'] == 1
+    assert result.metrics['total_profit'] == pytest.approx(40.0)
+    assert result.metrics['profit_factor'] == pytest.approx(5.0)
+    assert isinstance(result.metrics['total_profit'], float)
@@ -0,0 +1,73 @@
+# tests/test_metrics.py
+import numpy as np
+import pandas as pd
+import pytest
+from src.backtesting.engine import BacktestResult
+from src.backtesting.metrics import compute_metrics, periods_per_year, rolling_metrics
+from tests.conftest import make_candles
+
+def make_equity(n=2000, freq='1h', seed=9):
+    """Random equity curve on a datetime index"""
+    return 100.0 * make_candles(n, seed, freq=freq)['fechamento']
+
+def test_periods_per_year_by_interval():
+    """Test annualization factors for kline intervals and inferred indexes"""
+    assert periods_per_year('1d') == 365
+    assert periods_per_year('1h') == 365 * 24
+    assert periods_per_year('1m') == 365 * 24 * 60
+    assert periods_per_year(index=make_equity(10, freq='15min').index) == 365 * 96
+    assert periods_per_year() == 365
+    with pytest.raises(ValueError):
+        periods_per_year('7x')
+
+def test_metrics_match_pandas_reference():
+    """Test metrics against straightforward pandas computations"""
+    equity = make_equity()
+    periods = periods_per_year('1h')
+    metrics = compute_metrics(equity.to_numpy(), periods, risk_free_rate=0.0)
+
+    returns = equity.pct_change().dropna()
+    drawdown = 1 - equity / equity.cummax()
+    years = (len(equity) - 1) / periods
+    assert metrics['sharpe_ratio'] == pytest.approx(np.sqrt(periods) * returns.mean() / returns.std())
+    assert metrics['max_drawdown'] == pytest.approx(drawdown.max())
+    assert metrics['max_drawdown_abs'] == pytest.approx((equity.cummax() - equity).max())
+    assert metrics['cagr'] == pytest.approx((equity.iloc[-1] / equity.iloc[0]) ** (1 / years) - 1)
+    assert metrics['ulcer_index'] == pytest.approx(np.sqrt(((drawdown * 100) ** 2).mean()))
+    downside = np.sqrt((returns.clip(upper=0) ** 2).mean())
+    assert metrics['sortino_ratio'] == pytest.approx(np.sqrt(periods) * returns.mean() / downside)
+    assert metrics['calmar_ratio'] == pytest.approx(metrics['cagr'] / metrics['max_drawdown'])
+
+def test_exposure_and_trade_duration():
+    """Test exposure and average holding time from a position array"""
+    positions = np.array([0, 1, 1, 1, 0, 0, 1, 0, 0, 0])
+    metrics = compute_metrics(np.linspace(100, 110, 10), 365, positions=positions)
+
+    assert metrics['exposure'] == pytest.approx(0.4)
+    assert metrics['avg_trade_duration'] == pytest.approx(2.0)
+
+def test_backtest_result_uses_interval():
+    """Test that Sharpe scales with the bar interval and drawdown is a fraction"""
+    hourly = BacktestResult(interval='1h')
+    hourly.equity_curve = make_equity()
+    minutely = BacktestResult(interval='1m')
+    minutely.equity_curve = make_equity()
+
+    assert minutely.calculate_sharpe_ratio(0.0) == pytest.approx(hourly.calculate_sharpe_ratio(0.0) * np.sqrt(60))
+    assert 0 <= hourly.calculate_max_drawdown() < 1
+
+    rolling = hourly.rolling_metrics(window=24)
+    assert list(rolling.columns) == ['return', 'volatility', 'sharpe_ratio', 'drawdown']
+    assert rolling['drawdown'].max() <= hourly.calculate_max_drawdown() + 1e-12
+
+def test_equity_metrics_without_trades():
+    """Test that a run without trades still reports its equity curve metrics"""
+    result = BacktestResult(interval='1h')
+    result.equity_curve = make_equity()
+    result.calculate_metrics()
+
+    assert result.metrics['total_trades'] == 0
+    assert result.metrics['max_drawdown'] > 0
+    assert result.metrics['max_drawdown'] == pytest.approx(result.calculate_max_drawdown())
+    assert result.metrics['sharpe_ratio'] == pytest.approx(result.calculate_sharpe_ratio())
+    assert result.metrics['volatility'] > 0
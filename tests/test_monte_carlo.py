@@ -0,0 +1,60 @@
+# tests/test_monte_carlo.py
+import numpy as np
+import pandas as pd
+import pytest
+from src.backtesting.engine import BacktestResult
+from src.backtesting.monte_carlo import MonteCarloAnalyzer
+
+def make_result():
+    """Backtest result with five round trips and an hourly equity curve"""
+    result = BacktestResult()
+    profits = [100.0, -50.0, 200.0, -80.0, 40.0]
+    for i, profit in enumerate(profits):
+        result.add_trade({'timestamp': 2 * i, 'type': 'BUY', 'price': 100.0,
+                          'quantity': 1.0, 'cost': 9500.0, 'profit': 0.0})
+        result.add_trade({'timestamp': 2 * i + 1, 'type': 'SELL', 'price': 101.0,
+                          'quantity': 1.0, 'cost': 0.0, 'profit': profit})
+    rng = np.random.default_rng(1)
+    result.equity_curve = pd.Series(10000.0 * np.cumprod(1 + rng.normal(0, 0.01, 500)))
+    return result
+
+def test_trade_returns_compound_to_total_profit():
+    """Test that trade returns rebuild the final equity"""
+    analyzer = MonteCarloAnalyzer(make_result())
+    returns = analyzer.trade_returns()
+
+    assert len(returns) == 5
+    assert 10000.0 * np.prod(1 + returns) == pytest.approx(10000.0 + 210.0)
+
+def test_permutation_keeps_final_equity():
+    """Test that permuting trades only changes the path, not the end point"""
+    analyzer = MonteCarloAnalyzer(make_result(), n_simulations=500, seed=3, max_workers=1)
+    result = analyzer.resample_trades("permute")
+
+    assert len(result) == 500
+    np.testing.assert_allclose(result.final_equity, 10210.0)
+    assert result.max_drawdown.min() >= 0
+    assert result.max_drawdown.max() > result.max_drawdown.min()
+
+def test_seeded_runs_are_reproducible_across_workers():
+    """Test that the seed alone determines the distributions"""
+    serial = MonteCarloAnalyzer(make_result(), n_simulations=2500, seed=11,
+                                chunk_size=1000, max_workers=1).bootstrap_blocks(block_size=24)
+    parallel = MonteCarloAnalyzer(make_result(), n_simulations=2500, seed=11,
+                                  chunk_size=1000, max_workers=2).bootstrap_blocks(block_size=24)
+
+    assert len(serial) == 2500
+    np.testing.assert_array_equal(serial.final_equity, parallel.final_equity)
+    percentiles = serial.percentiles((5, 50, 95))
+    assert percentiles['final_equity'][5] <= percentiles['final_equity'][95]
+    assert 0 <= serial.probability_of_loss(10000.0) <= 1
+
+def test_unknown_method_raises():
+    """Test invalid resampling method"""
+    with pytest.raises(ValueError):
+        MonteCarloAnalyzer(make_result()).resample_trades("shuffle")
+
+def test_no_simulations_raises():
+    """Test that an empty run is refused up front"""
+    with pytest.raises(ValueError):
+        MonteCarloAnalyzer(make_result(), n_simulations=0)
@@ -0,0 +1,111 @@
+# tests/test_order_executor.py
+import threading
+from unittest.mock import Mock
+import pytest
+import requests
+from binance.exceptions import BinanceAPIException
+from src.trading.order_executor import OrderExecutor, is_transient, parse_fill
+from src.trading.paper_exchange import PaperExchange
+from src.trading.position_manager import PositionManager
+from tests.conftest import make_candles
+
+FILLED = {
+    'orderId': 7, 'status': 'FILLED', 'executedQty': '0.30000000', 'cummulativeQuoteQty': '30.30000000',
+    'fills': [{'price': '100.00000000', 'qty': '0.10000000'}, {'price': '101.50000000', 'qty': '0.20000000'}]
+}
+
+def api_error(code, status_code=400):
+    return BinanceAPIException(Mock(), status_code, f'{{"code": {code}, "msg": "error {code}"}}')
+
+def make_executor(client, sleeps=None):
+    return OrderExecutor(client, jitter=0.0, sleep=(sleeps if sleeps is not None else []).append)
+
+def test_retry_reuses_client_order_id():
+    """Test backoff on a timeout and a second attempt with the same client order ID"""
+    client = Mock()
+    client.create_order.side_effect = [requests.exceptions.Timeout("read timeout"), FILLED]
+    client.get_order.side_effect = api_error(-2013)  # Order does not exist
+    sleeps = []
+    result = make_executor(client, sleeps).submit("BTCBRL", "BUY", 0.3)
+
+    first, second = (call.kwargs['newClientOrderId'] for call in client.create_order.call_args_list)
+    assert first == second == result.client_order_id
+    assert len(first) <= 36
+    assert sleeps == [0.5]
+    assert result.attempts == 2
+    assert result.status == 'FILLED'
+    assert result.executed_quantity == pytest.approx(0.3)
+    assert result.average_price == pytest.approx(101.0)
+
+def test_lost_response_is_not_sent_twice():
+    """Test that an order placed before the failure is confirmed instead of resubmitted"""
+    client = Mock()
+    client.create_order.side_effect = api_error(-1007, status_code=408)  # execution status unknown
+    client.get_order.return_value = FILLED
+    result = make_executor(client).submit("BTCBRL", "SELL", 0.3)
+
+    assert client.create_order.call_count == 1
+    assert result.filled
+    assert result.order_id == 7
+
+def test_rejections_and_exhausted_retries():
+    """Test that rejections are final and transient failures give up after max_retries"""
+    client = Mock()
+    client.create_order.side_effect = api_error(-2010)  # insufficient balance
+    result = make_executor(client).submit("BTCBRL", "BUY", 1.0)
+    assert result.status == 'REJECTED'
+    assert not result.filled
+    assert client.create_order.call_count == 1
+
+    client = Mock()
+    client.create_order.side_effect = api_error(-1008, status_code=503)
+    client.get_order.side_effect = api_error(-2013)
+    sleeps = []
+    result = make_executor(client, sleeps).submit("BTCBRL", "BUY", 1.0)
+    assert result.status == 'UNKNOWN'
+    assert sleeps == [0.5, 1.0, 2.0]
+    assert client.create_order.call_count == 4
+
+    assert is_transient(api_error(0, status_code=429))
+    assert not is_transient(api_error(0, status_code=418))
+    assert not is_transient(ValueError("bad quantity"))
+
+def test_parse_fill_without_fills():
+    """Test executed quantity from RESULT responses and bare FILLED acks"""
+    assert parse_fill({'status': 'FILLED', 'executedQty': '2', 'cummulativeQuoteQty': '50'}) == (2.0, 25.0, 50.0)
+    assert parse_fill({'status': 'FILLED'}, requested_quantity=0.5) == (0.5, None, 0.0)
+    assert parse_fill({'status': 'EXPIRED', 'executedQty': '0'}, requested_quantity=0.5) == (0.0, None, 0.0)
+
+def test_orders_for_several_symbols_go_out_concurrently():
+    """Test that submit_many has both orders in flight at once"""
+    barrier = threading.Barrier(2, timeout=5)
+
+    def create_order(**params):
+        barrier.wait()  # breaks (and raises) unless the other order is pending too
+        return dict(FILLED, symbol=params['symbol'])
+
+    client = Mock()
+    client.create_order.side_effect = create_order
+    executor = make_executor(client)
+    results = executor.submit_many([
+        {'symbol': "BTCBRL", 'side': "BUY", 'quantity': 0.3},
+        {'symbol': "ETHBRL", 'side': "BUY", 'quantity': 0.3},
+    ])
+    executor.shutdown()
+
+    assert [result.response['symbol'] for result in results] == ["BTCBRL", "ETHBRL"]
+    assert all(result.filled for result in results)
+
+def test_position_manager_uses_confirmed_fill(test_logger):
+    """Test that the position size comes from the paper exchange fill"""
+    exchange = PaperExchange({"BTCBRL": make_candles()}, start=50)
+    manager = PositionManager(exchange, test_logger)
+    assert manager.open_position("BTCBRL", 0.5)
+    assert manager.position_size == pytest.approx(0.5)
+    assert manager.last_result.average_price == pytest.approx(exchange.fills[-1]['price'])
+    assert exchange.get_order("BTCBRL", origClientOrderId=manager.last_result.client_order_id)['status'] == 'FILLED'
+
+    exchange.balances["BTC"] = 0.0  # sold elsewhere: the exchange refuses the sell
+    assert not manager.close_position("BTCBRL")
+    assert manager.has_position
+    assert manager.last_result.status == 'REJECTED'
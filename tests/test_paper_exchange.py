@@ -0,0 +1,106 @@
+# tests/test_paper_exchange.py
+import numpy as np
+import pandas as pd
+import pytest
+from src.backtesting.fill_model import FillModel
+from src.trading.data_fetcher import DataFetcher
+from src.trading.paper_exchange import PaperExchange, PaperExchangeError, run_paper_trading
+from src.trading.trading_engine import TradingEngine
+from src.utils.binance_client import BinanceClient
+from tests.conftest import make_candles
+
+def test_klines_only_show_closed_candles():
+    """Test that market data stops at the cursor"""
+    candles = make_candles()
+    exchange = PaperExchange({"BTCBRL": candles}, start=49)
+
+    data = DataFetcher(exchange).get_market_data("BTCBRL", exchange.KLINE_INTERVAL_1HOUR)
+    assert len(data) == 50
+    assert data["fechamento"].iloc[-1] == pytest.approx(candles["fechamento"].iloc[49])
+
+    exchange.advance()
+    client = BinanceClient("key", "secret", client=exchange)
+    assert client.get_current_price("BTCBRL") == pytest.approx(candles["fechamento"].iloc[50])
+    assert client.get_symbol_info("BTCBRL")["quote_asset"] == "BRL"
+
+def test_market_orders_update_balances():
+    """Test fills with fees, slippage and balance checks"""
+    candles = make_candles()
+    model = FillModel(taker_fee=0.001, slippage=0.001, step_size=0.001)
+    exchange = PaperExchange({"BTCBRL": candles}, balances={"BRL": 1000.0}, fill_model=model)
+
+    order = exchange.create_order(symbol="BTCBRL", side="BUY", type="MARKET", quantity=5.0004)
+    price = candles["fechamento"].iloc[0] * 1.001
+    assert order["status"] == "FILLED"
+    assert float(order["executedQty"]) == 5.0
+    assert exchange.balances["BTC"] == 5.0
+    assert exchange.balances["BRL"] == pytest.approx(1000.0 - 5 * price * 1.001)
+
+    with pytest.raises(PaperExchangeError):
+        exchange.create_order(symbol="BTCBRL", side="SELL", type="MARKET", quantity=6.0)
+
+def test_limit_orders_match_on_later_candles():
+    """Test that resting orders reserve balance and fill as maker"""
+    candles = make_candles()
+    exchange = PaperExchange({"BTCBRL": candles}, balances={"BRL": 1000.0},
+                             fill_model=FillModel(maker_fee=0.0))
+    limit = float(candles["minima"].iloc[1:].min())
+    order = exchange.create_order(symbol="BTCBRL", side="BUY", type="LIMIT", quantity=1.0, price=limit)
+
+    assert exchange.get_asset_balance("BRL")["locked"] == f"{limit:.8f}"
+    while exchange.get_order(symbol="BTCBRL", orderId=order["orderId"])["status"] == "NEW":
+        assert exchange.advance()
+    assert exchange.balances["BTC"] == 1.0
+    assert exchange.balances["BRL"] == pytest.approx(1000.0 - limit)
+    assert exchange.get_open_orders() == []
+
+def test_orders_respect_reserved_balance_and_min_notional():
+    """Test that orders are validated when placed, never while candles are replayed"""
+    candles = make_candles()
+    exchange = PaperExchange({"BTCBRL": candles}, balances={"BRL": 1000.0},
+                             fill_model=FillModel(maker_fee=0.0))
+    limit = float(candles["minima"].iloc[1:].min())
+    exchange.create_order(symbol="BTCBRL", side="BUY", type="LIMIT", quantity=900.0 / limit, price=limit)
+
+    # Only the 100 BRL not reserved by the resting order can be spent
+    price = exchange.price("BTCBRL")
+    with pytest.raises(PaperExchangeError):
+        exchange.create_order(symbol="BTCBRL", side="BUY", type="MARKET", quantity=200.0 / price)
+    with pytest.raises(PaperExchangeError, match="MIN_NOTIONAL"):
+        exchange.create_order(symbol="BTCBRL", side="BUY", type="LIMIT",
+                              quantity=1.0 / limit, price=limit)
+    assert len(exchange.get_open_orders()) == 1
+
+    while exchange.advance():
+        pass
+    assert exchange.balances["BRL"] == pytest.approx(100.0)
+
+def test_failed_limit_match_expires_order():
+    """Test that a limit order that can no longer settle expires instead of stopping the replay"""
+    candles = make_candles()
+    exchange = PaperExchange({"BTCBRL": candles}, balances={"BRL": 1000.0},
+                             fill_model=FillModel(maker_fee=0.0))
+    limit = float(candles["minima"].iloc[1:].min())
+    order = exchange.create_order(symbol="BTCBRL", side="BUY", type="LIMIT", quantity=1.0, price=limit)
+    exchange.balances["BRL"] = 0.0
+
+    while exchange.advance():
+        pass
+    assert exchange.done
+    assert exchange.get_order(symbol="BTCBRL", orderId=order["orderId"])["status"] == "EXPIRED"
+    assert exchange.fills == []
+
+def test_trading_engine_runs_on_paper_exchange(test_db, test_logger):
+    """Test the real trading loop body over replayed candles"""
+    exchange = PaperExchange({"BTCBRL": make_candles(500)}, balances={"BRL": 1000.0},
+                             fill_model=FillModel(step_size=0.001), start=40)
+    engine = TradingEngine("key", "secret", test_db, test_logger, client=exchange)
+    assert engine.open_session("BTCBRL", 1000.0, 5.0)
+
+    equity = run_paper_trading(engine, exchange)
+
+    assert exchange.done
+    assert len(equity) == 460
+    assert len(exchange.fills) > 2
+    assert {fill["side"] for fill in exchange.fills} == {"BUY", "SELL"}
+    assert equity.iloc[-1] == pytest.approx(exchange.equity())
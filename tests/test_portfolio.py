@@ -0,0 +1,75 @@
+# tests/test_portfolio.py
+import numpy as np
+import pandas as pd
+import pytest
+from src.backtesting.fill_model import FillModel
+from src.backtesting.portfolio import PortfolioBacktester
+from src.backtesting.walk_forward import crossover_positions, moving_averages, simulate_positions
+from src.trading.strategy import MovingAverageStrategy
+from tests.conftest import make_candles
+
+def test_portfolio_aligns_symbols_and_attributes_pnl():
+    """Test alignment of different histories and attribution totals"""
+    data = {
+        'BTCBRL': make_candles(400, 1),
+        'ETHBRL': make_candles(300, 2, start='2024-01-05'),
+        'SOLBRL': make_candles(400, 3),
+    }
+    backtester = PortfolioBacktester(data, MovingAverageStrategy(5, 20), fill_model=FillModel())
+    result = backtester.run()
+
+    assert len(result.equity_curve) == 400
+    assert list(result.asset_pnl.columns) == ['BTCBRL', 'ETHBRL', 'SOLBRL']
+    # ETHBRL has no position before its first candle
+    assert result.positions['ETHBRL'].iloc[:96].sum() == 0
+
+    total_pnl = result.equity_curve.iloc[-1] - 10000.0
+    assert sum(a['pnl'] for a in result.attribution.values()) == pytest.approx(total_pnl)
+    assert sum(a['weight'] for a in result.attribution.values()) == pytest.approx(1.0)
+
+def test_single_symbol_portfolio_tracks_constant_exposure():
+    """Test one symbol at full weight against a bar-by-bar computation"""
+    frame = make_candles(300, 4)
+    result = PortfolioBacktester(
+        {'BTCBRL': frame}, MovingAverageStrategy(5, 20),
+        position_fraction=1.0, fill_model=FillModel(taker_fee=0.0, slippage=0.0)
+    ).run()
+
+    close = frame['fechamento'].to_numpy()
+    averages = moving_averages(close, [5, 20])
+    positions = crossover_positions(averages[5], averages[20])
+    # With the whole equity invested, sleeve and portfolio are the same curve
+    expected = 10000.0 * simulate_positions(close, positions, fraction=1.0)
+    np.testing.assert_allclose(result.equity_curve.to_numpy(), expected, rtol=1e-9)
+
+def test_weights_are_normalized():
+    """Test custom weights"""
+    data = {'BTCBRL': make_candles(100, 5), 'ETHBRL': make_candles(100, 6)}
+    backtester = PortfolioBacktester(data, MovingAverageStrategy(5, 20), weights={'BTCBRL': 3, 'ETHBRL': 1})
+    assert backtester.weights.tolist() == [0.75, 0.25]
+
+    with pytest.raises(ValueError):
+        PortfolioBacktester(data, MovingAverageStrategy(), weights={'BTCBRL': 0})
+
+def test_rebalancing_between_signals_pays_costs():
+    """Test the vectorized costs against a bar-by-bar rebalanced portfolio"""
+    data = {'BTCBRL': make_candles(300, 7), 'ETHBRL': make_candles(300, 8)}
+    fill_model = FillModel(taker_fee=0.001, slippage=0.0005)
+    backtester = PortfolioBacktester(data, MovingAverageStrategy(5, 20), fill_model=fill_model)
+    result = backtester.run()
+
+    prices = backtester.align().to_numpy()
+    targets = backtester.weights * 0.95 * result.positions.to_numpy()
+    cost_rate = fill_model.fill_price("BUY", 1.0) - 1 + fill_model.taker_fee
+    equity, sleeves = 10000.0, np.zeros(2)
+    expected = []
+    for t in range(len(prices)):
+        if t:
+            sleeves = sleeves * prices[t] / prices[t - 1]
+            equity += sleeves.sum() - sleeves_before.sum()
+        traded = np.abs(targets[t] * equity - sleeves).sum()
+        equity -= traded * cost_rate
+        sleeves = targets[t] * equity
+        sleeves_before = sleeves.copy()
+        expected.append(equity)
+    np.testing.assert_allclose(result.equity_curve.to_numpy(), expected, rtol=1e-9)
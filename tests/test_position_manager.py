@@ -1,6 +1,13 @@
 # tests/test_position_manager.py
+import time
 import pytest
+from unittest.mock import ANY
+from src.backtesting.fill_model import FillModel
+from src.trading.paper_exchange import PaperExchange
 from src.trading.position_manager import PositionManager
+from src.trading.strategy import MovingAverageStrategy
+from src.trading.trading_engine import TradingEngine
+from tests.conftest import make_candles
 
 def test_position_manager(mock_binance_client, test_logger):
     """Test position manager operations"""
@@ -40,5 +47,129 @@ def test_position_manager(mock_binance_client, test_logger):
         symbol="BTCBRL",
         side=mock_binance_client.SIDE_BUY,
         type=mock_binance_client.ORDER_TYPE_MARKET,
-        quantity=0.1
-    )
\ No newline at end of file
+        quantity=0.1,
+        newClientOrderId=ANY
+    )
+
+def test_symbol_rules_are_fetched_once(mock_binance_client, test_logger):
+    """Test that orders reuse the cached symbol rules and respect the minimum notional"""
+    manager = PositionManager(mock_binance_client, test_logger)
+    mock_binance_client.get_symbol_info.return_value = {
+        'symbol': 'BTCBRL',
+        'filters': [
+            {'filterType': 'LOT_SIZE', 'minQty': '0.00001', 'maxQty': '9000.0', 'stepSize': '0.00001'},
+            {'filterType': 'MIN_NOTIONAL', 'minNotional': '10.0'}
+        ]
+    }
+    mock_binance_client.create_order.return_value = {'orderId': 1, 'status': 'FILLED'}
+
+    assert not manager.open_position("BTCBRL", 0.00003, price=300000.0)
+    mock_binance_client.create_order.assert_not_called()
+    assert manager.open_position("BTCBRL", 0.000299, price=300000.0)
+    assert mock_binance_client.create_order.call_args.kwargs['quantity'] == 0.00029
+    assert mock_binance_client.get_symbol_info.call_count == 1
+
+def make_paper(test_db, test_logger):
+    exchange = PaperExchange({"BTCBRL": make_candles()}, start=50)
+    return exchange, PositionManager(exchange, test_logger, db=test_db)
+
+def test_restore_after_restart(test_db, test_logger):
+    """Test that a checkpointed position survives a restart and follows the balances"""
+    exchange, manager = make_paper(test_db, test_logger)
+    assert manager.open_position("BTCBRL", 0.5)
+    assert test_db.load_positions()["BTCBRL"]['quantity'] == pytest.approx(0.5)
+    assert test_db.load_pending_orders() == []
+
+    restarted = PositionManager(exchange, test_logger, db=test_db)
+    assert restarted.restore("BTCBRL")
+    assert restarted.position_size == pytest.approx(0.5)
+    assert restarted.entry_price == pytest.approx(manager.entry_price)
+    assert restarted.current_symbol == "BTCBRL"
+
+    # Sold outside the bot while it was down
+    exchange.balances["BTC"] = 0.2
+    assert restarted.restore("BTCBRL")
+    assert restarted.position_size == pytest.approx(0.2)
+    exchange.balances["BTC"] = 0.0
+    assert not restarted.restore("BTCBRL")
+    assert test_db.load_positions() == {}
+
+def test_restore_ignores_foreign_balance_and_finds_pending_fill(test_db, test_logger):
+    """Test that only balances bought by the bot are adopted, including a buy confirmed after a crash"""
+    exchange, manager = make_paper(test_db, test_logger)
+    exchange.balances["BTC"] = 1.0
+    assert not manager.restore("BTCBRL")
+
+    # Crash between sending the order and checkpointing the fill
+    test_db.save_pending_order("cb-crash", "BTCBRL", "BUY", 0.3)
+    test_db.save_pending_order("cb-lost", "BTCBRL", "BUY", 0.3)
+    order = exchange.create_order(symbol="BTCBRL", side="BUY", type="MARKET", quantity=0.3,
+                                  newClientOrderId="cb-crash")
+    assert manager.restore("BTCBRL")
+    assert manager.position_size == pytest.approx(0.3)
+    assert manager.entry_price == pytest.approx(float(order['fills'][0]['price']))
+    assert test_db.load_pending_orders() == []
+
+class CountingStrategy(MovingAverageStrategy):
+    """Moving average strategy with a bar counter to checkpoint"""
+    def __init__(self):
+        super().__init__()
+        self.bars = 0
+
+    def update(self, data):
+        super().update(data)
+        self.bars += 1
+
+    def get_state(self):
+        return {'bars': self.bars}
+
+    def set_state(self, state):
+        self.bars = state.get('bars', 0)
+
+def test_engine_resumes_position_and_strategy_state(test_db, test_logger):
+    """Test that a restarted engine picks up the position, PnL and strategy state"""
+    exchange = PaperExchange({"BTCBRL": make_candles(500)}, balances={"BRL": 1000.0},
+                             fill_model=FillModel(step_size=0.001), start=40)
+    engine = TradingEngine("key", "secret", test_db, test_logger, client=exchange, strategy=CountingStrategy())
+    assert engine.open_session("BTCBRL", 1000.0, 5.0)
+    while not engine.position_manager.has_position or engine.realized_pnl == 0.0:
+        assert exchange.advance()
+        engine.run_iteration()
+
+    restarted = TradingEngine("key", "secret", test_db, test_logger, client=exchange, strategy=CountingStrategy())
+    started = time.perf_counter()
+    assert restarted.open_session("BTCBRL", 1000.0, 5.0)
+    assert time.perf_counter() - started < 1.0
+    assert restarted.position_manager.has_position
+    assert restarted.position_manager.position_size == pytest.approx(engine.position_manager.position_size)
+    assert restarted.entry_price == pytest.approx(engine.entry_price)
+    assert restarted.realized_pnl == pytest.approx(engine.realized_pnl)
+    assert restarted.strategy.bars == engine.strategy.bars
+
+def test_paper_state_is_kept_apart_from_live(test_db, test_logger):
+    """Test that paper runs neither resume nor overwrite the live checkpoints"""
+    test_db.save_position("BTCBRL", 2.0, 100.0)
+    exchange = PaperExchange({"BTCBRL": make_candles()}, balances={"BRL": 1000.0}, start=50)
+    engine = TradingEngine("key", "secret", test_db, test_logger, client=exchange)
+    assert engine.mode == 'paper'
+    assert engine.open_session("BTCBRL", 1000.0, 5.0)
+    assert not engine.position_manager.has_position
+
+    assert engine.position_manager.open_position("BTCBRL", 0.5)
+    assert test_db.load_positions()["BTCBRL"] == {'quantity': 2.0, 'entry_price': 100.0}
+    assert test_db.load_positions('paper')["BTCBRL"]['quantity'] == pytest.approx(0.5)
+
+def test_open_session_fails_when_restore_fails(test_db, test_logger):
+    """Test that a session is not started when the position can't be recovered"""
+    exchange, manager = make_paper(test_db, test_logger)
+    assert manager.open_position("BTCBRL", 0.5)
+    engine = TradingEngine("key", "secret", test_db, test_logger, client=exchange, mode='live')
+
+    def unreachable():
+        raise ConnectionError("exchange unreachable")
+    exchange.get_account = unreachable
+    with pytest.raises(ConnectionError):
+        engine.position_manager.restore("BTCBRL")
+    assert not engine.open_session("BTCBRL", 1000.0, 5.0)
+    assert engine.current_trading_id is None
+    assert not engine.trading_active
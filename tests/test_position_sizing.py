@@ -0,0 +1,64 @@
+# tests/test_position_sizing.py
+import numpy as np
+import pytest
+from src.backtesting.engine import Backtester
+from src.backtesting.fill_model import FillModel
+from src.trading.paper_exchange import PaperExchange
+from src.trading.position_sizing import FixedFractionSizer, KellySizer, VolatilitySizer
+from src.trading.risk_manager import RiskLimits
+from src.trading.strategy import MovingAverageStrategy
+from src.trading.trading_engine import TradingEngine
+from tests.conftest import make_candles
+
+def test_volatility_sizer_shrinks_with_atr():
+    """Test that wider candles get smaller fractions, capped at max_fraction"""
+    data = make_candles(300)
+    sizer = VolatilitySizer(risk_fraction=0.01, atr_multiple=2.0, max_fraction=0.95)
+    calm = sizer.fractions(data)
+    wild = data.copy()
+    wild['maxima'] *= 1.02
+    wild['minima'] *= 0.98
+    assert (sizer.fractions(wild)[20:] < calm[20:]).all()
+    assert calm.max() <= 0.95
+    assert sizer.fraction(data) == pytest.approx(calm[-1], rel=1e-4)
+    assert sizer.quantity(1000.0, 50.0, data) == pytest.approx(1000.0 * calm[-1] / 50.0, rel=1e-4)
+
+def test_kelly_sizer():
+    """Test the capped, scaled Kelly fraction and its fit on trade returns"""
+    assert KellySizer(0.6, 1.0, scale=1.0, max_fraction=1.0).fraction() == pytest.approx(0.2)
+    assert KellySizer(0.6, 1.0, scale=0.5).fraction() == pytest.approx(0.1)
+    assert KellySizer(0.9, 3.0).fraction() == 0.25
+    assert KellySizer(0.3, 1.0).fraction() == 0.0
+
+    sizer = KellySizer.from_returns([0.04, -0.02, 0.02, -0.02], scale=1.0, max_fraction=1.0)
+    assert sizer.win_rate == 0.5
+    assert sizer.payoff == pytest.approx(1.5)
+    assert sizer.fraction() == pytest.approx(0.5 - 0.5 / 1.5)
+    with pytest.raises(ValueError):
+        FixedFractionSizer(1.5)
+
+@pytest.mark.parametrize("risk", [None, RiskLimits(stop_loss=0.01, trailing_stop=0.02)])
+def test_fast_backtester_matches_bar_loop_with_sizer(risk):
+    """Test per-bar fractions in the bar loop and both kernel backends"""
+    data = make_candles(800)
+    sizer = VolatilitySizer(risk_fraction=0.005)
+    loop = Backtester(data.copy(), MovingAverageStrategy(5, 20), risk=risk, sizer=sizer).run()
+    fast = Backtester(data.copy(), MovingAverageStrategy(5, 20), fast=True, risk=risk, sizer=sizer).run()
+    fixed = Backtester(data.copy(), MovingAverageStrategy(5, 20), fast=True, risk=risk).run()
+
+    np.testing.assert_allclose(fast.equity_curve.to_numpy(), loop.equity_curve.to_numpy(), rtol=1e-9)
+    np.testing.assert_allclose(fast.trades.to_frame()['quantity'], loop.trades.to_frame()['quantity'], rtol=1e-9)
+    assert not np.allclose(fast.equity_curve.to_numpy(), fixed.equity_curve.to_numpy())
+
+def test_engine_sizes_entries_from_equity(test_db, test_logger):
+    """Test that the live engine buys the sizer's quantity instead of the session quantity"""
+    exchange = PaperExchange({"BTCBRL": make_candles(500)}, balances={"BRL": 10000.0},
+                             fill_model=FillModel(step_size=0.001), start=40)
+    engine = TradingEngine("key", "secret", test_db, test_logger, client=exchange,
+                           sizer=FixedFractionSizer(0.5))
+    assert engine.open_session("BTCBRL", 1000.0, 99.0)
+    while not engine.position_manager.has_position:
+        assert exchange.advance()
+        engine.run_iteration()
+    # Sized at the candle close; the fill price differs by the simulated spread and slippage
+    assert engine.entry_quantity * engine.entry_price == pytest.approx(500.0, rel=0.01)
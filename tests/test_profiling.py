@@ -0,0 +1,69 @@
+# tests/test_profiling.py
+import os
+import pstats
+import signal
+import time
+import pytest
+from src.backtesting.engine import Backtester
+from src.trading.strategy import MovingAverageStrategy
+from src.utils.profiling import Profiler, profiler
+from tests.conftest import make_candles
+
+def test_disabled_profiler_is_a_no_op(tmp_path):
+    """Test that nothing is recorded while disabled"""
+    local = Profiler(str(tmp_path))
+    with local.phase("work"):
+        pass
+    assert local.timings() == {}
+    assert local.disable() is None
+
+def test_phases_are_profiled_and_written(tmp_path):
+    """Test per-phase timings, cProfile output and folded stacks"""
+    profiler.enable(str(tmp_path))
+    try:
+        Backtester(make_candles(300), MovingAverageStrategy(), logger=None).run()
+        timings = profiler.timings()
+    finally:
+        output = profiler.disable()
+
+    assert timings["backtest.run"]["calls"] == 1
+    assert timings["strategy.update"]["calls"] == 300
+    assert timings["backtest.run"]["seconds"] >= timings["strategy.update"]["seconds"]
+
+    stats = pstats.Stats(os.path.join(output, "backtest.run.prof"))
+    assert any(name == "update" for _, _, name in stats.stats)
+    with open(os.path.join(output, "profile.folded")) as f:
+        lines = f.read().splitlines()
+    assert lines and all(line.startswith("backtest.run") for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert os.path.exists(os.path.join(output, "summary.txt"))
+    assert profiler.timings() == {}
+
+def test_runtime_toggle(tmp_path):
+    """Test switching profiling on and off without restarting"""
+    local = Profiler(str(tmp_path), sample_interval=0)
+    assert local.toggle() is True
+    with local.phase("engine.iteration"):
+        pass
+    assert local.toggle() is False
+    assert "engine.iteration" in open(os.path.join(tmp_path, "summary.txt")).read()
+
+@pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="SIGUSR1 not available")
+def test_signal_toggle_runs_off_the_handler(tmp_path):
+    """Test that the signal only requests the toggle and a separate thread performs it"""
+    local = Profiler(str(tmp_path), sample_interval=0)
+    previous = signal.getsignal(signal.SIGUSR1)
+    try:
+        assert local.install_signal_toggle()
+        os.kill(os.getpid(), signal.SIGUSR1)
+        deadline = time.monotonic() + 5.0
+        while not local.enabled and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert local.enabled
+
+        os.kill(os.getpid(), signal.SIGUSR1)
+        while not os.path.exists(os.path.join(tmp_path, "summary.txt")) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not local.enabled
+    finally:
+        signal.signal(signal.SIGUSR1, previous)
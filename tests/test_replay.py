@@ -0,0 +1,71 @@
+# tests/test_replay.py
+import gzip
+import json
+import pytest
+from src.trading.data_fetcher import DataFetcher
+from src.trading.position_manager import PositionManager
+from src.utils.binance_client import BinanceClient
+from src.utils.replay import RecordingClient, ReplayClient, ReplayMissError, ReplayedError
+
+class FlakyClient:
+    """Client whose second price call fails"""
+    def __init__(self):
+        self.prices = iter([{'price': '1.0'}, RuntimeError("timeout"), {'price': '3.0'}])
+
+    def get_symbol_ticker(self, symbol):
+        value = next(self.prices)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+def test_fixture_is_compressed_json_lines(market_fixture):
+    """Test the recorded fixture format"""
+    with gzip.open(market_fixture, 'rt') as f:
+        records = [json.loads(line) for line in f]
+
+    assert [r['method'] for r in records] == ['get_klines', 'get_symbol_info', 'get_symbol_ticker', 'get_account']
+    assert all('latency' in r for r in records)
+
+def test_replay_feeds_data_fetcher_and_binance_client(replay_client):
+    """Test that the wrappers run unchanged on replayed responses"""
+    data = DataFetcher(replay_client).get_market_data("BTCBRL", replay_client.KLINE_INTERVAL_1HOUR)
+    assert len(data) == 200
+    assert data["fechamento"].dtype == float
+
+    client = BinanceClient("key", "secret", client=replay_client)
+    assert client.get_symbol_info("BTCBRL")["step_size"] == 0.001
+    assert client.get_account_balance() == {"BRL": {"free": 1000.0, "locked": 0.0}}
+
+def test_replay_is_deterministic_and_strict(tmp_path):
+    """Test ordering of repeated calls, recorded errors and misses"""
+    path = str(tmp_path / "flaky.jsonl.gz")
+    with RecordingClient(FlakyClient(), path) as recorder:
+        assert recorder.get_symbol_ticker(symbol="BTCBRL")['price'] == '1.0'
+        with pytest.raises(RuntimeError):
+            recorder.get_symbol_ticker(symbol="BTCBRL")
+        assert recorder.get_symbol_ticker(symbol="BTCBRL")['price'] == '3.0'
+
+    replay = ReplayClient(path, latency=0.0, loop=False)
+    assert replay.get_symbol_ticker(symbol="BTCBRL")['price'] == '1.0'
+    with pytest.raises(ReplayedError):
+        replay.get_symbol_ticker(symbol="BTCBRL")
+    assert replay.get_symbol_ticker(symbol="BTCBRL")['price'] == '3.0'
+    with pytest.raises(ReplayMissError):
+        replay.get_symbol_ticker(symbol="BTCBRL")
+    with pytest.raises(ReplayMissError):
+        replay.get_symbol_ticker(symbol="ETHBRL")
+
+def test_simulated_latency(market_fixture):
+    """Test that replay sleeps the configured latency scaled by speed"""
+    sleeps = []
+    replay = ReplayClient(market_fixture, latency=0.2, speed=4.0, sleep=sleeps.append)
+    replay.get_account()
+    replay.get_account()
+
+    assert sleeps == [0.05, 0.05]
+    assert replay.calls == 2
+
+def test_position_manager_reads_replayed_rules(replay_client, test_logger):
+    """Test symbol rules lookup through the replay client"""
+    manager = PositionManager(replay_client, test_logger)
+    assert manager.get_symbol_info("BTCBRL") == {'min_qty': 0.001, 'max_qty': 100000.0, 'step_size': 0.001}
@@ -0,0 +1,150 @@
+# tests/test_resampler.py
+import numpy as np
+import pandas as pd
+import pytest
+from src.cli import main
+from src.database.crypto_db import CryptoDatabase
+from src.trading.paper_exchange import PaperExchange
+from src.trading.resampler import CandleResampler, ResamplingFetcher
+from src.trading.strategy import TradingStrategy
+from src.trading.trading_engine import TradingEngine
+from tests.test_cli import json_output, to_klines
+
+OHLCV = ['abertura', 'maxima', 'minima', 'fechamento', 'volume']
+AGGREGATION = {'abertura': 'first', 'maxima': 'max', 'minima': 'min', 'fechamento': 'last', 'volume': 'sum'}
+
+def make_minutes(n=3 * 24 * 60 + 17, seed=5):
+    """Random-walk 1m candles"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, n)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    return pd.DataFrame({
+        'abertura': open_,
+        'maxima': np.maximum(open_, close) * 1.0005,
+        'minima': np.minimum(open_, close) * 0.9995,
+        'fechamento': close,
+        'volume': rng.uniform(1, 10, n),
+    }, index=pd.date_range(start='2024-01-01', periods=n, freq='1min'))
+
+def expected(minutes, rule):
+    return minutes.resample(rule).agg(AGGREGATION)
+
+def test_incremental_resampling_matches_pandas():
+    """Test that uneven batches of 1m candles aggregate like pandas resample"""
+    minutes = make_minutes()
+    resampler = CandleResampler(('5m', '15m', '1h', '4h', '1d'))
+    rng = np.random.default_rng(1)
+    start = 0
+    while start < len(minutes):
+        size = int(rng.integers(1, 500))
+        resampler.update(to_klines(minutes.iloc[start:start + size]))
+        start += size
+
+    for interval, rule in (('5m', '5min'), ('15m', '15min'), ('1h', '1h'), ('4h', '4h'), ('1d', '1D')):
+        reference = expected(minutes, rule)
+        closed = resampler.get(interval)
+        with_partial = resampler.get(interval, include_partial=True)
+        np.testing.assert_allclose(with_partial[OHLCV].to_numpy(), reference.to_numpy(), rtol=1e-12)
+        assert (with_partial.index.tz_localize(None) == reference.index).all()
+        # The last bucket is only partly filled, except where it ended exactly
+        assert len(closed) == len(reference) - (interval != '5m' or len(minutes) % 5 != 0)
+
+def test_bucket_closes_on_its_last_candle_and_on_gaps():
+    """Test bucket completion without waiting for the next bucket"""
+    minutes = make_minutes(180)
+    resampler = CandleResampler(('1h',))
+    resampler.update(to_klines(minutes.iloc[:59]))
+    assert resampler.get('1h').empty
+    resampler.update(to_klines(minutes.iloc[59:60]))
+    assert len(resampler.get('1h')) == 1
+
+    # Candles 60-89 arrive, then the feed resumes in the third hour
+    resampler.update(to_klines(minutes.iloc[60:90]))
+    resampler.update(to_klines(minutes.iloc[125:130]))
+    hours = resampler.get('1h')
+    assert len(hours) == 2
+    assert hours['fechamento'].iloc[-1] == pytest.approx(minutes['fechamento'].iloc[89])
+    assert hours['volume'].iloc[-1] == pytest.approx(minutes['volume'].iloc[60:90].sum())
+    # Duplicates of already processed candles are ignored
+    assert resampler.update(to_klines(minutes.iloc[100:130])) == 0
+
+def test_fetcher_downloads_only_new_minutes(tmp_path):
+    """Test the 1m feed refresh, the database cache and multiple timeframes"""
+    minutes = make_minutes()
+    exchange = PaperExchange({"BTCBRL": minutes}, balances={"BRL": 1000.0}, start=24 * 60 * 2 - 1)
+    db = CryptoDatabase(str(tmp_path / "candles.db"))
+    calls = []
+    original = exchange.get_historical_klines
+
+    def recording(symbol, interval, start_str=None, **kwargs):
+        klines = original(symbol, interval, start_str, **kwargs)
+        calls.append(len(klines))
+        return klines
+
+    exchange.get_historical_klines = recording
+    fetcher = ResamplingFetcher(exchange, db=db)
+    hours = fetcher.get_market_data("BTCBRL", "1h", limit=24)
+    assert len(hours) == 24
+    np.testing.assert_allclose(hours['fechamento'].to_numpy(),
+                               expected(minutes, '1h')['fechamento'].iloc[24:48].to_numpy())
+
+    for _ in range(30):
+        exchange.advance()
+    frames = fetcher.get_timeframes("BTCBRL", ["15m", "1h"], limit=10)
+    assert calls[-1] == 30
+    assert frames["15m"].index[-1] == pd.Timestamp("2024-01-02 23:45", tz="UTC") + pd.Timedelta(minutes=30)
+    assert len(frames["1h"]) == 10
+
+    # A new fetcher resumes from the stored candles
+    restarted = ResamplingFetcher(exchange, db=db)
+    assert len(restarted.get_market_data("BTCBRL", "5m", limit=5)) == 5
+    assert calls[-1] == 0
+
+def test_first_sync_history_is_capped():
+    """Test that a long limit on a high interval downloads at most max_history minutes"""
+    minutes = make_minutes()
+    exchange = PaperExchange({"BTCBRL": minutes}, balances={"BRL": 1000.0}, start=len(minutes) - 1)
+    starts = []
+    original = exchange.get_historical_klines
+
+    def recording(symbol, interval, start_str=None, **kwargs):
+        starts.append(start_str)
+        return original(symbol, interval, start_str, **kwargs)
+
+    exchange.get_historical_klines = recording
+    fetcher = ResamplingFetcher(exchange, max_bars=1000)
+    days = fetcher.get_market_data("BTCBRL", "1d", limit=1000)
+    latest = int(minutes.index[-1].value // 10**6)
+    assert latest - starts[0] == 1000 * 60_000
+    assert len(days) == 1
+    assert len(fetcher.get_market_data("BTCBRL", "1m", limit=5000)) == 1000
+
+def test_engine_passes_extra_timeframes(test_db, test_logger):
+    """Test a strategy reading higher timeframes through the engine"""
+    class TrendFilter(TradingStrategy):
+        timeframes = ('4h',)
+
+        def update(self, data):
+            self.data = data
+
+        def get_signal(self):
+            trend = self.frames['4h']['fechamento']
+            return "BUY" if self.data['fechamento'].iloc[-1] > trend.iloc[-1] else None
+
+    minutes = make_minutes()
+    exchange = PaperExchange({"BTCBRL": minutes}, balances={"BRL": 1000.0}, start=len(minutes) - 1)
+    strategy = TrendFilter()
+    engine = TradingEngine("key", "secret", test_db, test_logger, client=exchange, interval='15m',
+                           strategy=strategy, data_fetcher=ResamplingFetcher(exchange))
+    engine.symbol = "BTCBRL"
+    engine.run_iteration()
+    assert len(strategy.data) > 0
+    assert strategy.frames['4h'].index[-1] == pd.Timestamp("2024-01-03 20:00", tz="UTC")
+
+def test_cli_backtest_resamples_stored_minutes(tmp_path, capsys):
+    """Test backtesting an interval built from stored 1m candles"""
+    path = str(tmp_path / "candles.db")
+    CryptoDatabase(path).save_candles("BTCBRL", "1m", to_klines(make_minutes(10 * 24 * 60)))
+    assert main(["backtest", "BTCBRL", "--db", path, "--interval", "15m", "--fast", "5", "--slow", "20",
+                 "--json"]) == 0
+    assert json_output(capsys.readouterr().out)["total_trades"] > 0
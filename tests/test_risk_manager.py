@@ -0,0 +1,69 @@
+# tests/test_risk_manager.py
+import numpy as np
+import pytest
+from src.backtesting.engine import Backtester
+from src.backtesting.fill_model import FillModel
+from src.trading.paper_exchange import PaperExchange
+from src.trading.position_manager import PositionManager
+from src.trading.risk_manager import PositionRisk, RiskLimits, RiskManager
+from src.trading.strategy import MovingAverageStrategy
+from src.trading.trading_engine import TradingEngine
+from tests.conftest import make_candles
+
+def test_position_risk_levels():
+    """Test stop, trailing stop and target fills, including gaps"""
+    risk = PositionRisk(RiskLimits(stop_loss=0.05, take_profit=0.10, trailing_stop=0.08), 100.0)
+    assert risk.stop == pytest.approx(95.0)
+    assert risk.check(101.0, 105.0, 99.0) == 0.0
+    assert risk.check(104.0, 108.0, 103.0) == 0.0
+    assert risk.stop == pytest.approx(108.0 * 0.92)  # trailing stop above the stop loss
+    assert risk.check(100.0, 101.0, 99.0) == pytest.approx(108.0 * 0.92)
+    assert PositionRisk(RiskLimits(stop_loss=0.05), 100.0).check(90.0, 92.0, 89.0) == 90.0  # gap down
+    assert PositionRisk(RiskLimits(take_profit=0.10), 100.0).check_price(111.0) == 111.0
+    assert PositionRisk(RiskLimits(), 100.0).check(50.0, 200.0, 10.0) == 0.0
+
+def test_fast_backtester_matches_bar_loop_with_stops():
+    """Test that both Backtester paths exit on the same bars at the same prices"""
+    data = make_candles(1000)
+    risk = RiskLimits(stop_loss=0.01, take_profit=0.03, trailing_stop=0.015)
+    loop = Backtester(data.copy(), MovingAverageStrategy(5, 20), risk=risk).run()
+    fast = Backtester(data.copy(), MovingAverageStrategy(5, 20), fast=True, risk=risk).run()
+    plain = Backtester(data.copy(), MovingAverageStrategy(5, 20), fast=True).run()
+
+    np.testing.assert_allclose(fast.equity_curve.to_numpy(), loop.equity_curve.to_numpy(), rtol=1e-9)
+    assert (fast.positions == loop.positions).all()
+    assert fast.metrics['total_trades'] == loop.metrics['total_trades'] > plain.metrics['total_trades']
+    np.testing.assert_allclose(fast.trades.to_frame()['price'], loop.trades.to_frame()['price'], rtol=1e-12)
+
+def test_exposure_limit(test_logger):
+    """Test that entries above max_exposure are refused and exits free the budget"""
+    manager = RiskManager(PositionManager(PaperExchange({"BTCBRL": make_candles()}), test_logger),
+                          RiskLimits(max_exposure=0.5), test_logger)
+    assert manager.allow_entry("BTCBRL", 4.0, 100.0, 1000.0)
+    assert not manager.allow_entry("BTCBRL", 6.0, 100.0, 1000.0)
+    manager.on_entry("BTCBRL", 100.0, 4.0)
+    assert not manager.allow_entry("ETHBRL", 2.0, 100.0, 1000.0)
+    manager.on_exit("BTCBRL")
+    assert manager.exposure == 0.0
+    assert manager.allow_entry("ETHBRL", 2.0, 100.0, 1000.0)
+
+def test_engine_closes_position_on_streamed_price(test_db, test_logger):
+    """Test a live stop through the paper exchange and the re-entry block"""
+    exchange = PaperExchange({"BTCBRL": make_candles(500)}, balances={"BRL": 10000.0},
+                             fill_model=FillModel(step_size=0.001), start=40)
+    engine = TradingEngine("key", "secret", test_db, test_logger, client=exchange,
+                           risk=RiskLimits(stop_loss=0.02))
+    assert engine.open_session("BTCBRL", 10000.0, 5.0)
+    while not engine.position_manager.has_position:
+        assert exchange.advance()
+        engine.run_iteration()
+    entry = engine.entry_price
+    assert engine.risk_manager.positions["BTCBRL"].stop == pytest.approx(entry * 0.98)
+
+    assert not engine.on_price(entry * 0.99)
+    assert engine.on_price(entry * 0.97)
+    assert not engine.position_manager.has_position
+    assert engine.entry_price is None
+    assert engine.realized_pnl != 0.0
+    assert "BTCBRL" in engine.risk_manager.blocked
+    assert engine.risk_manager.exposure == 0.0
@@ -0,0 +1,68 @@
+# tests/test_scheduler.py
+import pytest
+from src.trading.data_fetcher import DataFetcher
+from src.trading.paper_exchange import PaperExchange
+from src.trading.scheduler import CandleScheduler
+from src.utils.clock import SimulatedClock
+from tests.conftest import make_candles
+
+class CountingClient:
+    """Paper exchange proxy recording the limit of every klines request"""
+    def __init__(self, exchange):
+        self.exchange = exchange
+        self.limits = []
+
+    def get_klines(self, symbol, interval, limit=500, **kwargs):
+        self.limits.append(limit)
+        return self.exchange.get_klines(symbol, interval, limit)
+
+def make_scheduler(jitter=0.0, start=99):
+    exchange = PaperExchange({"BTCBRL": make_candles(300), "ETHBRL": make_candles(300, seed=3)}, start=start)
+    clock = SimulatedClock(start=exchange.current_time.timestamp() + 3600 + 2)
+    clock.subscribe(exchange.advance_to)
+    client = CountingClient(exchange)
+    scheduler = CandleScheduler(DataFetcher(client), clock, close_delay=2.0, jitter=jitter, window=100)
+    return scheduler, clock, client
+
+def test_incremental_fetch_once_per_close():
+    """Test a full first fetch, then only the new candle after each close"""
+    scheduler, clock, client = make_scheduler()
+    seen = []
+    job = scheduler.add("BTCBRL", "1h", lambda job: seen.append(job.data["fechamento"].iloc[-1]))
+
+    for _ in range(5):
+        scheduler.run_pending()
+        clock.sleep_until(scheduler.next_wakeup())
+
+    assert client.limits == [100, 2, 2, 2, 2]
+    assert len(seen) == 5
+    assert len(job.data) == 100
+    assert job.data["tempo_fechamento"].is_monotonic_increasing
+    assert clock.now() % 3600 == 2.0
+
+def test_redundant_wakeups_are_skipped():
+    """Test that a wake-up without a new close does not call back"""
+    scheduler, clock, client = make_scheduler()
+    calls = []
+    scheduler.add("BTCBRL", "1h", calls.append)
+
+    assert scheduler.run_pending() == 1
+    job = scheduler.jobs[("BTCBRL", "1h")]
+    job.next_run = clock.now()
+    assert scheduler.run_pending() == 0
+    assert job.skipped == 1
+    assert job.next_run == clock.now() + scheduler.retry_delay
+
+def test_jitter_spreads_symbols():
+    """Test stable per-job offsets within the jitter window"""
+    scheduler, clock, _ = make_scheduler(jitter=10.0)
+    btc = scheduler.add("BTCBRL", "1h", lambda job: None)
+    eth = scheduler.add("ETHBRL", "1h", lambda job: None)
+
+    assert 0 <= btc.offset < 10 and 0 <= eth.offset < 10
+    assert btc.offset != eth.offset
+    assert CandleScheduler(None, jitter=10.0).add("BTCBRL", "1h", lambda job: None).offset == btc.offset
+
+    scheduler.run_pending()
+    assert btc.next_run % 3600 == pytest.approx(2.0 + btc.offset)
+    assert eth.next_run % 3600 == pytest.approx(2.0 + eth.offset)
@@ -0,0 +1,82 @@
+# tests/test_telemetry.py
+import urllib.request
+import pytest
+from src.backtesting.fill_model import FillModel
+from src.database.crypto_db import CryptoDatabase
+from src.trading.paper_exchange import PaperExchange, run_paper_trading
+from src.trading.trading_engine import TradingEngine
+from src.utils.binance_client import BinanceClient
+from src.utils.telemetry import MetricsRegistry, MetricsServer
+from tests.conftest import make_candles
+
+def test_exposition_format():
+    """Test counters, gauges and histograms rendering"""
+    registry = MetricsRegistry()
+    calls = registry.counter("api_calls_total", "API calls", ["endpoint"])
+    calls.labels("get_klines").inc()
+    calls.labels(endpoint="get_klines").inc(2)
+    registry.gauge("open_positions", "Open positions").set(1)
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5.0)
+
+    text = registry.render()
+    assert '# TYPE api_calls_total counter' in text
+    assert 'api_calls_total{endpoint="get_klines"} 3.0' in text
+    assert 'open_positions 1.0' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert 'latency_seconds_count 3' in text
+
+    with pytest.raises(ValueError):
+        calls.inc()
+    with pytest.raises(ValueError):
+        registry.gauge("api_calls_total", "Wrong type")
+
+def test_http_endpoint_serves_metrics():
+    """Test scraping the exporter over HTTP"""
+    registry = MetricsRegistry()
+    registry.counter("scrapes_total", "Scrapes").inc()
+    server = MetricsServer(registry, port=0)
+    port = server.start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            body = response.read().decode()
+            assert response.headers['Content-Type'].startswith("text/plain; version=0.0.4")
+    finally:
+        server.stop()
+    assert "scrapes_total 1.0" in body
+
+def test_engine_client_and_database_metrics(tmp_path, test_logger):
+    """Test the instrumented trading components on a paper session"""
+    registry = MetricsRegistry()
+    db = CryptoDatabase(str(tmp_path / "metrics.db"), registry=registry)
+    exchange = PaperExchange({"BTCBRL": make_candles(300)}, balances={"BRL": 1000.0},
+                             fill_model=FillModel(step_size=0.001), start=40)
+    engine = TradingEngine("key", "secret", db, test_logger, client=exchange, registry=registry)
+    assert engine.open_session("BTCBRL", 1000.0, 5.0)
+
+    run_paper_trading(engine, exchange)
+    text = registry.render()
+
+    buys = sum(1 for fill in exchange.fills if fill['side'] == "BUY")
+    assert f'trading_orders_total{{side="BUY"}} {float(buys)}' in text
+    assert 'binance_api_calls_total{endpoint="get_klines"} 260.0' in text
+    assert f'binance_api_calls_total{{endpoint="create_order"}} {float(len(exchange.fills))}' in text
+    assert 'trading_iteration_duration_seconds_count 260' in text
+    assert 'db_query_duration_seconds_count{operation="INSERT"}' in text
+    assert 'trading_latency_seconds{phase="order",quantile="0.99"}' in text
+    assert registry.get("trading_realized_pnl").labels().value == pytest.approx(engine.realized_pnl)
+
+def test_engine_reuses_instrumented_client(test_db, test_logger):
+    """Test that an engine given the application's instrumented client counts each call once"""
+    registry = MetricsRegistry()
+    exchange = PaperExchange({"BTCBRL": make_candles(300)}, balances={"BRL": 1000.0}, start=40)
+    client = BinanceClient("key", "secret", client=exchange, registry=registry)
+    engine = TradingEngine("key", "secret", test_db, test_logger, client=client.client, registry=registry)
+    assert engine.client is client.client
+
+    engine.client.get_account()
+    assert 'binance_api_calls_total{endpoint="get_account"} 1.0' in registry.render()
@@ -0,0 +1,107 @@
+# tests/test_trade_journal.py
+import time
+from datetime import datetime, timedelta, timezone
+import pytest
+from src.utils.trade_journal import TradeJournal, read_journal
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+def write_trades(journal, n):
+    for i in range(n):
+        journal.append("COMPRA" if i % 2 == 0 else "VENDA", "BTCBRL" if i % 3 else "ETHBRL",
+                       0.001 * (i + 1), 300000.0 + i, sessao=1, timestamp=START + timedelta(hours=i))
+
+def test_csv_journal_buffers_and_appends(tmp_path):
+    """Test buffered flushes and appending to a legacy trading_log.csv"""
+    path = tmp_path / "trading_log.csv"
+    path.write_text("timestamp,tipo,par,quantidade,preco,total\n2025-01-24 08:02:56,COMPRA,SOLBRL,0.008,1562.2,12.4976\n")
+    journal = TradeJournal(str(path), flush_rows=4)
+    write_trades(journal, 3)
+    assert len(journal) == 3
+    assert len(read_journal(str(path))) == 1  # nothing written yet
+    write_trades(journal, 2)
+    assert len(journal) == 1
+    journal.close()
+
+    trades = read_journal(str(path))
+    assert list(trades.columns) == ["timestamp", "tipo", "par", "quantidade", "preco", "total"]
+    assert len(trades) == 6
+    assert trades['total'].iloc[1] == pytest.approx(300.0)
+    assert len(read_journal(str(path), symbol="SOLBRL")) == 1
+
+def test_arrow_journal_round_trip(tmp_path):
+    """Test that every flush appends a readable stream and filters apply on read"""
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "journal.arrow")
+    with TradeJournal(path, flush_rows=100) as journal:
+        write_trades(journal, 250)
+    with TradeJournal(path) as journal:
+        write_trades(journal, 10)
+    with open(path, "ab") as partial:
+        partial.write(b"\xff\xff\xff\xff\x10")  # flush interrupted by a crash
+
+    trades = read_journal(path)
+    assert len(trades) == 260
+    assert list(trades.columns) == ["timestamp", "tipo", "par", "quantidade", "preco", "total", "sessao"]
+    assert trades['timestamp'].iloc[5] == START + timedelta(hours=5)
+    window = read_journal(path, start=START + timedelta(hours=10), end=START + timedelta(hours=20), symbol="BTCBRL")
+    assert len(window) == 7  # hours 10 to 19 that are not multiples of 3
+    assert (window['par'] == "BTCBRL").all()
+
+def test_arrow_journal_requires_pyarrow(tmp_path, monkeypatch):
+    """Test the error when pyarrow is missing"""
+    import src.utils.trade_journal as trade_journal
+    monkeypatch.setattr(trade_journal, "ARROW_AVAILABLE", False)
+    with pytest.raises(ImportError):
+        TradeJournal(str(tmp_path / "journal.arrow"))
+    TradeJournal(str(tmp_path / "journal.csv"))
+
+def test_engine_journals_operations(test_db, test_logger, tmp_path):
+    """Test that the engine's fills reach the journal when the session stops"""
+    from src.trading.paper_exchange import PaperExchange
+    from src.trading.trading_engine import TradingEngine
+    from tests.conftest import make_candles
+
+    path = str(tmp_path / "journal.csv")
+    exchange = PaperExchange({"BTCBRL": make_candles(500)}, balances={"BRL": 10000.0}, start=40)
+    engine = TradingEngine("key", "secret", test_db, test_logger, client=exchange, journal=TradeJournal(path))
+    assert engine.open_session("BTCBRL", 10000.0, 5.0)
+    session = engine.current_trading_id
+    while exchange.advance() and len(exchange.fills) < 2:
+        engine.run_iteration()
+    assert len(engine.journal) == 2
+    assert engine.stop_trading_session()
+
+    trades = read_journal(path)
+    assert list(trades['tipo']) == ["COMPRA", "VENDA"]
+    assert (trades['sessao'] == session).all()
+    assert trades['quantidade'].iloc[0] == pytest.approx(exchange.fills[0]['quantity'])
+
+def test_journal_flushes_on_timer(tmp_path):
+    """Test that a pending trade is written after flush_interval without another append"""
+    path = str(tmp_path / "trading_log.csv")
+    journal = TradeJournal(path, flush_rows=100, flush_interval=0.05)
+    write_trades(journal, 1)
+    deadline = time.monotonic() + 5.0
+    while len(read_journal(path)) == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(read_journal(path)) == 1
+    assert len(journal) == 0
+    journal.close()
+
+@pytest.mark.parametrize("name", ["journal.arrow", "trading_log.csv"])
+def test_journal_recovers_from_torn_flush(tmp_path, name):
+    """Test that trades appended after a torn flush are all read back"""
+    if not name.endswith(".csv"):
+        pytest.importorskip("pyarrow")
+    path = str(tmp_path / name)
+    with TradeJournal(path, flush_rows=5) as journal:
+        write_trades(journal, 10)
+    with open(path, "ab") as partial:
+        partial.write(b"\xff\xff\xff\xff\x10" if not name.endswith(".csv") else b"2025-01-02 00:00:00,COMP")
+
+    with TradeJournal(path, flush_rows=5) as journal:
+        write_trades(journal, 7)
+    trades = read_journal(path)
+    assert len(trades) == 17
+    assert (trades['tipo'].isin(["COMPRA", "VENDA"])).all()
@@ -1,7 +1,12 @@
 # tests/test_trading_strategy.py
+import numpy as np
 import pytest
 import pandas as pd
-from src.trading.strategy import MovingAverageStrategy
+from src.trading.strategy import (
+    SIGNAL_BUY, SIGNAL_NONE, STRATEGIES, IndicatorStrategy, MovingAverageStrategy, RSIStrategy,
+    TradingStrategy, available_strategies, create_strategy, get_strategy, register_strategy
+)
+from tests.conftest import make_candles
 
 def test_moving_average_strategy():
     """Test moving average strategy signals"""
@@ -14,4 +19,53 @@ def test_moving_average_strategy():
     strategy.update(data)
     signal = strategy.get_signal()
     
-    assert signal in [None, "BUY", "SELL"]
\ No newline at end of file
+    assert signal in [None, "BUY", "SELL"]
+
+def test_strategy_registry():
+    """Test creating strategies by name and by module path"""
+    assert {"moving_average", "rsi", "macd", "bollinger"} <= set(available_strategies())
+    strategy = create_strategy("moving_average", fast_period=3, slow_period=9)
+    assert isinstance(strategy, MovingAverageStrategy) and strategy.slow_period == 9
+    assert get_strategy("src.trading.strategy:RSIStrategy") is RSIStrategy
+    with pytest.raises(ValueError):
+        get_strategy("unknown")
+
+    @register_strategy("test_always_buy")
+    class AlwaysBuy(IndicatorStrategy):
+        def generate_signals(self, data):
+            return np.full(len(data), SIGNAL_BUY, dtype=np.int8)
+
+    try:
+        strategy = create_strategy("test_always_buy")
+        strategy.update(pd.DataFrame({'fechamento': [1.0, 2.0]}))
+        assert strategy.get_signal() == "BUY"
+    finally:
+        STRATEGIES.pop("test_always_buy")
+
+@pytest.mark.parametrize("name", ["rsi", "macd", "bollinger"])
+def test_indicator_strategies_replay_consistently(name):
+    """Test that vectorized signals match update/get_signal on every prefix"""
+    data = make_candles(300)
+    strategy = create_strategy(name)
+    signals = strategy.generate_signals(data)
+    replayed = TradingStrategy.generate_signals(create_strategy(name), data)
+    assert (signals == replayed).all()
+    assert (signals != SIGNAL_NONE).any()
+
+@pytest.mark.parametrize("name", ["rsi", "macd", "bollinger"])
+def test_indicator_strategies_stream_new_bars(name, monkeypatch):
+    """Test that a sliding window of fetched candles only feeds the new bars to the streaming indicators"""
+    data = make_candles(400)
+    data['tempo_fechamento'] = data.index + pd.Timedelta(hours=1)
+    expected = create_strategy(name).generate_signals(data)
+    strategy = create_strategy(name)
+    strategy.update(data.iloc[:200])
+    monkeypatch.setattr(strategy, "generate_signals", None)
+    for end in range(201, 401):
+        strategy.update(data.iloc[end - 200:end])
+        signal = {"BUY": SIGNAL_BUY, "SELL": -1, None: SIGNAL_NONE}[strategy.get_signal()]
+        assert signal == expected[end - 1]
+
+    # Bars that don't continue the stream start it over
+    strategy.update(data.iloc[:50])
+    assert strategy._bars == 50
@@ -0,0 +1,64 @@
+# tests/test_walk_forward.py
+import numpy as np
+import pandas as pd
+import pytest
+from src.backtesting.engine import Backtester
+from src.backtesting.fill_model import FillModel
+from src.backtesting.walk_forward import (
+    WalkForwardOptimizer, crossover_positions, moving_averages, simulate_positions
+)
+from src.trading.strategy import MovingAverageStrategy
+from tests.conftest import make_candles
+
+def test_simulate_positions_matches_backtester():
+    """Test that the vectorized simulation reproduces Backtester equity"""
+    data = make_candles(300)
+    result = Backtester(data.copy(), MovingAverageStrategy(fast_period=5, slow_period=20)).run()
+
+    close = data['fechamento'].to_numpy()
+    averages = moving_averages(close, [5, 20])
+    positions = crossover_positions(averages[5], averages[20])
+    equity = simulate_positions(close, positions, fraction=0.95)
+
+    np.testing.assert_allclose(equity * 10000.0, result.equity_curve.to_numpy(), rtol=1e-9)
+
+def test_fees_reduce_simulated_equity():
+    """Test that trading costs lower the final equity"""
+    close = make_candles(600)['fechamento'].to_numpy()
+    averages = moving_averages(close, [5, 20])
+    positions = crossover_positions(averages[5], averages[20])
+
+    free = simulate_positions(close, positions)
+    costly = simulate_positions(close, positions, fill_model=FillModel(taker_fee=0.001, slippage=0.001))
+    assert costly[-1] < free[-1]
+
+def test_walk_forward_windows_and_stitching():
+    """Test rolling windows, parameter selection and stitched equity"""
+    data = make_candles(600)
+    optimizer = WalkForwardOptimizer(
+        data,
+        {'fast_period': [3, 5, 8], 'slow_period': [20, 30]},
+        in_sample_bars=200, out_of_sample_bars=100, max_workers=1
+    )
+    result = optimizer.run()
+
+    assert optimizer.split(len(data)) == [(0, 200, 300), (100, 300, 400), (200, 400, 500), (300, 500, 600)]
+    assert len(result.windows) == 4
+    assert len(result.equity_curve) == 400
+    assert result.equity_curve.index[0] == data.index[200]
+    for window in result.windows:
+        assert window['fast_period'] < window['slow_period']
+
+    # Each window continues from the equity where the previous one ended
+    chained = 10000.0 * np.prod([1 + w['out_of_sample_return'] for w in result.windows])
+    assert result.equity_curve.iloc[-1] == pytest.approx(chained)
+
+def test_walk_forward_parallel_matches_serial():
+    """Test that process-parallel optimization picks the same parameters"""
+    data = make_candles(600)
+    grid = {'fast_period': [3, 5, 8], 'slow_period': [20, 30]}
+    serial = WalkForwardOptimizer(data, grid, 200, 100, max_workers=1).run()
+    parallel = WalkForwardOptimizer(data, grid, 200, 100, max_workers=2).run()
+
+    assert [w['fast_period'] for w in serial.windows] == [w['fast_period'] for w in parallel.windows]
+    assert serial.metrics['final_equity'] == pytest.approx(parallel.metrics['final_equity'])